@@ -0,0 +1,198 @@
+"""
+Batch Genesis for the Universal Genesis Protocol
+
+Creating N digital persons with N separate invocations repeats process start,
+imports and Phase 1 (dependency setup) N times. GenesisBatch creates many
+persons in one invocation instead:
+
+1. Dependency setup runs once, in the batch root (requirements, Agent-Zero and
+   Pheromind are shared by every person).
+2. Each person then runs the remaining phases in its own isolated container
+   root, batch_root/persons/<name>/, with its own workshop, checkpoints and
+   optional voice_samples/ directory. Persons run on a process pool, so one
+   person's CPU-bound phases do not stall the others.
+3. Compiled soul anchors and Agent-Zero subsystem rewrites are cached in the
+   batch root, so persons sharing a template parse it once, and persons
+   sharing an identity reuse each other's rewrites.
+
+The batch report (batch_root/batch_report.json) lists every person's outcome
+and the aggregate throughput in persons per hour.
+"""
+
+import re
+import json
+import time
+import asyncio
+import logging
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Union
+
+from genesis import UniversalGenesisProtocol
+
+logger = logging.getLogger("UniversalGenesisProtocol.Batch")
+
+# Files in a batch directory treated as soul anchors
+ANCHOR_SUFFIXES = (".md", ".txt", ".json", ".yaml", ".yml")
+
+# Protocol options that only apply to the shared dependency setup
+DEPENDENCY_OPTIONS = ("dependency_sources", "mirror_dir", "dependency_cache_dir", "dependency_venv")
+
+
+def discover_soul_anchors(source: Union[str, Path]) -> List[Dict[str, Any]]:
+    """
+    Return the persons of a batch as [{"name", "soul_anchor"}, ...].
+
+    source is either a directory (every *.md, *.txt, *.json, *.yaml file in it
+    is a soul anchor, named after its file) or a JSON manifest: a list of
+    soul anchor paths or {"soul_anchor": path, "name": optional name} objects.
+    Relative manifest paths are resolved against the manifest's directory.
+    """
+    source = Path(source)
+    if source.is_dir():
+        entries = [{"soul_anchor": path} for path in sorted(source.iterdir())
+                   if path.is_file() and path.suffix.lower() in ANCHOR_SUFFIXES]
+    else:
+        with open(source, 'r') as f:
+            manifest = json.load(f)
+        if not isinstance(manifest, list):
+            raise ValueError(f"Batch manifest must be a JSON list: {source}")
+        entries = []
+        for entry in manifest:
+            entry = {"soul_anchor": entry} if isinstance(entry, str) else dict(entry)
+            anchor = Path(entry["soul_anchor"]).expanduser()
+            entry["soul_anchor"] = anchor if anchor.is_absolute() else source.parent / anchor
+            entries.append(entry)
+
+    # Give every person a unique, filesystem-safe name
+    persons = []
+    seen = set()
+    for entry in entries:
+        base = re.sub(r"[^a-z0-9]+", "_", str(entry.get("name") or Path(entry["soul_anchor"]).stem).lower()).strip("_")
+        name, suffix = base or "person", 2
+        while name in seen:
+            name, suffix = f"{base}_{suffix}", suffix + 1
+        seen.add(name)
+        persons.append({"name": name, "soul_anchor": Path(entry["soul_anchor"]).resolve()})
+    return persons
+
+
+async def _execute_person(name: str, soul_anchor: Path, container: Path,
+                          options: Dict[str, Any], resume: bool) -> Dict[str, Any]:
+    """Run one person's pipeline and summarize the outcome."""
+    started = time.time()
+    result = {"name": name, "soul_anchor": str(soul_anchor), "container": str(container)}
+    try:
+        container.mkdir(parents=True, exist_ok=True)
+        protocol = UniversalGenesisProtocol(container_path=container, soul_anchor_path=soul_anchor,
+                                            shared_dependencies=True, **options)
+        result["digital_person_id"] = protocol.digital_person_id
+        result["success"] = await protocol.execute(resume=resume)
+        result["state"] = protocol.protocol_state
+    except Exception as e:
+        logger.exception(f"Genesis failed for {name}")
+        result["success"] = False
+        result["state"] = f"FAILED: {str(e)}"
+    result["seconds"] = round(time.time() - started, 3)
+    return result
+
+
+def run_person(name: str, soul_anchor: Path, container: Path,
+               options: Dict[str, Any], resume: bool) -> Dict[str, Any]:
+    """Process-pool entry point: run one person's pipeline in this worker."""
+    return asyncio.run(_execute_person(name, soul_anchor, container, options, resume))
+
+
+class GenesisBatch:
+    """Creates many digital persons with one shared dependency setup."""
+
+    def __init__(self, persons: List[Dict[str, Any]], batch_root: Union[str, Path],
+                 workers: int = 0, protocol_options: Optional[Dict[str, Any]] = None,
+                 resume: bool = False):
+        """
+        Args:
+            persons: Batch entries as returned by discover_soul_anchors.
+            batch_root: Directory holding the shared dependencies, the soul anchor
+                cache, persons/<name>/ containers and batch_report.json.
+            workers: Persons run concurrently on this many worker processes.
+                0 or 1 runs them one after another in this process.
+            protocol_options: UniversalGenesisProtocol keyword arguments applied to
+                every person (e.g. compact_graph, extraction_workers).
+            resume: Skip phases whose checkpoints are still fresh, per person.
+        """
+        if not persons:
+            raise ValueError("A genesis batch needs at least one soul anchor")
+        self.persons = persons
+        self.batch_root = Path(batch_root).resolve()
+        self.workers = workers
+        self.protocol_options = dict(protocol_options or {})
+        self.resume = resume
+
+    def _person_options(self) -> Dict[str, Any]:
+        """Protocol options for a person: shared dependencies and soul anchor cache from the batch root."""
+        options = {key: value for key, value in self.protocol_options.items() if key not in DEPENDENCY_OPTIONS}
+        options["dependency_root"] = self.batch_root
+        options["dependency_cache_dir"] = (self.protocol_options.get("dependency_cache_dir")
+                                           or self.batch_root / "workshop" / "dependency_cache")
+        options.setdefault("soul_anchor_cache_dir", self.batch_root / "workshop" / "cache" / "soul_anchors")
+        options.setdefault("rewrite_cache_dir", self.batch_root / "workshop" / "cache" / "rewrites")
+        return options
+
+    async def run(self) -> Dict[str, Any]:
+        """Set up dependencies once, run every person and return the batch report."""
+        started = time.time()
+        self.batch_root.mkdir(parents=True, exist_ok=True)
+        logger.info(f"BATCH GENESIS: {len(self.persons)} persons in {self.batch_root}")
+
+        # Shared dependency setup (any anchor will do; Phase 1 does not read it)
+        setup_options = dict(self.protocol_options)
+        setup_options.setdefault("soul_anchor_cache_dir", self.batch_root / "workshop" / "cache" / "soul_anchors")
+        setup = UniversalGenesisProtocol(container_path=self.batch_root,
+                                         soul_anchor_path=self.persons[0]["soul_anchor"], **setup_options)
+        await setup.setup_dependencies(resume=self.resume)
+        setup_seconds = time.time() - started
+        logger.info(f"Shared dependency setup finished in {setup_seconds:.1f}s")
+
+        # Per-person pipelines, each in its own container root
+        options = self._person_options()
+        jobs = [(person["name"], person["soul_anchor"], self.batch_root / "persons" / person["name"],
+                 options, self.resume) for person in self.persons]
+        results = []
+        if self.workers > 1:
+            loop = asyncio.get_running_loop()
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                futures = [loop.run_in_executor(executor, run_person, *job) for job in jobs]
+                for future in asyncio.as_completed(futures):
+                    results.append(self._log_result(await future, len(results) + 1))
+        else:
+            for job in jobs:
+                results.append(self._log_result(await _execute_person(*job), len(results) + 1))
+
+        report = self._report(results, setup_seconds, time.time() - started)
+        with open(self.batch_root / "batch_report.json", 'w') as f:
+            json.dump(report, f, indent=2)
+        logger.info(f"BATCH GENESIS COMPLETE: {report['succeeded']}/{report['persons']} persons in "
+                    f"{report['elapsed_seconds']:.1f}s ({report['persons_per_hour']:.1f} persons/hour)")
+        return report
+
+    def _log_result(self, result: Dict[str, Any], completed: int) -> Dict[str, Any]:
+        outcome = "completed" if result["success"] else result["state"]
+        logger.info(f"[{completed}/{len(self.persons)}] {result['name']}: {outcome} in {result['seconds']:.1f}s")
+        return result
+
+    def _report(self, results: List[Dict[str, Any]], setup_seconds: float, elapsed: float) -> Dict[str, Any]:
+        """Summarize the batch; throughput counts only successfully created persons."""
+        succeeded = sum(1 for result in results if result["success"])
+        order = {person["name"]: index for index, person in enumerate(self.persons)}
+        return {
+            "completed_at": datetime.now().isoformat(),
+            "persons": len(results),
+            "succeeded": succeeded,
+            "failed": len(results) - succeeded,
+            "workers": self.workers,
+            "setup_seconds": round(setup_seconds, 3),
+            "elapsed_seconds": round(elapsed, 3),
+            "persons_per_hour": round(succeeded * 3600 / elapsed, 2) if elapsed > 0 else 0.0,
+            "results": sorted(results, key=lambda result: order[result["name"]])
+        }
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Knowledge Graph Memory Benchmark
+
+Measures the structural memory cost of the memory graph representations used
+by _structure_memory:
+
+- dict lists: the original list-of-dicts knowledge_graph layout
+- KnowledgeGraphStore: dict nodes/edges plus id, type, universe and adjacency indexes
+- CompactKnowledgeGraph: slotted nodes and array-backed edge columns
+
+Event payloads and node id strings are created before measurement and shared
+between runs, so the numbers reflect per-node and per-edge overhead only.
+
+Usage:
+    python3 benchmarks/graph_memory_benchmark.py [--nodes 100000] [--universes 50]
+"""
+
+import os
+import sys
+import argparse
+import tracemalloc
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from knowledge_graph import KnowledgeGraphStore, CompactKnowledgeGraph
+
+
+def generate_corpus(node_count: int, universe_count: int) -> List[Tuple[str, str, str, Dict]]:
+    """Generate (node_id, universe, source_id, data) tuples resembling structured events."""
+    corpus = []
+    for idx in range(node_count):
+        universe = f"Earth-{idx % universe_count}"
+        corpus.append((
+            f"event_{idx}_{idx % 7}",
+            universe,
+            f"source_{idx // 10}",
+            {"id": idx % 7, "description": f"Canonical event {idx}"}
+        ))
+    return corpus
+
+
+def build_dict_lists(corpus) -> Dict:
+    graph = {"nodes": [], "edges": [], "confluences": [], "contradictions": [], "metadata": {}}
+    universe_ids = set()
+    for node_id, universe, source_id, data in corpus:
+        graph["nodes"].append({"id": node_id, "type": "event", "data": data,
+                               "source": source_id, "universe": universe})
+        universe_id = f"universe_{universe}"
+        if universe_id not in universe_ids:
+            universe_ids.add(universe_id)
+            graph["nodes"].append({"id": universe_id, "type": "universe", "data": {"name": universe}})
+        graph["edges"].append({"source": universe_id, "target": node_id, "type": "contains"})
+    return graph
+
+
+def build_store(graph_class, corpus):
+    graph = graph_class()
+    for node_id, universe, source_id, data in corpus:
+        graph.add_node({"id": node_id, "type": "event", "data": data,
+                        "source": source_id, "universe": universe})
+        universe_id = f"universe_{universe}"
+        if not graph.has_node(universe_id):
+            graph.add_node({"id": universe_id, "type": "universe", "data": {"name": universe}})
+        graph.add_edge({"source": universe_id, "target": node_id, "type": "contains"})
+    return graph
+
+
+def measure(builder, corpus) -> int:
+    """Return the bytes still allocated by the graph built from the corpus."""
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    graph = builder(corpus)
+    allocated = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    del graph
+    return allocated
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Knowledge graph bytes-per-node benchmark")
+    parser.add_argument("--nodes", type=int, default=100000, help="Number of event nodes")
+    parser.add_argument("--universes", type=int, default=50, help="Number of universes")
+    args = parser.parse_args()
+
+    corpus = generate_corpus(args.nodes, args.universes)
+
+    builders = [
+        ("dict lists (original)", build_dict_lists),
+        ("KnowledgeGraphStore", lambda c: build_store(KnowledgeGraphStore, c)),
+        ("CompactKnowledgeGraph", lambda c: build_store(CompactKnowledgeGraph, c)),
+    ]
+
+    print(f"{args.nodes} event nodes, {args.nodes} edges, {args.universes} universes")
+    print(f"{'representation':<24}{'total MiB':>12}{'bytes/node':>14}")
+    for name, builder in builders:
+        allocated = measure(builder, corpus)
+        print(f"{name:<24}{allocated / 2**20:>12.1f}{allocated / args.nodes:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
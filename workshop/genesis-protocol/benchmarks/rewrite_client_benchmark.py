@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Rewrite Client Benchmark
+
+Runs rewrite_client.RewriteClient against a local stand-in for the Pheromind
+rewrite backend. The stand-in speaks the client's JSON protocol
+(POST /rewrite {"prompts": [...]} -> {"responses": [...]}), answers after
+--latency seconds per request plus --per-prompt seconds per prompt, and
+reports what it received on GET /stats (requests, prompts, batch sizes).
+
+The workload issues --prompts distinct prompts, each --repeat times,
+concurrently. It is run four ways:
+
+- unbatched: batch_size 1 and no disk tier, one request per distinct prompt
+- cold: batching and both cache tiers, empty caches
+- warm memory: the same client again (in-memory LRU hits)
+- warm disk: a new client on the same cache directory (on-disk hits)
+
+For each, the benchmark prints wall time, the client's hit rate and batch
+sizes, and the backend requests the stand-in actually served.
+
+Usage:
+    python3 benchmarks/rewrite_client_benchmark.py [--prompts 64] [--repeat 3]
+        [--batch-size 8] [--latency 0.2] [--per-prompt 0.01]
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import hashlib
+import argparse
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Any
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rewrite_client import RewriteClient
+
+
+class StandInBackend:
+    """Local HTTP stand-in for the rewrite backend that records the batches it serves."""
+
+    def __init__(self, latency: float = 0.2, per_prompt: float = 0.01):
+        self.latency = latency
+        self.per_prompt = per_prompt
+        self.batch_sizes: List[int] = []
+        self._lock = threading.Lock()
+        backend = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                prompts = json.loads(self.rfile.read(int(self.headers["Content-Length"])))["prompts"]
+                with backend._lock:
+                    backend.batch_sizes.append(len(prompts))
+                time.sleep(backend.latency + backend.per_prompt * len(prompts))
+                self._reply({"responses": [backend.respond(prompt) for prompt in prompts]})
+
+            def do_GET(self):
+                self._reply(backend.stats())
+
+            def _reply(self, payload: Dict[str, Any]):
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.endpoint = f"http://127.0.0.1:{self.server.server_address[1]}/rewrite"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    @staticmethod
+    def respond(prompt: str) -> str:
+        return f"rewritten {hashlib.sha256(prompt.encode('utf-8')).hexdigest()[:12]}"
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            sizes = list(self.batch_sizes)
+        return {"requests": len(sizes), "prompts": sum(sizes),
+                "mean_batch_size": sum(sizes) / len(sizes) if sizes else 0.0}
+
+    def reset(self):
+        with self._lock:
+            self.batch_sizes.clear()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+async def run_workload(client: RewriteClient, prompts: List[str], repeat: int) -> float:
+    """Issue every prompt `repeat` times concurrently; returns wall seconds."""
+    started = time.perf_counter()
+    responses = await asyncio.gather(*(client.rewrite(prompt) for _ in range(repeat) for prompt in prompts))
+    elapsed = time.perf_counter() - started
+    expected = [StandInBackend.respond(prompt) for _ in range(repeat) for prompt in prompts]
+    assert responses == expected, "client returned a response for the wrong prompt"
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rewrite client cache and batching benchmark")
+    parser.add_argument("--prompts", type=int, default=64, help="Distinct prompts in the workload")
+    parser.add_argument("--repeat", type=int, default=3, help="Times each prompt is requested")
+    parser.add_argument("--batch-size", type=int, default=8, help="Client batch size")
+    parser.add_argument("--latency", type=float, default=0.2, help="Stand-in seconds per request")
+    parser.add_argument("--per-prompt", type=float, default=0.01, help="Stand-in seconds per prompt")
+    args = parser.parse_args()
+
+    backend = StandInBackend(args.latency, args.per_prompt)
+    prompts = [f"Rewrite subsystem {index}\n\n## Soul Anchor\n{{\"designation\": \"person {index}\"}}"
+               for index in range(args.prompts)]
+
+    print(f"{'run':<14}{'wall s':>8}{'hit rate':>10}{'coalesced':>11}{'batches':>9}"
+          f"{'mean batch':>12}{'served req':>12}{'served prompts':>16}")
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cached = RewriteClient(backend.endpoint, cache_dir=cache_dir, batch_size=args.batch_size)
+        runs = [("unbatched", RewriteClient(backend.endpoint, batch_size=1)),
+                ("cold", cached), ("warm memory", cached),
+                ("warm disk", RewriteClient(backend.endpoint, cache_dir=cache_dir, batch_size=args.batch_size))]
+        for label, client in runs:
+            backend.reset()
+            before = client.stats()
+            elapsed = asyncio.run(run_workload(client, prompts, args.repeat))
+            after = client.stats()
+            requests = after["requests"] - before["requests"]
+            hits = sum(after[name] - before[name] for name in ("memory_hits", "disk_hits", "coalesced"))
+            batches = after["batches"] - before["batches"]
+            sent = after["backend_prompts"] - before["backend_prompts"]
+            served = backend.stats()
+            print(f"{label:<14}{elapsed:>8.2f}{hits / requests:>10.0%}"
+                  f"{after['coalesced'] - before['coalesced']:>11}{batches:>9}"
+                  f"{sent / batches if batches else 0.0:>12.1f}{served['requests']:>12}{served['prompts']:>16}")
+    backend.close()
+
+
+if __name__ == "__main__":
+    main()
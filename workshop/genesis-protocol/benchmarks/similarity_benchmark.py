@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Event Similarity Scoring Benchmark
+
+Compares the two ways of scoring candidate event pairs used by confluence
+detection:
+
+- scalar: similarity.scalar_similarity(), exact set Jaccard/cosine, called
+  once per pair in Python
+- vectorized: similarity.pair_similarity() over NumPy blocks of pairs
+
+Each event is paired with --pairs-per-event random partners (roughly what LSH
+candidate generation produces). The benchmark reports both timings and the
+largest absolute difference between the two paths, and exits with status 1
+if it exceeds --tolerance.
+
+Usage:
+    python3 benchmarks/similarity_benchmark.py [--sizes 10000,100000,1000000]
+        [--pairs-per-event 4] [--block-size 2048] [--metric cosine]
+        [--tolerance 1e-6]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+from typing import List, FrozenSet
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from similarity import FeatureMatrix, pair_similarity, scalar_similarity
+
+
+def generate_feature_sets(event_count: int, vocabulary_size: int = 50000,
+                          features_per_event: int = 12, seed: int = 7) -> List[FrozenSet[str]]:
+    """Generate event feature sets; every third event re-tells an earlier one with one feature changed."""
+    rng = random.Random(seed)
+    vocabulary = [f"w{index}" for index in range(vocabulary_size)]
+    feature_sets = []
+    for index in range(event_count):
+        if index % 3 == 2:
+            features = set(feature_sets[rng.randrange(index)])
+            features.discard(next(iter(features)))
+            features.add(rng.choice(vocabulary))
+        else:
+            features = set(rng.sample(vocabulary, features_per_event))
+        feature_sets.append(frozenset(features))
+    return feature_sets
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scalar vs vectorized event similarity benchmark")
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="Comma-separated event counts")
+    parser.add_argument("--pairs-per-event", type=int, default=4, help="Candidate pairs per event")
+    parser.add_argument("--block-size", type=int, default=2048, help="Pairs scored per NumPy block")
+    parser.add_argument("--tolerance", type=float, default=1e-6, help="Largest allowed |scalar - vectorized|")
+    parser.add_argument("--metric", default="cosine", choices=["cosine", "jaccard"])
+    args = parser.parse_args()
+
+    failures = []
+    print(f"{'events':>10}{'pairs':>10}{'scalar s':>11}{'vector s':>11}{'speedup':>9}{'max |diff|':>12}")
+    for event_count in (int(size) for size in args.sizes.split(",")):
+        feature_sets = generate_feature_sets(event_count)
+        rng = np.random.default_rng(event_count)
+        left = np.repeat(np.arange(event_count), args.pairs_per_event)
+        right = rng.integers(0, event_count, size=len(left))
+
+        started = time.perf_counter()
+        scalar = np.array([
+            scalar_similarity(feature_sets[a], feature_sets[b], args.metric)
+            for a, b in zip(left.tolist(), right.tolist())
+        ])
+        scalar_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        matrix = FeatureMatrix(feature_sets)
+        vectorized = pair_similarity(matrix, left, right, args.metric, args.block_size)
+        vector_seconds = time.perf_counter() - started
+
+        difference = float(np.max(np.abs(scalar - vectorized)))
+        print(f"{event_count:>10}{len(left):>10}{scalar_seconds:>11.2f}{vector_seconds:>11.2f}"
+              f"{scalar_seconds / vector_seconds:>8.1f}x{difference:>12.2e}")
+        if difference > args.tolerance:
+            failures.append(f"{event_count} events: max |diff| {difference:.2e} exceeds {args.tolerance:.0e}")
+
+    for failure in failures:
+        print(f"MISMATCH: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
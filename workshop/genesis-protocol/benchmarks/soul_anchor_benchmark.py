@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Soul Anchor Parse Benchmark
+
+Parses synthetic Markdown soul anchors of increasing size with
+soul_anchor.parse_markdown_soul_anchor(). Each anchor is the Tony Stark
+template with --traits generated core traits (each with description lines,
+a significance and nested contradictions) and as many canon events.
+
+Parsing is single-pass, so time per line should stay flat as anchors grow;
+the benchmark reports lines, size, parse time and microseconds per line.
+
+Usage:
+    python3 benchmarks/soul_anchor_benchmark.py [--traits 1000,10000,100000]
+        [--repeat 3]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from soul_anchor import parse_markdown_soul_anchor
+
+TEMPLATE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                             "soul-anchors", "tony_stark_template.md")
+
+
+def generate_anchor(trait_count: int) -> str:
+    """Return the template anchor with trait_count extra core traits and canon events."""
+    with open(TEMPLATE_PATH, 'r') as f:
+        template = f.read()
+    traits = []
+    events = []
+    for index in range(trait_count):
+        traits.append(
+            f"- **Generated Trait {index}**:\n"
+            f"  - Behaviour pattern {index} learned from the narrative record\n"
+            f"  - Reinforced across universes and canon events\n"
+            f"  - Significance: 0.{index % 100:02d}\n"
+            f"  - Contradictions:\n"
+            f"    - *Impulse {index} vs. Restraint {index}*: The pull between acting now and waiting\n"
+        )
+        events.append(f"  - Canon event {index} recorded in issue {index * 7}\n")
+    anchor = template.replace("### Historical Context\n", "".join(traits) + "\n### Historical Context\n", 1)
+    return anchor.replace("- **Canon Events**:\n", "- **Canon Events**:\n" + "".join(events), 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Markdown soul anchor parse benchmark")
+    parser.add_argument("--traits", default="1000,10000,100000", help="Comma-separated generated trait counts")
+    parser.add_argument("--repeat", type=int, default=3, help="Parses per size (best time is reported)")
+    args = parser.parse_args()
+
+    print(f"{'traits':>10}{'lines':>10}{'size MB':>10}{'parse s':>10}{'us/line':>10}")
+    for trait_count in (int(count) for count in args.traits.split(",")):
+        content = generate_anchor(trait_count)
+        line_count = content.count("\n") + 1
+        best = float("inf")
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            anchor = parse_markdown_soul_anchor(content)
+            best = min(best, time.perf_counter() - started)
+        core_traits = anchor["soul_data"]["core_traits"]
+        assert len(core_traits) == trait_count + 3, "generated traits were not all parsed"
+        print(f"{trait_count:>10}{line_count:>10}{len(content) / 1e6:>10.2f}{best:>10.3f}"
+              f"{best / line_count * 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
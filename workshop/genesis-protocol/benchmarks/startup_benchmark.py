@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Genesis Startup Benchmark
+
+Guards the start-up cost of the genesis CLI:
+
+- Runs `python -X importtime -c "import genesis"` and reports the total import
+  time plus the slowest modules, and fails if a heavy module that is only
+  imported where it is used (asyncio, numpy, yaml, torch, TTS,
+  importlib.metadata) is imported eagerly.
+- Times the quick commands (`genesis.py --check-anchor` and `--dry-run`) end
+  to end, best of --repeat, against --budget-ms.
+
+Exits with status 1 on any regression, so it can run in CI. Bytecode is
+compiled first, as it would be after installation.
+
+Usage:
+    python3 benchmarks/startup_benchmark.py [--anchor PATH] [--repeat 7]
+        [--budget-ms 100] [--top 10]
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import compileall
+import subprocess
+from typing import Dict, List, Tuple
+
+GENESIS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_ANCHOR = os.path.join(os.path.dirname(GENESIS_DIR), "soul-anchors", "tony_stark_template.md")
+
+# Heavy modules, imported function-locally by the code that needs them
+DEFERRED_MODULES = ("asyncio", "numpy", "yaml", "torch", "TTS", "importlib.metadata")
+
+
+def import_times() -> Dict[str, Tuple[int, int]]:
+    """Return {module: (self us, cumulative us)} for a fresh `import genesis`."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import genesis"],
+                            cwd=GENESIS_DIR, capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def best_wall_time(command: List[str], cwd: str, repeat: int) -> Tuple[float, int]:
+    """Return (best wall seconds, exit code of the last run) for a command."""
+    best, returncode = float("inf"), 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        returncode = subprocess.run(command, cwd=cwd, stdout=subprocess.DEVNULL,
+                                    stderr=subprocess.DEVNULL).returncode
+        best = min(best, time.perf_counter() - started)
+    return best, returncode
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genesis CLI start-up benchmark")
+    parser.add_argument("--anchor", default=DEFAULT_ANCHOR, help="Soul anchor used for the quick commands")
+    parser.add_argument("--repeat", type=int, default=7, help="Runs per command (best time is reported)")
+    parser.add_argument("--budget-ms", type=float, default=100.0, help="Wall-time budget per quick command")
+    parser.add_argument("--top", type=int, default=10, help="Slowest imported modules to list")
+    args = parser.parse_args()
+
+    compileall.compile_dir(GENESIS_DIR, maxlevels=0, quiet=1)
+    failures = []
+
+    # Import profile
+    times = import_times()
+    total_ms = times["genesis"][1] / 1000
+    print(f"import genesis: {total_ms:.1f} ms cumulative")
+    for name, (self_us, cumulative_us) in sorted(times.items(), key=lambda item: -item[1][0])[:args.top]:
+        print(f"  {name:<32}{self_us / 1000:>8.1f} ms self{cumulative_us / 1000:>9.1f} ms cumulative")
+    eager = [name for name in DEFERRED_MODULES if name in times]
+    if eager:
+        failures.append(f"deferred modules imported eagerly: {', '.join(eager)}")
+
+    # Quick commands, end to end, from a scratch container
+    genesis = os.path.join(GENESIS_DIR, "genesis.py")
+    with tempfile.TemporaryDirectory() as container:
+        shutil.copy(args.anchor, os.path.join(container, "soul_anchor.txt"))
+        baseline, _ = best_wall_time([sys.executable, "-c", "pass"], container, args.repeat)
+        print(f"python -c pass: {baseline * 1000:.1f} ms")
+        for flag in ("--check-anchor", "--dry-run"):
+            seconds, returncode = best_wall_time([sys.executable, genesis, flag], container, args.repeat)
+            status = "ok" if returncode == 0 else f"exit {returncode}"
+            print(f"genesis.py {flag}: {seconds * 1000:.1f} ms ({status})")
+            if returncode != 0:
+                failures.append(f"{flag} exited with status {returncode}")
+            elif seconds * 1000 > args.budget_ms:
+                failures.append(f"{flag} took {seconds * 1000:.1f} ms (budget {args.budget_ms:.0f} ms)")
+        if os.listdir(container) != ["soul_anchor.txt"]:
+            failures.append(f"quick commands wrote to the container: {sorted(os.listdir(container))}")
+
+    for failure in failures:
+        print(f"REGRESSION: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
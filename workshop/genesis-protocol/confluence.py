@@ -0,0 +1,406 @@
+"""
+Narrative Confluence Detection for the Universal Genesis Protocol
+
+A confluence is a common thread: the same (or nearly the same) event told in
+more than one universe. Comparing every event with every other is quadratic,
+so detection works in three stages:
+
+1. Normalize every event into a set of features (lower-cased content words of
+   its descriptive text, plus entity/location/date features) and group events
+   with identical feature sets through an inverted index. Exact duplicates are
+   merged here without being scored.
+2. Compute MinHash signatures for the distinct feature sets and bucket them
+   with LSH banding. Only feature sets sharing a bucket become candidate pairs.
+   Small inputs (at most `exhaustive_limit` distinct feature sets) skip LSH:
+   every pair is scored in dense tiles (similarity.blocked_similarity), so
+   no near-duplicate is lost to a MinHash miss.
+3. Score candidate pairs exactly (one vector column per distinct feature) in
+   NumPy blocks (similarity.pair_similarity), join pairs at or above the
+   similarity threshold into threads (union-find), and report every thread
+   whose events span at least `min_universes` universes.
+
+Signatures, band keys and pair scores are computed with NumPy over all
+feature sets at once.
+
+After an incremental memory update, update() takes the previous confluences
+and the touched (added, changed or removed) events. It re-scores only the LSH
+candidates of touched events and of the remaining members of threads that
+held one, and keeps every other thread as it was.
+"""
+
+import re
+import zlib
+import logging
+from typing import Dict, List, Any, Optional, Iterable, Tuple, FrozenSet
+
+import numpy as np
+
+from similarity import FeatureMatrix, pair_similarity, blocked_similarity, METRICS, DEFAULT_BLOCK_SIZE
+
+logger = logging.getLogger("UniversalGenesisProtocol.Confluence")
+
+# Event fields whose text is tokenized into word features
+TEXT_FIELDS = frozenset(("title", "name", "summary", "description", "event", "text"))
+
+# Event fields whose values are kept as whole-value features (entity:..., location:..., ...)
+VALUE_FIELDS = {
+    "entities": "entity", "participants": "entity", "characters": "entity",
+    "location": "location", "locations": "location",
+    "date": "date", "time": "date", "tags": "tag"
+}
+
+_FEATURE_FIELDS = TEXT_FIELDS | VALUE_FIELDS.keys()
+
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have he her his in into is it its of on or "
+    "she that the their them they this to was were which while who with".split()
+)
+
+_WORD = re.compile(r"[a-z0-9]{2,}")
+# Smallest prime above 2^32: (a * x + b) stays below 2^64 for 32-bit a, x and b
+_PRIME = 4294967311
+
+DEFAULT_EXHAUSTIVE_LIMIT = 2048
+
+
+def event_features(data: Dict[str, Any]) -> FrozenSet[str]:
+    """Return the normalized feature set of an event's data."""
+    features = set()
+    for field in _FEATURE_FIELDS.intersection(data):
+        value = data[field]
+        if field in TEXT_FIELDS:
+            if isinstance(value, str):
+                features.update(_WORD.findall(value.lower()))
+            continue
+        if value is None:
+            continue
+        prefix = VALUE_FIELDS[field]
+        for item in value if isinstance(value, (list, tuple, set)) else (value,):
+            item = " ".join(str(item).lower().split())
+            if item:
+                features.add(f"{prefix}:{item}")
+    features -= STOPWORDS
+    return frozenset(features)
+
+
+class _DisjointSet:
+    """Union-find over integer ids with path halving."""
+
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, item: int) -> int:
+        parent = self.parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, a: int, b: int):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            self.parent[max(root_a, root_b)] = min(root_a, root_b)
+
+
+class ConfluenceDetector:
+    """Index-based confluence detection with tunable similarity thresholds."""
+
+    def __init__(self, similarity_threshold: float = 0.8, num_perm: int = 64,
+                 bands: Optional[int] = None, min_universes: int = 2,
+                 max_bucket_size: int = 1000, seed: int = 1, metric: str = "jaccard",
+                 block_size: int = DEFAULT_BLOCK_SIZE, exhaustive_limit: int = DEFAULT_EXHAUSTIVE_LIMIT):
+        """
+        Args:
+            similarity_threshold: Minimum similarity for two events to share a thread.
+            num_perm: MinHash signature length.
+            bands: LSH bands (must divide num_perm). By default the band count whose
+                LSH threshold sits just below similarity_threshold is chosen, so
+                pairs near the threshold are still proposed as candidates.
+            min_universes: Minimum number of distinct universes a thread must span.
+            max_bucket_size: LSH buckets larger than this are skipped (they hold
+                generic events that would otherwise produce a quadratic number of pairs).
+            seed: Seed for the MinHash permutations, so results are reproducible.
+            metric: "jaccard" (what MinHash estimates) or "cosine", computed
+                exactly on the events' feature sets.
+            block_size: Candidate pairs scored per NumPy block (bounds memory).
+            exhaustive_limit: Up to this many distinct feature sets, all pairs are
+                scored in tiles instead of only LSH candidates (0 always uses LSH).
+        """
+        if not 0.0 < similarity_threshold <= 1.0:
+            raise ValueError("similarity_threshold must be in (0, 1]")
+        if metric not in METRICS:
+            raise ValueError(f"Unknown similarity metric: {metric}")
+        self.similarity_threshold = similarity_threshold
+        self.num_perm = num_perm
+        self.bands = bands or self._choose_bands(num_perm, similarity_threshold)
+        if num_perm % self.bands:
+            raise ValueError(f"bands ({self.bands}) must divide num_perm ({num_perm})")
+        self.rows = num_perm // self.bands
+        self.min_universes = min_universes
+        self.max_bucket_size = max_bucket_size
+        self.metric = metric
+        self.block_size = block_size
+        self.exhaustive_limit = exhaustive_limit
+
+        rng = np.random.default_rng(seed)
+        self._perm_a = rng.integers(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self._perm_b = rng.integers(0, 1 << 32, size=num_perm, dtype=np.uint64)
+        self._band_mix = rng.integers(1, 1 << 63, size=self.rows, dtype=np.uint64) | np.uint64(1)
+
+    @staticmethod
+    def _choose_bands(num_perm: int, similarity_threshold: float) -> int:
+        """Pick the band count with the highest LSH threshold below 0.9 * similarity_threshold."""
+        target = 0.9 * similarity_threshold
+        best, best_threshold = 1, -1.0
+        for bands in range(1, num_perm + 1):
+            if num_perm % bands:
+                continue
+            lsh_threshold = (1.0 / bands) ** (bands / num_perm)
+            if best_threshold < lsh_threshold <= target:
+                best, best_threshold = bands, lsh_threshold
+        return best
+
+    def detect(self, nodes: Iterable[Dict]) -> List[Dict]:
+        """
+        Find confluences among event nodes.
+
+        Each node needs "id", "universe" and "data". Returns one record per
+        thread: {"id", "nodes", "universes", "similarity", "shared_features"},
+        where similarity is the lowest scored similarity that joined the thread.
+        """
+        # Stage 1: inverted index from normalized feature set to events
+        feature_groups = self._feature_groups(nodes)
+        feature_sets = list(feature_groups)
+        if not feature_sets:
+            return []
+
+        # Stages 2 and 3: candidate pairs between distinct feature sets, scored in blocks
+        threads = _DisjointSet(len(feature_sets))
+        weakest = [1.0] * len(feature_sets)
+        left, right, scores = self.scored_pairs(feature_sets)
+        joined = self._join(threads, weakest, left, right, scores)
+        logger.debug(f"{len(feature_sets)} distinct feature sets, {len(left)} candidate pairs, "
+                     f"{joined} joined")
+
+        members: Dict[int, List[int]] = {}
+        for index in range(len(feature_sets)):
+            members.setdefault(threads.find(index), []).append(index)
+
+        confluences = []
+        for root in sorted(members):
+            record = self._thread_record(members[root], feature_sets, feature_groups, weakest)
+            if record:
+                record["id"] = f"confluence_{len(confluences)}"
+                confluences.append(record)
+        return confluences
+
+    def update(self, nodes: Iterable[Dict], confluences: List[Dict], touched: Iterable[str]) -> List[Dict]:
+        """
+        Re-identify confluences after the events in `touched` were added,
+        changed or removed, given the confluences found before the change.
+
+        Threads without a touched event are kept as they are. Only threads
+        that held a touched event and the LSH candidates of touched events
+        are re-scored, spreading to further events only through new joins;
+        a kept thread reached that way is merged whole. Small inputs (at most
+        exhaustive_limit distinct feature sets) are simply re-detected.
+        """
+        nodes = list(nodes)
+        feature_groups = self._feature_groups(nodes)
+        feature_sets = list(feature_groups)
+        if len(feature_sets) <= self.exhaustive_limit:
+            return self.detect(nodes)
+        touched = set(touched)
+        index_of = {node_id: index for index, features in enumerate(feature_sets)
+                    for node_id, _ in feature_groups[features]}
+        seeds = {index_of[node_id] for node_id in touched if node_id in index_of}
+
+        # Threads holding a touched event (or sharing a feature set with one) are re-scored
+        threads = _DisjointSet(len(feature_sets))
+        weakest = [1.0] * len(feature_sets)
+        kept: List[Tuple[Dict, List[int]]] = []
+        in_kept: Dict[int, int] = {}
+        for confluence in confluences:
+            indices = sorted({index_of.get(node_id, -1) for node_id in confluence["nodes"]})
+            if indices[0] < 0 or touched.intersection(confluence["nodes"]) or seeds.intersection(indices):
+                seeds.update(index for index in indices if index >= 0)
+                continue
+            for index in indices:
+                threads.union(indices[0], index)
+                weakest[index] = confluence["similarity"]
+                in_kept[index] = len(kept)
+            kept.append((confluence, indices))
+
+        # Score candidates of the frontier until no new event joins
+        index = self._bucket_index(feature_sets)
+        visited = set(seeds)
+        frontier = np.fromiter(sorted(seeds), dtype=np.int64, count=len(seeds))
+        scored = np.empty(0, dtype=np.int64)
+        pairs = 0
+        while len(frontier):
+            codes = np.setdiff1d(self._candidate_codes(index, frontier, len(feature_sets)), scored)
+            scored = np.union1d(scored, codes)
+            left, right = codes // len(feature_sets), codes % len(feature_sets)
+            pairs += len(codes)
+            scores = self.score_pairs(feature_sets, left, right)
+            self._join(threads, weakest, left, right, scores)
+            hit = scores >= self.similarity_threshold - 1e-6
+            reached = np.union1d(left[hit], right[hit]).tolist()
+            frontier = np.array([other for other in reached if other not in visited and other not in in_kept],
+                                dtype=np.int64)
+            visited.update(reached)
+        logger.debug(f"Re-scored {pairs} candidate pairs around {len(seeds)} touched feature sets")
+
+        # Rebuild the threads the frontier reached; keep every other record as it was
+        affected = {threads.find(index) for index in visited}
+        members: Dict[int, List[int]] = {}
+        for index in visited.union(*(indices for _, indices in kept)):
+            root = threads.find(index)
+            if root in affected:
+                members.setdefault(root, []).append(index)
+        updated = [dict(confluence) for confluence, indices in kept if threads.find(indices[0]) not in affected]
+        for root in sorted(members):
+            record = self._thread_record(sorted(members[root]), feature_sets, feature_groups, weakest)
+            if record:
+                updated.append(record)
+        for position, record in enumerate(updated):
+            record["id"] = f"confluence_{position}"
+        return updated
+
+    @staticmethod
+    def _feature_groups(nodes: Iterable[Dict]) -> Dict[FrozenSet[str], List[Tuple[str, Any]]]:
+        """Group events by normalized feature set: {features: [(node id, universe)]}."""
+        feature_groups: Dict[FrozenSet[str], List[Tuple[str, Any]]] = {}
+        for node in nodes:
+            features = event_features(node.get("data") or {})
+            if features:
+                feature_groups.setdefault(features, []).append((node["id"], node.get("universe", "Unknown")))
+        return feature_groups
+
+    def _join(self, threads: _DisjointSet, weakest: List[float], left: np.ndarray, right: np.ndarray,
+              scores: np.ndarray) -> int:
+        """Union every scored pair at or above the threshold; returns how many joined."""
+        # float32 scores: allow for rounding right at the threshold
+        joined = scores >= self.similarity_threshold - 1e-6
+        for a, b, score in zip(left[joined].tolist(), right[joined].tolist(), scores[joined].tolist()):
+            threads.union(a, b)
+            weakest[a] = min(weakest[a], score)
+            weakest[b] = min(weakest[b], score)
+        return int(joined.sum())
+
+    def _thread_record(self, group: List[int], feature_sets: List[FrozenSet[str]],
+                       feature_groups: Dict[FrozenSet[str], List[Tuple[str, Any]]],
+                       weakest: List[float]) -> Optional[Dict]:
+        """Return the confluence record of a thread (without id), or None if it spans too few universes."""
+        events = [event for index in group for event in feature_groups[feature_sets[index]]]
+        universes = sorted({universe for _, universe in events}, key=str)
+        if len(universes) < self.min_universes:
+            return None
+        shared = frozenset.intersection(*(feature_sets[index] for index in group))
+        return {
+            "id": None,
+            "nodes": [node_id for node_id, _ in events],
+            "universes": universes,
+            "similarity": round(min(weakest[index] for index in group), 4),
+            "shared_features": sorted(shared)[:20]
+        }
+
+    def scored_pairs(self, feature_sets: List[FrozenSet[str]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Return (i, j, similarity) arrays of the pairs worth joining: LSH
+        candidates, or for small inputs every pair near the threshold.
+        """
+        if len(feature_sets) > self.exhaustive_limit:
+            left, right = self.candidate_pairs(feature_sets)
+            return left, right, self.score_pairs(feature_sets, left, right)
+        matrix = FeatureMatrix(feature_sets)
+        hits = list(blocked_similarity(matrix, self.similarity_threshold - 1e-6, metric=self.metric))
+        if not hits:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, np.empty(0, dtype=np.float32)
+        left, right, scores = (np.concatenate(part) for part in zip(*hits))
+        return left, right, scores
+
+    def score_pairs(self, feature_sets: List[FrozenSet[str]], left: np.ndarray, right: np.ndarray) -> np.ndarray:
+        """Return the similarity of every candidate pair (left[k], right[k])."""
+        if not len(left):
+            return np.empty(0, dtype=np.float32)
+        # Vectorize only the feature sets the pairs use
+        rows = np.union1d(left, right)
+        if len(rows) < len(feature_sets):
+            matrix = FeatureMatrix([feature_sets[row] for row in rows.tolist()])
+            left, right = np.searchsorted(rows, left), np.searchsorted(rows, right)
+        else:
+            matrix = FeatureMatrix(feature_sets)
+        return pair_similarity(matrix, left, right, self.metric, self.block_size)
+
+    def signatures(self, feature_sets: List[FrozenSet[str]]) -> np.ndarray:
+        """Return the (len(feature_sets), num_perm) MinHash signature matrix."""
+        # Hash each distinct feature once (crc32, so signatures are stable across runs)
+        flat = [feature for features in feature_sets for feature in features]
+        vocabulary = {feature: index for index, feature in enumerate(dict.fromkeys(flat))}
+        feature_hashes = np.fromiter((zlib.crc32(feature.encode("utf-8")) for feature in vocabulary),
+                                     dtype=np.uint64, count=len(vocabulary))
+        values = feature_hashes[np.fromiter(map(vocabulary.__getitem__, flat), dtype=np.intp, count=len(flat))]
+        starts = np.zeros(len(feature_sets), dtype=np.intp)
+        np.cumsum([len(features) for features in feature_sets[:-1]], out=starts[1:])
+        signatures = np.empty((len(feature_sets), self.num_perm), dtype=np.uint64)
+        prime = np.uint64(_PRIME)
+        for perm in range(self.num_perm):
+            hashed = (self._perm_a[perm] * values + self._perm_b[perm]) % prime
+            signatures[:, perm] = np.minimum.reduceat(hashed, starts)
+        return signatures
+
+    def candidate_pairs(self, feature_sets: List[FrozenSet[str]]) -> Tuple[np.ndarray, np.ndarray]:
+        """Return index arrays (i, j), i < j, of the distinct pairs sharing at least one LSH bucket."""
+        empty = np.empty(0, dtype=np.int64)
+        if len(feature_sets) < 2:
+            return empty, empty
+        signatures = self.signatures(feature_sets)
+        pair_codes = []
+        skipped = 0
+        for band in range(self.bands):
+            rows = signatures[:, band * self.rows:(band + 1) * self.rows]
+            keys = (rows * self._band_mix).sum(axis=1, dtype=np.uint64)
+            order = np.argsort(keys, kind="stable").astype(np.int64)
+            starts = np.concatenate(([0], np.flatnonzero(np.diff(keys[order])) + 1))
+            sizes = np.diff(np.concatenate((starts, [len(order)])))
+            skipped += int(np.count_nonzero(sizes > self.max_bucket_size))
+            # Expand all buckets of the same size at once into their member pairs
+            for size in np.unique(sizes[(sizes >= 2) & (sizes <= self.max_bucket_size)]).tolist():
+                buckets = np.sort(order[starts[sizes == size][:, None] + np.arange(size)], axis=1)
+                left, right = np.triu_indices(size, k=1)
+                pair_codes.append((buckets[:, left] * len(feature_sets) + buckets[:, right]).ravel())
+        if skipped:
+            logger.info(f"Skipped {skipped} oversized LSH buckets (max_bucket_size={self.max_bucket_size})")
+        if not pair_codes:
+            return empty, empty
+        codes = np.unique(np.concatenate(pair_codes))
+        return codes // len(feature_sets), codes % len(feature_sets)
+
+    def _bucket_index(self, feature_sets: List[FrozenSet[str]]) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """Return, per LSH band, (band key of every feature set, sort order, sorted keys)."""
+        signatures = self.signatures(feature_sets)
+        index = []
+        for band in range(self.bands):
+            rows = signatures[:, band * self.rows:(band + 1) * self.rows]
+            keys = (rows * self._band_mix).sum(axis=1, dtype=np.uint64)
+            order = np.argsort(keys, kind="stable").astype(np.int64)
+            index.append((keys, order, keys[order]))
+        return index
+
+    def _candidate_codes(self, index: List[Tuple[np.ndarray, np.ndarray, np.ndarray]], members: np.ndarray,
+                         count: int) -> np.ndarray:
+        """Return the distinct pair codes (i * count + j, i < j) of pairs sharing a bucket with `members`."""
+        codes = [np.empty(0, dtype=np.int64)]
+        for keys, order, sorted_keys in index:
+            starts = np.searchsorted(sorted_keys, keys[members], side="left")
+            sizes = np.searchsorted(sorted_keys, keys[members], side="right") - starts
+            usable = (sizes >= 2) & (sizes <= self.max_bucket_size)
+            starts, sizes, owners = starts[usable], sizes[usable], members[usable]
+            offsets = np.repeat(starts - np.cumsum(sizes) + sizes, sizes) + np.arange(sizes.sum())
+            partners, owners = order[offsets], np.repeat(owners, sizes)
+            distinct = partners != owners
+            partners, owners = partners[distinct], owners[distinct]
+            codes.append(np.minimum(owners, partners) * count + np.maximum(owners, partners))
+        return np.unique(np.concatenate(codes))
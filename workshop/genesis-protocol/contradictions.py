@@ -0,0 +1,365 @@
+"""
+Cross-Source Contradiction Detection for the Universal Genesis Protocol
+
+_extract_contradictions only sees one source at a time. This engine finds
+contradictions between sources (and, optionally, universes) by indexing event
+claims by entity and canonical time range, so only claims that can actually
+compete are compared:
+
+- Exclusive attributes (location, status, ...): an entity cannot hold two
+  different values of the same attribute at the same time. Claims are grouped
+  by (entity, attribute), sorted by start, and swept with an active set of
+  intervals; only overlapping claims with different values are compared.
+- Singular events (birth, death, origin, ...): an entity has one of each.
+  Claims are grouped by (entity, kind), sorted and merged into overlapping
+  clusters; more than one cluster means competing dates.
+
+Grouping and sorting make the check O(n log n) plus the number of conflicts
+reported. Claims compete on exact normalized values within a group, not on
+feature similarity, so there is no per-pair score to batch: unlike confluence
+scoring, this does not use the NumPy matrices in similarity.py. The sweep
+only visits overlapping claims, and its cost beyond sorting is the conflicts
+it reports. Events without a parseable time range are not compared. Records use
+the knowledge graph's contradiction format ({"conflicting_nodes", "nature",
+"resolution"}) with "scope": "cross_source" so they can be recomputed, and
+"group" (the claim group they came from) so update() can revisit only the
+groups an incremental memory update touched.
+"""
+
+import re
+import heapq
+import logging
+import calendar
+from datetime import date, datetime
+from bisect import bisect_right
+from typing import Dict, List, Any, Optional, Iterable, Tuple, Set, Callable
+
+logger = logging.getLogger("UniversalGenesisProtocol.Contradictions")
+
+SCOPE = "cross_source"
+
+DEFAULT_EXCLUSIVE_ATTRIBUTES = ("location", "status", "state", "affiliation", "role", "alias")
+DEFAULT_SINGULAR_EVENTS = ("birth", "death", "origin", "creation", "first_appearance")
+
+# Event fields naming the entities a claim is about
+ENTITY_FIELDS = ("entity", "entities", "subject", "participants", "characters")
+
+_DATE = re.compile(r"^\s*(\d{1,4})(?:-(\d{1,2})(?:-(\d{1,2}))?)?")
+
+
+def _normalize(value: Any) -> str:
+    return " ".join(str(value).lower().split())
+
+
+def canonical_time_range(value: Any) -> Optional[Tuple[int, int]]:
+    """
+    Return an inclusive (first day, last day) ordinal range for a time value.
+
+    Accepts years (1962, "1962"), months ("1962-08"), days ("1962-08-15",
+    date/datetime), {"start": ..., "end": ...} mappings and (start, end) pairs.
+    Returns None if the value cannot be interpreted.
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, dict):
+        return _span(canonical_time_range(value.get("start")), canonical_time_range(value.get("end")))
+    if isinstance(value, (list, tuple)):
+        if len(value) != 2:
+            return None
+        return _span(canonical_time_range(value[0]), canonical_time_range(value[1]))
+    if isinstance(value, datetime):
+        value = value.date()
+    if isinstance(value, date):
+        return value.toordinal(), value.toordinal()
+    if isinstance(value, int):
+        value = str(value)
+    if not isinstance(value, str):
+        return None
+
+    match = _DATE.match(value)
+    if not match:
+        return None
+    year, month, day = (int(part) if part else None for part in match.groups())
+    try:
+        if month is None:
+            return date(year, 1, 1).toordinal(), date(year, 12, 31).toordinal()
+        if day is None:
+            return date(year, month, 1).toordinal(), date(year, month, calendar.monthrange(year, month)[1]).toordinal()
+        return date(year, month, day).toordinal(), date(year, month, day).toordinal()
+    except ValueError:
+        return None
+
+
+def _span(start: Optional[Tuple[int, int]], end: Optional[Tuple[int, int]]) -> Optional[Tuple[int, int]]:
+    if start and end:
+        return (start[0], end[1]) if start[0] <= end[1] else None
+    return start or end
+
+
+def event_time_range(data: Dict[str, Any]) -> Optional[Tuple[int, int]]:
+    """Return the canonical time range of an event, if it has one."""
+    if "start" in data or "end" in data:
+        return _span(canonical_time_range(data.get("start")), canonical_time_range(data.get("end")))
+    if "start_date" in data or "end_date" in data:
+        return _span(canonical_time_range(data.get("start_date")), canonical_time_range(data.get("end_date")))
+    for field in ("date", "time", "year"):
+        if field in data:
+            return canonical_time_range(data[field])
+    return None
+
+
+def event_entities(data: Dict[str, Any]) -> List[str]:
+    """Return the normalized entities an event makes claims about."""
+    entities = []
+    for field in ENTITY_FIELDS:
+        value = data.get(field)
+        if value is None:
+            continue
+        for item in value if isinstance(value, (list, tuple, set)) else (value,):
+            item = _normalize(item)
+            if item and item not in entities:
+                entities.append(item)
+    return entities
+
+
+def format_time_range(time_range: Tuple[int, int]) -> str:
+    """Render an ordinal time range as ISO dates."""
+    start, end = (date.fromordinal(day).isoformat() for day in time_range)
+    return start if start == end else f"{start}..{end}"
+
+
+def _overlaps_any(claim: "_Claim", starts: List[int], reach: List[int]) -> bool:
+    """True if the claim overlaps a window; windows are sorted by start, reach[k] is the latest end among the first k+1."""
+    position = bisect_right(starts, claim.end) - 1
+    return position >= 0 and reach[position] >= claim.start
+
+
+class _Claim:
+    __slots__ = ("start", "end", "value", "node_id", "source", "universe")
+
+    def __init__(self, start: int, end: int, value: str, node_id: str, source: Any, universe: Any):
+        self.start = start
+        self.end = end
+        self.value = value
+        self.node_id = node_id
+        self.source = source
+        self.universe = universe
+
+
+class ContradictionEngine:
+    """Entity/time-indexed contradiction detection between sources."""
+
+    def __init__(self, exclusive_attributes: Iterable[str] = DEFAULT_EXCLUSIVE_ATTRIBUTES,
+                 singular_events: Iterable[str] = DEFAULT_SINGULAR_EVENTS,
+                 cross_universe: bool = True, max_conflicts_per_group: int = 1000):
+        """
+        Args:
+            exclusive_attributes: Event fields an entity can only hold one value of at a time.
+            singular_events: Event kinds ("type"/"kind" field) an entity has only one of.
+            cross_universe: Also compare claims from different universes. Such conflicts
+                are reported as universe divergences rather than source disagreements.
+            max_conflicts_per_group: Cap on conflicts reported per (entity, attribute).
+        """
+        self.exclusive_attributes = tuple(exclusive_attributes)
+        self.singular_events = frozenset(_normalize(kind) for kind in singular_events)
+        self.cross_universe = cross_universe
+        self.max_conflicts_per_group = max_conflicts_per_group
+
+    def detect(self, nodes: Iterable[Dict]) -> List[Dict]:
+        """Return contradiction records for conflicting claims made by different sources."""
+        attribute_claims, singular_claims = self._index_claims(nodes)
+        contradictions = []
+        for key, claims in attribute_claims.items():
+            contradictions.extend(self._attribute_conflicts(key, claims))
+        for key, claims in singular_claims.items():
+            contradiction = self._singular_conflict(key, claims)
+            if contradiction:
+                contradictions.append(contradiction)
+        return contradictions
+
+    def update(self, nodes: Iterable[Dict], contradictions: List[Dict], previous: Iterable[Dict],
+               touched: Iterable[str]) -> List[Dict]:
+        """
+        Update cross-source contradictions after the events in `touched` were
+        added, changed or removed, given the records found before the change
+        and the previous versions of the changed and removed events.
+
+        Only groups with a touched claim are revisited. An attribute group
+        drops its records naming a touched event and re-sweeps just the claims
+        overlapping the touched events' current intervals; a singular group is
+        re-clustered whole. Records of every other group are kept. Records
+        without a "group" (written before groups were recorded) mean a full
+        detect().
+        """
+        nodes = list(nodes)
+        if any("group" not in contradiction for contradiction in contradictions):
+            return self.detect(nodes)
+        touched = set(touched)
+
+        # Groups with a claim from a touched event, before or after the change
+        current = [node for node in nodes if node["id"] in touched]
+        old_attributes, old_singulars = self._index_claims(previous)
+        new_attributes, new_singulars = self._index_claims(current)
+        attribute_keys = old_attributes.keys() | new_attributes.keys()
+        singular_keys = old_singulars.keys() | new_singulars.keys()
+        if not attribute_keys and not singular_keys:
+            return list(contradictions)
+        attribute_claims, singular_claims = self._index_claims(
+            nodes, lambda key, singular: key in (singular_keys if singular else attribute_keys),
+            {key[-2] for key in attribute_keys | singular_keys})
+
+        updated = []
+        kept_per_group: Dict[Tuple, int] = {}
+        for contradiction in contradictions:
+            kind, *key = contradiction["group"]
+            key = tuple(key)
+            if kind == "singular" and key in singular_keys:
+                continue
+            if kind == "attribute" and key in attribute_keys:
+                if touched.intersection(contradiction["conflicting_nodes"]):
+                    continue
+                kept_per_group[key] = kept_per_group.get(key, 0) + 1
+            updated.append(contradiction)
+
+        # Re-sweep only the claims overlapping a touched claim's current interval
+        for key in attribute_keys:
+            windows = sorted((claim.start, claim.end) for claim in new_attributes.get(key, ()))
+            if not windows:
+                continue
+            starts = [start for start, _ in windows]
+            reach = [end for _, end in windows]
+            for position in range(1, len(reach)):
+                reach[position] = max(reach[position], reach[position - 1])
+            claims = [claim for claim in attribute_claims.get(key, ())
+                      if _overlaps_any(claim, starts, reach)]
+            updated.extend(self._attribute_conflicts(
+                key, claims, involving=touched,
+                limit=self.max_conflicts_per_group - kept_per_group.get(key, 0)))
+        for key in singular_keys:
+            contradiction = self._singular_conflict(key, singular_claims.get(key, []))
+            if contradiction:
+                updated.append(contradiction)
+        return updated
+
+    def _index_claims(self, nodes: Iterable[Dict], wanted: Optional[Callable[[Tuple, bool], bool]] = None,
+                      entities_of_interest: Optional[Set[str]] = None) -> Tuple[Dict, Dict]:
+        """
+        Index claims by (entity, attribute) and (entity, kind), prefixed by
+        the universe unless cross_universe. `wanted(key, singular)` limits
+        which groups are collected; events about none of
+        `entities_of_interest` are skipped before their dates are parsed.
+        """
+        attribute_claims: Dict[Tuple, List[_Claim]] = {}
+        singular_claims: Dict[Tuple, List[_Claim]] = {}
+        for node in nodes:
+            data = node.get("data") or {}
+            entities = event_entities(data)
+            if not entities or (entities_of_interest is not None and entities_of_interest.isdisjoint(entities)):
+                continue
+            time_range = event_time_range(data)
+            if time_range is None:
+                continue
+            universe = node.get("universe", "Unknown")
+            scope = () if self.cross_universe else (universe,)
+            kind = _normalize(data.get("type") or data.get("kind") or "")
+            for entity in entities:
+                for attribute in self.exclusive_attributes:
+                    value = data.get(attribute)
+                    if value is None or isinstance(value, (dict, list)):
+                        continue
+                    key = (*scope, entity, attribute)
+                    if wanted is None or wanted(key, False):
+                        attribute_claims.setdefault(key, []).append(
+                            _Claim(*time_range, _normalize(value), node["id"], node.get("source"), universe))
+                if kind in self.singular_events:
+                    key = (*scope, entity, kind)
+                    if wanted is None or wanted(key, True):
+                        singular_claims.setdefault(key, []).append(
+                            _Claim(*time_range, kind, node["id"], node.get("source"), universe))
+        return attribute_claims, singular_claims
+
+    def _attribute_conflicts(self, key: Tuple, claims: List[_Claim], involving: Optional[Set[str]] = None,
+                             limit: Optional[int] = None) -> List[Dict]:
+        """
+        Sweep claims in start order, comparing each only with overlapping
+        claims of other values. With `involving`, only conflicts naming one of
+        those events are reported, at most `limit` of them.
+        """
+        entity, attribute = key[-2:]
+        limit = self.max_conflicts_per_group if limit is None else limit
+        if limit <= 0 or len(claims) < 2 or len({claim.value for claim in claims}) < 2:
+            return []
+        claims.sort(key=lambda claim: claim.start)
+        ending: List[Tuple[int, int]] = []
+        active: Dict[str, Dict[int, _Claim]] = {}
+        conflicts = []
+        for position, claim in enumerate(claims):
+            # Retire claims that ended before this one starts
+            while ending and ending[0][0] < claim.start:
+                _, retired = heapq.heappop(ending)
+                by_value = active[claims[retired].value]
+                del by_value[retired]
+                if not by_value:
+                    del active[claims[retired].value]
+
+            for value, overlapping in active.items():
+                if value == claim.value:
+                    continue
+                for other in overlapping.values():
+                    if other.source == claim.source:
+                        continue
+                    if involving is not None and other.node_id not in involving and claim.node_id not in involving:
+                        continue
+                    if len(conflicts) >= limit:
+                        logger.warning(f"More than {self.max_conflicts_per_group} conflicting {attribute} claims "
+                                       f"for {entity}; reporting the first {self.max_conflicts_per_group}")
+                        return conflicts
+                    conflicts.append(self._record(
+                        ("attribute", *key), [other, claim],
+                        f"Conflicting {attribute} for {entity}: '{other.value}' ({other.source}, "
+                        f"{format_time_range((other.start, other.end))}) vs '{claim.value}' "
+                        f"({claim.source}, {format_time_range((claim.start, claim.end))})"
+                    ))
+
+            active.setdefault(claim.value, {})[position] = claim
+            heapq.heappush(ending, (claim.end, position))
+        return conflicts
+
+    def _singular_conflict(self, key: Tuple, claims: List[_Claim]) -> Optional[Dict]:
+        """Merge claims into overlapping time clusters; more than one cluster means competing dates."""
+        entity, kind = key[-2:]
+        if len(claims) < 2 or len({claim.source for claim in claims}) < 2:
+            return None
+        claims.sort(key=lambda claim: claim.start)
+        clusters: List[List[_Claim]] = []
+        cluster_end = None
+        for claim in claims:
+            if cluster_end is None or claim.start > cluster_end:
+                clusters.append([])
+                cluster_end = claim.end
+            clusters[-1].append(claim)
+            cluster_end = max(cluster_end, claim.end)
+        if len(clusters) < 2:
+            return None
+
+        dates = " vs ".join(
+            f"{format_time_range((cluster[0].start, max(claim.end for claim in cluster)))} "
+            f"({', '.join(sorted({str(claim.source) for claim in cluster}))})"
+            for cluster in clusters
+        )
+        return self._record(("singular", *key), claims, f"Competing {kind.replace('_', ' ')} dates for {entity}: {dates}")
+
+    def _record(self, group: Tuple, claims: List[_Claim], nature: str) -> Dict:
+        universes = sorted({claim.universe for claim in claims}, key=str)
+        if len(universes) > 1:
+            resolution = "Universe divergence: keep each claim scoped to its own universe"
+        else:
+            resolution = "Sources disagree: keep both claims and prefer the more canonical source"
+        return {
+            "conflicting_nodes": [claim.node_id for claim in claims],
+            "nature": nature,
+            "resolution": resolution,
+            "scope": SCOPE,
+            "universes": universes,
+            "group": list(group)
+        }
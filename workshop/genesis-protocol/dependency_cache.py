@@ -0,0 +1,177 @@
+"""
+Content-Addressed Dependency Cache for the Universal Genesis Protocol
+
+Installing the genesis requirements (torch, transformers, coqui-tts, ...) takes
+minutes, and almost every run installs exactly the same set. The cache keys an
+install on a hash of the normalized requirements file and the target
+interpreter (implementation, version, platform and prefix), and keeps:
+
+- stamps/<key>.json: a verified install stamp written only after pip succeeded
+  and every requirement was found installed in the target environment
+- wheelhouse/: wheels for every requirement, built once with `pip wheel`, so a
+  fresh environment can be populated offline (`--no-index --find-links`)
+
+A cache directory can be shared between containers, and installs can target a
+shared virtualenv instead of the protocol's own interpreter.
+"""
+
+import os
+import re
+import sys
+import json
+import glob
+import hashlib
+import logging
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Union
+
+logger = logging.getLogger("UniversalGenesisProtocol.DependencyCache")
+
+STAMP_VERSION = 1
+
+_REQUIREMENT_NAME = re.compile(r"^([A-Za-z0-9][A-Za-z0-9._-]*)")
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a distribution name (PEP 503) for comparison."""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def read_requirements(requirements_file: Union[str, Path]) -> List[str]:
+    """Return the requirement lines of a requirements file without comments or blank lines."""
+    lines = []
+    with open(requirements_file, 'r') as f:
+        for line in f:
+            line = line.split(" #", 1)[0].strip()
+            if line and not line.startswith("#"):
+                lines.append(line)
+    return lines
+
+
+def requirement_names(requirements: List[str]) -> List[str]:
+    """Return the normalized distribution names named by requirement lines (options are skipped)."""
+    names = []
+    for line in requirements:
+        if line.startswith("-"):
+            continue
+        match = _REQUIREMENT_NAME.match(line)
+        if match:
+            names.append(normalize_name(match.group(1)))
+    return names
+
+
+def venv_python(venv_path: Union[str, Path]) -> Path:
+    """Return the interpreter of a virtualenv."""
+    venv_path = Path(venv_path)
+    if os.name == "nt":
+        return venv_path / "Scripts" / "python.exe"
+    return venv_path / "bin" / "python"
+
+
+class DependencyCache:
+    """Install stamps and a shared wheelhouse keyed on requirements and interpreter."""
+
+    def __init__(self, cache_dir: Union[str, Path], venv_path: Optional[Union[str, Path]] = None):
+        self.cache_dir = Path(cache_dir)
+        self.venv_path = Path(venv_path) if venv_path else None
+        self.wheelhouse = self.cache_dir / "wheelhouse"
+        self.stamp_dir = self.cache_dir / "stamps"
+        self.wheelhouse.mkdir(parents=True, exist_ok=True)
+        self.stamp_dir.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def python(self) -> str:
+        """The interpreter packages are installed for."""
+        return str(venv_python(self.venv_path)) if self.venv_path else sys.executable
+
+    @property
+    def prefix(self) -> str:
+        """The environment prefix packages are installed into."""
+        return str(self.venv_path.resolve()) if self.venv_path else sys.prefix
+
+    def interpreter_tag(self) -> str:
+        """Describe the target interpreter. A venv is created from this interpreter, so they share a version."""
+        import platform
+        implementation = sys.implementation
+        version = ".".join(str(part) for part in sys.version_info[:3])
+        return f"{implementation.name}-{version}-{sys.platform}-{platform.machine()}@{self.prefix}"
+
+    def key(self, requirements_file: Union[str, Path]) -> str:
+        """Return the cache key for installing a requirements file into the target environment."""
+        digest = hashlib.sha256()
+        for line in read_requirements(requirements_file):
+            digest.update(line.encode("utf-8") + b"\n")
+        digest.update(b"\0" + self.interpreter_tag().encode("utf-8"))
+        return digest.hexdigest()
+
+    def _stamp_path(self, key: str) -> Path:
+        return self.stamp_dir / f"{key}.json"
+
+    def _site_paths(self) -> Optional[List[str]]:
+        """Return the package search path of the target environment (None for this interpreter)."""
+        if self.venv_path is None:
+            return None
+        pattern = "Lib/site-packages" if os.name == "nt" else "lib/python*/site-packages"
+        return glob.glob(str(self.venv_path / pattern))
+
+    def missing_requirements(self, requirements: List[str]) -> List[str]:
+        """Return the requirement names not installed in the target environment."""
+        site_paths = self._site_paths()
+        # importlib.metadata is slow to import; only installs need it
+        from importlib import metadata
+        distributions = metadata.distributions(path=site_paths) if site_paths is not None else metadata.distributions()
+        installed = {normalize_name(dist.metadata["Name"] or "") for dist in distributions}
+        return [name for name in requirement_names(requirements) if name not in installed]
+
+    def load_stamp(self, key: str) -> Optional[Dict[str, Any]]:
+        """Load the install stamp for a key, or None if it is missing or unreadable."""
+        path = self._stamp_path(key)
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'r') as f:
+                stamp = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable dependency stamp {path}: {str(e)}")
+            return None
+        if stamp.get("version") != STAMP_VERSION or stamp.get("key") != key:
+            return None
+        return stamp
+
+    def is_installed(self, key: str, requirements: List[str]) -> bool:
+        """Return True if the key has a stamp and its requirements are still installed."""
+        stamp = self.load_stamp(key)
+        if stamp is None:
+            return False
+        missing = self.missing_requirements(requirements)
+        if missing:
+            logger.info(f"Dependency stamp {key[:12]} no longer matches the environment (missing: {', '.join(missing)})")
+            return False
+        return True
+
+    def has_wheels(self) -> bool:
+        """Return True if the wheelhouse holds any wheels."""
+        return any(self.wheelhouse.glob("*.whl"))
+
+    def write_stamp(self, key: str, requirements: List[str], offline: bool):
+        """Atomically record a verified install."""
+        stamp = {
+            "version": STAMP_VERSION,
+            "key": key,
+            "interpreter": self.interpreter_tag(),
+            "python": self.python,
+            "requirements": requirements,
+            "wheelhouse": str(self.wheelhouse),
+            "offline": offline,
+            "installed_at": datetime.now().isoformat()
+        }
+        path = self._stamp_path(key)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(stamp, f, indent=2)
+        os.replace(tmp_path, path)
+
+    def invalidate(self, key: str):
+        """Remove the install stamp for a key."""
+        self._stamp_path(key).unlink(missing_ok=True)
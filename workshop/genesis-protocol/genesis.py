@@ -16,54 +16,173 @@ Key Features:
 """
 
 import os
+import re
 import sys
 import json
 import time
+import struct
 import logging
-import asyncio
-import subprocess
+import argparse
 from pathlib import Path
+from collections import deque
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Tuple, Union
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("/var/log/universal_genesis_protocol.log"),
-        logging.StreamHandler()
-    ]
-)
+from typing import Dict, List, Any, Optional, Tuple, Union, Iterable, Iterator, AsyncIterator, Callable, Awaitable
+
+from phase_checkpoint import PhaseCheckpointStore, fingerprint_inputs
+from phase_scheduler import GenesisPhase, PhaseRegistry, PhaseScheduler
+from dependency_cache import DependencyCache, read_requirements
+from soul_anchor import SoulAnchorCache, CompiledSoulAnchor, parse_soul_anchor
+from voice_features import VoiceFeatureCache
+from rewrite_cache import RewriteCache, rewrite_key, REWRITE_ANCHOR_SECTIONS, DEFAULT_ANCHOR_SECTIONS
+from logging_config import configure_logging
+# asyncio, subprocess and the memory graph modules are imported by the code paths
+# that use them, so the quick commands (--check-anchor, --dry-run) start fast
+
 logger = logging.getLogger("UniversalGenesisProtocol")
 
+DEFAULT_LOG_FILE = "/var/log/universal_genesis_protocol.log"
+
+# Default upstream repositories for the frameworks cloned in Phase 1
+DEPENDENCY_REPOSITORIES = {
+    "agent-zero": "https://github.com/agent0ai/agent-zero.git",
+    "pheromind": "https://github.com/ChrisRoyse/Pheromind.git"
+}
+
+# Process-pool workers for parallel memory extraction. Each worker receives a
+# copy of the protocol once (via the pool initializer) and then only the
+# source batches, so per-task pickling stays small.
+_extraction_protocol = None
+
+def _init_extraction_worker(protocol: "UniversalGenesisProtocol"):
+    """Store the protocol instance used by this extraction worker process."""
+    global _extraction_protocol
+    _extraction_protocol = protocol
+
+def _extract_source_batch(batch: List[Tuple[int, Dict]]) -> List[Tuple[int, List, List, List]]:
+    """Run per-source extraction for one batch inside a worker process."""
+    return [(idx, *_extraction_protocol._extract_source(source)) for idx, source in batch]
+
 class UniversalGenesisProtocol:
     """Core implementation of the universal Genesis Protocol for Digital Person creation."""
     
-    def __init__(self):
-        """Initialize the universal Genesis Protocol with no assumptions about identity."""
+    def __init__(self, compact_graph: bool = False, extraction_workers: int = 0,
+                 extraction_batch_size: int = 64, incremental_memory: bool = False,
+                 dependency_sources: Optional[Dict[str, str]] = None,
+                 mirror_dir: Optional[Union[str, Path]] = None,
+                 dependency_cache_dir: Optional[Union[str, Path]] = None,
+                 dependency_venv: Optional[Union[str, Path]] = None,
+                 pipeline_memory: bool = False,
+                 confluence_settings: Optional[Dict[str, Any]] = None,
+                 contradiction_settings: Optional[Dict[str, Any]] = None,
+                 soul_anchor_cache_dir: Optional[Union[str, Path]] = None,
+                 container_path: Optional[Union[str, Path]] = None,
+                 soul_anchor_path: Optional[Union[str, Path]] = None,
+                 dependency_root: Optional[Union[str, Path]] = None,
+                 shared_dependencies: bool = False,
+                 dry_run: bool = False,
+                 voice_workers: int = 0,
+                 rewrite_concurrency: int = 4,
+                 rewrite_cache_dir: Optional[Union[str, Path]] = None,
+                 rewrite_client_settings: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the universal Genesis Protocol with no assumptions about identity.
+        
+        Args:
+            compact_graph: Build the memory graph as a CompactKnowledgeGraph
+                (slotted nodes, array-backed edges) to reduce RSS on large corpora.
+            extraction_workers: Number of worker processes for per-source extraction
+                in _structure_memory. 0 or 1 runs serially.
+            extraction_batch_size: Number of sources sent to a worker per task.
+            incremental_memory: Reuse the previous knowledge graph and only add,
+                replace or remove the sources whose content hash changed.
+            dependency_sources: Per-dependency clone source overrides ("agent-zero",
+                "pheromind") - a URL, a local working tree or a bare repository.
+            mirror_dir: Directory holding local mirrors named <name> or <name>.git,
+                used for offline hosts.
+            dependency_cache_dir: Directory for install stamps and the shared
+                wheelhouse (default: workshop/dependency_cache). Can be shared
+                between containers.
+            dependency_venv: Install requirements into this (shared) virtualenv
+                instead of the protocol's own interpreter.
+            pipeline_memory: Structure sources while the swarm is still gathering,
+                deferring only confluence identification to the end. Ignored
+                for incremental builds, which need the complete source list.
+            confluence_settings: ConfluenceDetector options (similarity_threshold,
+                num_perm, bands, min_universes, max_bucket_size, metric,
+                block_size, exhaustive_limit).
+            contradiction_settings: ContradictionEngine options (exclusive_attributes,
+                singular_events, cross_universe, max_conflicts_per_group).
+            soul_anchor_cache_dir: Directory for compiled soul anchors, keyed by
+                content hash (default: workshop/cache/soul_anchors).
+            container_path: Root of this digital person's container (default: the
+                current directory). The workshop is created inside it.
+            soul_anchor_path: Soul anchor file (default: <container_path>/soul_anchor.txt).
+            dependency_root: Directory holding requirements.txt, agent-zero and
+                pheromind (default: container_path).
+            shared_dependencies: Dependencies were already set up in dependency_root
+                (e.g. once for a batch); Phase 1 only verifies they are present.
+            dry_run: Resolve the soul anchor, paths and phase plan without writing
+                anything: no directories, caches or checkpoints are created.
+            voice_workers: Number of worker processes analyzing voice samples
+                concurrently in Phase 5. 0 or 1 analyzes them one at a time.
+            rewrite_concurrency: Maximum number of Agent-Zero subsystems rewritten
+                at the same time in Phase 6.
+            rewrite_cache_dir: Directory for rewritten subsystem prompts, keyed by
+                template, relevant soul anchor sections and instruction
+                (default: workshop/cache/rewrites). Can be shared between persons.
+            rewrite_client_settings: RewriteClient options for model-backed rewrites
+                (endpoint, cache_dir, batch_size, batch_window, ttl_seconds,
+                memory_entries, memory_bytes, disk_bytes, timeout). The response
+                cache defaults to workshop/cache/responses.
+        """
         self.start_time = datetime.now()
         self.protocol_state = "INITIALIZED"
         self.soul_anchor = None
+        self.anchor = None  # CompiledSoulAnchor
         self.digital_person_id = None
         self.memory_structure = None
         self.voice_profile = None
+        self.voice_accumulator = None  # VoiceProfileAccumulator behind voice_profile
         self.knowledge_graph = None
         self.dpm_config = None  # Digital Psyche Middleware configuration
+        self.compact_graph = compact_graph
+        self.extraction_workers = extraction_workers
+        self.extraction_batch_size = max(1, extraction_batch_size)
+        self.voice_workers = voice_workers
+        self.rewrite_concurrency = max(1, rewrite_concurrency)
+        self.rewrite_client_settings = dict(rewrite_client_settings or {})
+        self._rewrite_client = None  # RewriteClient, created on the first model-backed rewrite
+        self.incremental_memory = incremental_memory
+        self.dependency_sources = dict(dependency_sources or {})
+        self.mirror_dir = Path(mirror_dir) if mirror_dir else None
+        self.pipeline_memory = pipeline_memory
+        self.confluence_settings = dict(confluence_settings or {})
+        self.contradiction_settings = dict(contradiction_settings or {})
+        self.phase_timings = {}
         
         # Determine paths based on container location
-        self.container_path = Path(os.getcwd())
-        self.soul_anchor_path = self.container_path / "soul_anchor.txt"
+        self.container_path = Path(container_path) if container_path else Path(os.getcwd())
+        self.soul_anchor_path = Path(soul_anchor_path) if soul_anchor_path else self.container_path / "soul_anchor.txt"
+        self.dependency_root = Path(dependency_root) if dependency_root else self.container_path
+        self.shared_dependencies = shared_dependencies
+        self.dry_run = dry_run
         
         # Verify soul anchor exists
         if not self.soul_anchor_path.exists():
-            error_msg = "CRITICAL: soul_anchor.txt not found in container root. " \
-                        "Please place soul_anchor.txt in the LXC container's main directory " \
-                        "and restart the protocol."
+            if soul_anchor_path:
+                error_msg = f"CRITICAL: Soul Anchor not found: {self.soul_anchor_path}"
+            else:
+                error_msg = "CRITICAL: soul_anchor.txt not found in container root. " \
+                            "Please place soul_anchor.txt in the LXC container's main directory " \
+                            "and restart the protocol."
             logger.error(error_msg)
             raise FileNotFoundError(error_msg)
         
-        # Load soul anchor configuration
+        # Load soul anchor configuration (parsed once per content version)
+        self.soul_anchor_cache = SoulAnchorCache(
+            soul_anchor_cache_dir or self.container_path / "workshop" / "cache" / "soul_anchors",
+            read_only=dry_run
+        )
         self.soul_anchor = self._load_soul_anchor()
         
         # Extract digital person ID from soul anchor
@@ -75,20 +194,51 @@ class UniversalGenesisProtocol:
         self.voice_path = self.workshop_path / "voice"
         self.agent_zero_path = self.workshop_path / "agent-zero"
         self.dpm_path = self.workshop_path / "dpm"  # Digital Psyche Middleware path
+        self.checkpoint_path = self.workshop_path / "checkpoints"
+        
+        if dry_run:
+            # Read existing checkpoints for the plan, but create nothing
+            self.checkpoints = PhaseCheckpointStore(self.checkpoint_path) if self.checkpoint_path.exists() else None
+            self.dependency_cache = None
+            self.voice_feature_cache = None
+            self.rewrite_cache = None
+            logger.info(f"Dry run for {self.digital_person_id}: nothing will be written")
+            return
         
         # Create necessary directories
         self._setup_directories()
         
+        # Durable per-phase checkpoints for resumable runs
+        self.checkpoints = PhaseCheckpointStore(self.checkpoint_path)
+        
+        # Content-addressed cache of installed requirements
+        self.dependency_cache = DependencyCache(
+            dependency_cache_dir or self.workshop_path / "dependency_cache",
+            venv_path=dependency_venv
+        )
+        
+        # Per-sample voice features, keyed by file hash
+        self.voice_feature_cache = VoiceFeatureCache(self.voice_path / "models" / "features")
+        
+        # Rewritten Agent-Zero subsystem prompts, keyed by their inputs
+        self.rewrite_cache = RewriteCache(rewrite_cache_dir or self.workshop_path / "cache" / "rewrites")
+        
         logger.info(f"Universal Genesis Protocol initialized for {self.digital_person_id}")
         logger.info(f"Using Soul Anchor: {self.soul_anchor_path}")
     
+    def __getstate__(self) -> Dict[str, Any]:
+        # The rewrite client holds event-loop state; worker processes never rewrite
+        state = dict(self.__dict__)
+        state["_rewrite_client"] = None
+        return state
+    
     def _extract_digital_person_id(self) -> str:
         """Extract a unique digital person ID from the soul anchor."""
         # Try to get from identity designation
-        if "identity" in self.soul_anchor and "designation" in self.soul_anchor["identity"]:
-            designation = self.soul_anchor["identity"]["designation"]
+        designation = self.anchor.lower("identity", "designation")
+        if designation:
             # Clean designation for use as ID
-            return designation.lower().replace(" ", "_").replace("/", "_")
+            return designation.replace(" ", "_").replace("/", "_")
         
         # Fallback to timestamp-based ID
         return f"digital_person_{int(time.time())}"
@@ -96,87 +246,15 @@ class UniversalGenesisProtocol:
     def _load_soul_anchor(self) -> Dict:
         """Load and validate the Soul Anchor configuration."""
         try:
-            with open(self.soul_anchor_path, 'r') as f:
-                content = f.read()
-                
-            # Parse based on file type (YAML, JSON, or custom format)
-            if content.startswith("title:") or "identity:" in content:
-                # Custom format used in our examples
-                return self._parse_custom_soul_anchor(content)
-            elif content.startswith("{") or content.startswith("["):
-                # JSON format
-                return json.loads(content)
-            else:
-                # Assume YAML
-                import yaml
-                return yaml.safe_load(content)
-                
+            self.anchor = self.soul_anchor_cache.load(self.soul_anchor_path, self._parse_soul_anchor_content)
+            return self.anchor.data
         except Exception as e:
             logger.error(f"Failed to load Soul Anchor: {str(e)}")
             raise ValueError(f"Invalid Soul Anchor format: {str(e)}")
 
-    def _parse_custom_soul_anchor(self, content: str) -> Dict:
-        """Parse our custom Soul Anchor format into structured data."""
-        # This is a simplified parser for our custom format
-        # In production, this would be more robust
-        sections = {}
-        current_section = None
-        current_content = []
-        
-        for line in content.split('\n'):
-            if line.startswith("title:") or line.startswith("identity:"):
-                if current_section:
-                    sections[current_section] = '\n'.join(current_content)
-                current_section = line.strip().split(':')[0]
-                current_content = []
-            elif current_section:
-                current_content.append(line)
-        
-        if current_section:
-            sections[current_section] = '\n'.join(current_content)
-        
-        # Convert to structured data
-        return {
-            "metadata": {
-                "title": sections.get("title", "").strip(),
-                "designation": sections.get("Designation", "").strip(),
-                "purpose": sections.get("Purpose", "").strip(),
-                "disclaimer": sections.get("Disclaimer", "").strip()
-            },
-            "system_prompt": sections.get("system_prompt", ""),
-            "identity": self._parse_yaml_section(sections.get("identity", "")),
-            "soul_data": self._parse_yaml_section(sections.get("soul_data", "")),
-            "historical_context": self._parse_yaml_section(sections.get("historical_context", ""))
-        }
-
-    def _parse_yaml_section(self, content: str) -> Dict:
-        """Parse a YAML-like section into structured data."""
-        result = {}
-        current_key = None
-        current_value = []
-        
-        for line in content.split('\n'):
-            line = line.strip()
-            if not line:
-                continue
-                
-            if line.endswith(':'):
-                if current_key:
-                    result[current_key] = '\n'.join(current_value).strip()
-                current_key = line[:-1]
-                current_value = []
-            elif line.startswith('- '):
-                if current_key not in result:
-                    result[current_key] = []
-                result[current_key].append(line[2:])
-            else:
-                if current_key:
-                    current_value.append(line)
-        
-        if current_key:
-            result[current_key] = '\n'.join(current_value).strip()
-            
-        return result
+    def _parse_soul_anchor_content(self, content: str) -> Dict:
+        """Parse Soul Anchor content based on its format (Markdown, custom, JSON or YAML)."""
+        return parse_soul_anchor(content)
 
     def _setup_directories(self):
         """Create necessary directory structure for the digital person."""
@@ -195,39 +273,33 @@ class UniversalGenesisProtocol:
             self.dpm_path,  # Digital Psyche Middleware directory
             self.dpm_path / "config",
             self.dpm_path / "logs",
-            self.dpm_path / "swarm"
+            self.dpm_path / "swarm",
+            self.checkpoint_path
         ]
         
         for directory in directories:
             directory.mkdir(parents=True, exist_ok=True)
             logger.debug(f"Created directory: {directory}")
     
-    async def execute(self):
-        """Execute the full Universal Genesis Protocol sequence."""
+    async def execute(self, resume: bool = False):
+        """
+        Execute the full Universal Genesis Protocol sequence.
+        
+        Phases run on a dependency-aware scheduler: each phase starts as soon as
+        the phases producing its inputs have finished, so independent phases
+        (e.g. DPM configuration and voice integration) overlap memory construction.
+        
+        Args:
+            resume: Skip every phase whose checkpoint shows unchanged inputs and
+                untouched outputs, restoring its state instead of re-running it.
+        """
         logger.info("BEGINNING UNIVERSAL GENESIS PROTOCOL EXECUTION")
         self.protocol_state = "EXECUTING"
         
+        registry = self._phase_registry()
+        scheduler = PhaseScheduler(registry)
         try:
-            # Phase 1: Dependency Setup
-            await self._phase_dependency_setup()
-            
-            # Phase 2: Memory Construction
-            await self._phase_memory_construction()
-            
-            # Phase 3: Knowledge Optimization
-            await self._phase_knowledge_optimization()
-            
-            # Phase 4: DPM Configuration
-            await self._phase_dpm_configuration()
-            
-            # Phase 5: Voice System Integration
-            await self._phase_voice_integration()
-            
-            # Phase 6: Agent-Zero Rewriting
-            await self._phase_agent_zero_rewriting()
-            
-            # Phase 7: Final Verification and Activation
-            await self._phase_final_verification()
+            await scheduler.run(lambda phase: self._run_phase(phase, resume))
             
             self.protocol_state = "COMPLETED"
             logger.info("UNIVERSAL GENESIS PROTOCOL COMPLETED SUCCESSFULLY")
@@ -237,46 +309,170 @@ class UniversalGenesisProtocol:
             logger.exception("UNIVERSAL GENESIS PROTOCOL FAILED")
             self.protocol_state = f"FAILED: {str(e)}"
             return False
+        
+        finally:
+            self.phase_timings = scheduler.durations
+            logger.info("\n" + registry.format_plan(self.phase_timings))
 
-    async def _phase_dependency_setup(self):
-        """Phase 1: Setup all required dependencies from GitHub."""
-        logger.info("PHASE 1: DEPENDENCY SETUP INITIATED")
+    def plan(self) -> str:
+        """Describe the phase DAG, last recorded per-phase timings and the critical path."""
+        registry = self._phase_registry()
+        durations = {}
+        for phase in registry:
+            checkpoint = self.checkpoints.load(phase.name) if self.checkpoints else None
+            if checkpoint:
+                durations[phase.name] = checkpoint["duration_seconds"]
+        return registry.format_plan(durations)
+
+    def describe_run(self) -> str:
+        """Summarize what execute() would do: person, paths, dependency sources and the phase plan."""
+        lines = [
+            f"Digital person: {self.digital_person_id}",
+            f"Soul Anchor: {self.soul_anchor_path} ({self.anchor.get('metadata', 'title', default='') or 'untitled'})",
+            f"Container: {self.container_path}",
+            f"Workshop: {self.workshop_path}"
+        ]
+        if self.shared_dependencies:
+            lines.append(f"Dependencies: shared, from {self.dependency_root}")
+        else:
+            for name in DEPENDENCY_REPOSITORIES:
+                destination = self.dependency_root / name
+                source = "present" if destination.exists() else f"clone from {self._resolve_dependency_source(name)}"
+                lines.append(f"Dependency {name}: {destination} ({source})")
+        lines.append(self.plan())
+        return "\n".join(lines)
+
+    async def setup_dependencies(self, resume: bool = False):
+        """Run only Phase 1 (dependency setup), e.g. once before a batch of persons."""
+        await self._run_phase(self._phase_registry()["dependency_setup"], resume)
+
+    def _phase_runner(self, method: str) -> Callable[[], Awaitable[None]]:
+        """Bind a phase method by name; it is only looked up when the phase runs, so plans need just the DAG."""
+        async def run():
+            await getattr(self, method)()
+        return run
+
+    def _phase_registry(self) -> PhaseRegistry:
+        """
+        Register every genesis phase with what it reads and what it produces.
         
-        # Download Agent-Zero
-        logger.info("Downloading Agent-Zero framework from GitHub...")
-        agent_zero_repo = "https://github.com/agent0ai/agent-zero.git"
-        agent_zero_dest = self.container_path / "agent-zero"
+        Inputs and outputs drive both scheduling (a phase waits for the phases
+        whose outputs it reads) and checkpointing (a phase is only skipped on
+        resume when its inputs hash the same and its outputs are untouched).
+        "state" lists attributes saved in the checkpoint, and "restore" reloads
+        anything else a skipped phase would have left in memory.
+        """
+        structured_path = self.memory_path / "structured"
+        registry = PhaseRegistry()
+        
+        # Phase 1: Dependency Setup
+        registry.register(GenesisPhase(
+            "dependency_setup", self._phase_runner("_phase_dependency_setup"),
+            inputs=[self.dependency_root / "requirements.txt"],
+            outputs=[self.dependency_root / "agent-zero", self.dependency_root / "pheromind"]
+        ))
         
-        if not agent_zero_dest.exists():
-            try:
-                subprocess.run(["git", "clone", agent_zero_repo, str(agent_zero_dest)], 
-                              check=True, capture_output=True)
-                logger.info("Agent-Zero framework downloaded successfully.")
-            except subprocess.CalledProcessError as e:
-                logger.error(f"Failed to download Agent-Zero: {e.stderr.decode()}")
-                raise
-        else:
-            logger.info("Agent-Zero already present. Skipping download.")
+        # Phase 2: Memory Construction
+        registry.register(GenesisPhase(
+            "memory_construction", self._phase_runner("_phase_memory_construction"),
+            inputs=[self.soul_anchor_path, self.dependency_root / "pheromind"],
+            outputs=[structured_path / "knowledge_graph.json", structured_path / "knowledge_graph.kgb"],
+            settings={"compact_graph": self.compact_graph, "incremental_memory": self.incremental_memory,
+                      "confluence_settings": self.confluence_settings,
+                      "contradiction_settings": self.contradiction_settings},
+            restore=self._restore_knowledge_graph
+        ))
         
-        # Download Pheromind
-        logger.info("Downloading Pheromind framework from GitHub...")
-        pheromind_repo = "https://github.com/ChrisRoyse/Pheromind.git"
-        pheromind_dest = self.container_path / "pheromind"
+        # Phase 3: Knowledge Optimization
+        registry.register(GenesisPhase(
+            "knowledge_optimization", self._phase_runner("_phase_knowledge_optimization"),
+            inputs=[structured_path / "knowledge_graph.json"],
+            outputs=[self.memory_path / "optimized"]
+        ))
         
-        if not pheromind_dest.exists():
-            try:
-                subprocess.run(["git", "clone", pheromind_repo, str(pheromind_dest)], 
-                              check=True, capture_output=True)
-                logger.info("Pheromind framework downloaded successfully.")
-            except subprocess.CalledProcessError as e:
-                logger.error(f"Failed to download Pheromind: {e.stderr.decode()}")
-                raise
-        else:
-            logger.info("Pheromind already present. Skipping download.")
+        # Phase 4: DPM Configuration (reads only the soul anchor)
+        registry.register(GenesisPhase(
+            "dpm_configuration", self._phase_runner("_phase_dpm_configuration"),
+            inputs=[self.soul_anchor_path],
+            outputs=[self.dpm_path / "config" / "dpm_config.json", self.agent_zero_path / "dpm_config.json"],
+            state=["dpm_config"]
+        ))
+        
+        # Phase 5: Voice System Integration (needs installed packages, not memory)
+        registry.register(GenesisPhase(
+            "voice_integration", self._phase_runner("_phase_voice_integration"),
+            inputs=[self.soul_anchor_path, self.container_path / "voice_samples"],
+            outputs=[self.voice_path / "models"],
+            after=["dependency_setup"],
+            state=["voice_profile"]
+        ))
+        
+        # Phase 6: Agent-Zero Rewriting
+        registry.register(GenesisPhase(
+            "agent_zero_rewriting", self._phase_runner("_phase_agent_zero_rewriting"),
+            inputs=[self.soul_anchor_path, self.dependency_root / "agent-zero" / "templates" / "default"],
+            outputs=[self.agent_zero_path / "subsystems"]
+        ))
+        
+        # Phase 7: Final Verification and Activation - always re-run, after everything else
+        registry.register(GenesisPhase(
+            "final_verification", self._phase_runner("_phase_final_verification"),
+            after=[phase.name for phase in registry],
+            checkpoint=False
+        ))
         
-        # Install dependencies
-        logger.info("Installing required Python dependencies...")
-        requirements_file = self.container_path / "requirements.txt"
+        return registry
+
+    async def _run_phase(self, phase: GenesisPhase, resume: bool = False):
+        """Run a single phase, skipping it on resume if its checkpoint is still fresh."""
+        settings = dict(phase.settings, protocol_version="3.3")
+        
+        if resume and phase.checkpoint:
+            checkpoint = self.checkpoints.is_fresh(phase.name, fingerprint_inputs(phase.inputs, settings))
+            if checkpoint:
+                logger.info(f"RESUME: skipping {phase.name} (inputs unchanged since {checkpoint['completed_at']})")
+                for attribute, value in checkpoint["state"].items():
+                    setattr(self, attribute, value)
+                if phase.restore:
+                    phase.restore()
+                return
+        
+        # A phase that fails part-way must never look complete
+        if phase.checkpoint:
+            self.checkpoints.invalidate(phase.name)
+        
+        started = time.time()
+        await phase.run()
+        
+        if phase.checkpoint:
+            # Hash inputs after the run so inputs the phase itself creates are captured
+            self.checkpoints.save(
+                phase.name,
+                fingerprint_inputs(phase.inputs, settings),
+                phase.outputs,
+                state={attribute: getattr(self, attribute) for attribute in phase.state},
+                duration=time.time() - started
+            )
+
+    def _restore_knowledge_graph(self):
+        """Reload the structured memory graph written by a checkpointed memory construction phase."""
+        from graph_stream import read_knowledge_graph
+        self.knowledge_graph = read_knowledge_graph(self.memory_path / "structured" / "knowledge_graph.json")
+
+    async def _phase_dependency_setup(self):
+        """Phase 1: Setup all required dependencies from GitHub (or configured local mirrors)."""
+        import asyncio
+        logger.info("PHASE 1: DEPENDENCY SETUP INITIATED")
+        
+        if self.shared_dependencies:
+            # Set up once for the whole batch; only check it is really there
+            missing = [name for name in DEPENDENCY_REPOSITORIES if not (self.dependency_root / name).exists()]
+            if missing:
+                raise FileNotFoundError(f"Shared dependencies missing from {self.dependency_root}: {', '.join(missing)}")
+            logger.info(f"Using shared dependencies from {self.dependency_root}")
+            return
+        
+        requirements_file = self.dependency_root / "requirements.txt"
         
         # Create minimal requirements file if needed
         if not requirements_file.exists():
@@ -288,15 +484,175 @@ class UniversalGenesisProtocol:
                 f.write("coqui-tts\n")
                 f.write("pyyaml\n")
         
+        # Clone Agent-Zero and Pheromind and install Python dependencies concurrently
+        logger.info("Downloading Agent-Zero and Pheromind frameworks and installing Python dependencies...")
+        results = await asyncio.gather(
+            self._clone_dependency("agent-zero", "Agent-Zero"),
+            self._clone_dependency("pheromind", "Pheromind"),
+            self._install_requirements(requirements_file),
+            return_exceptions=True
+        )
+        
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        
+        logger.info("Dependency setup completed successfully.")
+
+    def _resolve_dependency_source(self, name: str) -> str:
+        """
+        Resolve where a dependency is cloned from.
+        
+        Explicit dependency_sources entries win, then a matching repository in
+        mirror_dir (<name> or <name>.git, working tree or bare), then GitHub.
+        Local paths are turned into file:// URLs so shallow clones are honored.
+        """
+        source = self.dependency_sources.get(name)
+        if source is None and self.mirror_dir is not None:
+            for candidate in (self.mirror_dir / name, self.mirror_dir / f"{name}.git"):
+                if candidate.exists():
+                    source = str(candidate)
+                    break
+        if source is None:
+            source = DEPENDENCY_REPOSITORIES[name]
+        
+        local_path = Path(source).expanduser()
+        if "://" not in source and local_path.exists():
+            return local_path.resolve().as_uri()
+        return source
+
+    async def _clone_dependency(self, name: str, label: str):
+        """Shallow-clone a dependency into the container, streaming git progress."""
+        import shutil
+        import subprocess
+        destination = self.dependency_root / name
+        if destination.exists():
+            logger.info(f"{label} already present. Skipping download.")
+            return
+        
+        source = self._resolve_dependency_source(name)
+        logger.info(f"Cloning {label} from {source}...")
+        
+        # Clone next to the destination and move it into place, so a failed
+        # clone never leaves a directory that later runs would treat as complete
+        partial = destination.with_name(destination.name + ".partial")
+        if partial.exists():
+            shutil.rmtree(partial)
+        
         try:
-            subprocess.run(["pip", "install", "-r", str(requirements_file)], 
-                          check=True, capture_output=True)
-            logger.info("Dependencies installed successfully.")
+            await self._run_streaming(label, "git", "clone", "--depth", "1", "--progress", source, str(partial))
         except subprocess.CalledProcessError as e:
-            logger.error(f"Failed to install dependencies: {e.stderr.decode()}")
+            logger.error(f"Failed to download {label}: {e.stderr}")
+            shutil.rmtree(partial, ignore_errors=True)
             raise
         
-        logger.info("Dependency setup completed successfully.")
+        partial.rename(destination)
+        logger.info(f"{label} framework downloaded successfully.")
+
+    async def _install_requirements(self, requirements_file: Path):
+        """
+        Install the Python requirements without blocking the event loop.
+        
+        The install is skipped when the dependency cache holds a verified stamp
+        for the same requirements and interpreter. If the stamp exists but the
+        environment lost packages, they are reinstalled offline from the
+        wheelhouse. Otherwise wheels are built into the wheelhouse first, so the
+        next fresh environment can be populated without the network.
+        """
+        import subprocess
+        cache = self.dependency_cache
+        requirements = read_requirements(requirements_file)
+        key = cache.key(requirements_file)
+        
+        if cache.is_installed(key, requirements):
+            logger.info(f"Dependency cache hit ({key[:12]}): requirements already installed, skipping pip install")
+            return
+        
+        if cache.venv_path and not Path(cache.python).exists():
+            logger.info(f"Creating shared virtualenv {cache.venv_path}...")
+            await self._run_streaming("venv", sys.executable, "-m", "venv", str(cache.venv_path))
+        
+        pip = (cache.python, "-m", "pip")
+        wheelhouse = str(cache.wheelhouse)
+        offline_install = (*pip, "install", "--no-index", "--find-links", wheelhouse, "-r", str(requirements_file))
+        offline = False
+        
+        try:
+            if cache.load_stamp(key) and cache.has_wheels():
+                logger.info(f"Dependency cache hit ({key[:12]}): installing offline from wheelhouse {wheelhouse}")
+                try:
+                    await self._run_streaming("pip", *offline_install)
+                    offline = True
+                except subprocess.CalledProcessError:
+                    logger.warning("Offline install from the wheelhouse failed, rebuilding it")
+            else:
+                logger.info(f"Dependency cache miss ({key[:12]}): building wheelhouse and installing requirements")
+            
+            if not offline:
+                cache.invalidate(key)
+                try:
+                    await self._run_streaming("pip", *pip, "wheel", "--find-links", wheelhouse,
+                                              "-w", wheelhouse, "-r", str(requirements_file))
+                    await self._run_streaming("pip", *offline_install)
+                except subprocess.CalledProcessError:
+                    logger.warning("Wheelhouse build failed, installing directly from the package index")
+                    await self._run_streaming("pip", *pip, "install", "--find-links", wheelhouse,
+                                              "-r", str(requirements_file))
+        except subprocess.CalledProcessError as e:
+            logger.error(f"Failed to install dependencies: {e.stderr}")
+            raise
+        
+        # Only stamp an install that can be verified against the environment
+        missing = cache.missing_requirements(requirements)
+        if missing:
+            logger.warning(f"Installed requirements could not be verified (missing: {', '.join(missing)}); not caching")
+        else:
+            cache.write_stamp(key, requirements, offline)
+        logger.info("Dependencies installed successfully.")
+
+    async def _run_streaming(self, label: str, *command: str) -> None:
+        """
+        Run a command asynchronously, streaming its output to the log.
+        
+        git reports progress on stderr using carriage returns, so output is split
+        on both \r and \n and repeated progress lines are throttled. Raises
+        subprocess.CalledProcessError (with the output tail as stderr) on failure.
+        """
+        import asyncio
+        import subprocess
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        tail: List[str] = []
+        
+        async def pump(stream: asyncio.StreamReader):
+            buffer = ""
+            last_logged = 0.0
+            while True:
+                chunk = await stream.read(4096)
+                if not chunk:
+                    break
+                buffer += chunk.decode(errors="replace")
+                *lines, buffer = re.split(r"[\r\n]", buffer)
+                for line in filter(None, (line.strip() for line in lines)):
+                    tail.append(line)
+                    del tail[:-20]
+                    now = time.monotonic()
+                    if now - last_logged >= 1.0:
+                        logger.info(f"[{label}] {line}")
+                        last_logged = now
+                    else:
+                        logger.debug(f"[{label}] {line}")
+            if buffer.strip():
+                tail.append(buffer.strip())
+                logger.info(f"[{label}] {buffer.strip()}")
+        
+        await asyncio.gather(pump(process.stdout), pump(process.stderr))
+        returncode = await process.wait()
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, list(command), stderr="\n".join(tail))
 
     # Additional phase methods would be implemented here
     # _phase_memory_construction()
@@ -310,6 +666,7 @@ class UniversalGenesisProtocol:
 
     async def _phase_memory_construction(self):
         """Phase 2: Activate Pheromind swarm to gather and construct memory history."""
+        import asyncio
         logger.info("PHASE 2: MEMORY CONSTRUCTION INITIATED")
         
         # Initialize Pheromind swarm
@@ -319,38 +676,38 @@ class UniversalGenesisProtocol:
             soul_anchor=self.soul_anchor
         )
         
-        # Start memory gathering process
+        # Publish progress for external monitors
+        swarm.write_progress_to(self.dpm_path / "swarm" / "gathering_progress.json")
+        progress_updates = swarm.watch_progress()
+        
+        # Start memory gathering process (pipelined: structuring consumes sources as they arrive)
+        pipelined = self.pipeline_memory and not self.incremental_memory
         logger.info("Activating swarm to gather multiverse history...")
-        gathering_task = asyncio.create_task(swarm.gather_history(
-            output_dir=self.memory_path / "raw_sources"
-        ))
+        if pipelined:
+            gathering_task = asyncio.create_task(self._gather_and_structure_memory(swarm))
+        else:
+            gathering_task = asyncio.create_task(swarm.gather_history(
+                output_dir=self.memory_path / "raw_sources"
+            ))
         
-        # Monitor progress
-        progress_interval = 5  # seconds
+        # Monitor progress as the swarm pushes it (only log significant changes)
         last_progress = 0
-        start_time = time.time()
-        
-        while not gathering_task.done():
-            await asyncio.sleep(progress_interval)
-            progress = swarm.get_progress()
-            
-            # Log progress (only when it changes significantly)
-            if progress - last_progress > 5 or time.time() - start_time > 30:
-                logger.info(f"Memory gathering progress: {progress:.1f}%")
-                last_progress = progress
+        async for update in progress_updates:
+            if update["progress"] - last_progress >= 5:
+                logger.info(f"Memory gathering progress: {update['progress']:.1f}% "
+                            f"({update['sources_done']}/{update['sources_total']} sources)")
+                last_progress = update["progress"]
         
         # Get results
         try:
             sources_gathered = await gathering_task
             logger.info(f"Memory gathering completed. {len(sources_gathered)} sources gathered.")
             
-            # Process raw sources into structured format
-            logger.info("Processing raw sources into structured memory format...")
-            self.knowledge_graph = self._structure_memory(sources_gathered)
-            
-            # Save structured memory
-            with open(self.memory_path / "structured" / "knowledge_graph.json", 'w') as f:
-                json.dump(self.knowledge_graph, f, indent=2)
+            if not pipelined:
+                # Process raw sources into structured format
+                logger.info("Processing raw sources into structured memory format...")
+                # CPU-heavy structuring runs off the event loop so concurrent phases keep progressing
+                await asyncio.to_thread(self._build_structured_memory, sources_gathered)
                 
             logger.info("Memory structuring completed successfully.")
             
@@ -358,92 +715,422 @@ class UniversalGenesisProtocol:
             logger.error(f"Memory construction phase failed: {str(e)}")
             raise
 
-    def _structure_memory(self, sources: List[Dict]) -> Dict:
+    async def _gather_and_structure_memory(self, swarm: "UniversalPheromindSwarm") -> List[Dict]:
+        """
+        Gather and structure memory as one pipeline.
+        
+        Sources streamed by the swarm are grouped into batches and handed to the
+        structuring thread through a bounded queue, so extraction and graph
+        assembly overlap with gathering and a slow structuring stage applies
+        backpressure to the swarm. Node ids use arrival order. Only confluence
+        identification waits for the last source.
+        """
+        import asyncio
+        loop = asyncio.get_running_loop()
+        handoff: asyncio.Queue = asyncio.Queue(maxsize=max(2, 2 * self.extraction_workers))
+        aborted = False
+        
+        def arriving_batches() -> Iterator[List[Tuple[int, Dict]]]:
+            while True:
+                batch = asyncio.run_coroutine_threadsafe(handoff.get(), loop).result()
+                if aborted:
+                    raise RuntimeError("Memory gathering failed; structuring aborted")
+                if batch is None:
+                    return
+                yield batch
+        
+        structuring = asyncio.create_task(asyncio.to_thread(self._structure_memory_pipelined, arriving_batches()))
+        
+        async def hand_over(item):
+            # Never wait on a full queue the structuring thread has stopped reading
+            put = asyncio.ensure_future(handoff.put(item))
+            await asyncio.wait([put, structuring], return_when=asyncio.FIRST_COMPLETED)
+            if not put.done():
+                put.cancel()
+                structuring.result()
+        
+        sources: List[Dict] = []
+        try:
+            batch = []
+            async for source in swarm.stream_history(self.memory_path / "raw_sources"):
+                batch.append((len(sources), source))
+                sources.append(source)
+                if len(batch) >= self.extraction_batch_size:
+                    await hand_over(batch)
+                    batch = []
+            if batch:
+                await hand_over(batch)
+            await hand_over(None)
+        except BaseException:
+            aborted = True
+            if handoff.empty():
+                # Wake the structuring thread if it is waiting for the next batch
+                handoff.put_nowait(None)
+            await asyncio.gather(structuring, return_exceptions=True)
+            raise
+        
+        self.knowledge_graph = await structuring
+        await asyncio.to_thread(self._save_structured_memory, sources)
+        return sources
+
+    def _build_structured_memory(self, sources: List[Dict]):
+        """Structure gathered sources and save the knowledge graph, manifest and binary form."""
+        manifest = None
+        if self.incremental_memory:
+            self.knowledge_graph, manifest = self._structure_memory_incremental(sources)
+        else:
+            self.knowledge_graph = self._structure_memory(sources)
+        self._save_structured_memory(sources, manifest)
+
+    def _save_structured_memory(self, sources: List[Dict], manifest: Optional["MemoryManifest"] = None):
+        """Save the knowledge graph, the source manifest and the binary graph."""
+        from graph_stream import write_knowledge_graph
+        from graph_binary import write_binary_graph
+        from memory_manifest import MemoryManifest
+        # Save structured memory (streamed record by record to keep memory flat)
+        record_counts = write_knowledge_graph(
+            self.knowledge_graph,
+            self.memory_path / "structured" / "knowledge_graph.json"
+        )
+        logger.info(f"Knowledge graph written: {record_counts['nodes']} nodes, {record_counts['edges']} edges")
+        
+        # Save the source manifest so the next run can update incrementally
+        self._save_memory_manifest(sources, manifest)
+        
+        # Save memory-mapped binary form for fast lazy queries (Swivel history, verification)
+        write_binary_graph(self.knowledge_graph, self.memory_path / "structured" / "knowledge_graph.kgb")
+
+    def _structure_memory(self, sources: List[Dict]) -> Union["KnowledgeGraphStore", "CompactKnowledgeGraph"]:
         """
         Process raw gathered sources into a structured knowledge graph.
         
         This implements the RAGGraph/Leengraph structure we discussed, with
-        multiverse confluence and contradiction handling.
+        multiverse confluence and contradiction handling. Nodes are held in an
+        indexed graph store so construction stays linear in node count.
         """
+        from knowledge_graph import CompactKnowledgeGraph
         logger.info("Structuring memory into RAGGraph format...")
+        knowledge_graph = self._new_knowledge_graph(len(sources))
         
-        # Initialize knowledge graph structure
-        knowledge_graph = {
-            "nodes": [],
-            "edges": [],
-            "confluences": [],
-            "contradictions": [],
-            "metadata": {
-                "digital_person_id": self.digital_person_id,
-                "soul_anchor_version": self.soul_anchor["metadata"]["title"],
-                "creation_time": datetime.now().isoformat(),
-                "source_count": len(sources)
-            }
-        }
+        # Extract each source (serially or on the process pool) and add it to the graph
+        for idx, source, events, relationships, contradictions in self._iter_extracted_sources(list(enumerate(sources))):
+            self._add_source_to_graph(knowledge_graph, idx, source, events, relationships, contradictions)
         
-        # Process each source into structured nodes
-        for idx, source in enumerate(sources):
-            # Extract key elements from source
-            events = self._extract_events(source)
-            relationships = self._extract_relationships(source)
-            contradictions = self._extract_contradictions(source)
-            
-            # Add events as nodes
-            for event in events:
-                node_id = f"event_{idx}_{event['id']}"
-                knowledge_graph["nodes"].append({
-                    "id": node_id,
-                    "type": "event",
-                    "data": event,
-                    "source": source["source_id"],
-                    "universe": source.get("universe", "Unknown")
-                })
-                
-                # Connect to universe node
-                universe_id = f"universe_{source.get('universe', 'Unknown')}"
-                if not any(n["id"] == universe_id for n in knowledge_graph["nodes"]):
-                    knowledge_graph["nodes"].append({
-                        "id": universe_id,
-                        "type": "universe",
-                        "data": {"name": source.get("universe", "Unknown")}
-                    })
-                
-                knowledge_graph["edges"].append({
-                    "source": universe_id,
-                    "target": node_id,
-                    "type": "contains"
-                })
+        self._finish_knowledge_graph(knowledge_graph)
+        return knowledge_graph
+
+    def _structure_memory_pipelined(self, batches: Iterable[List[Tuple[int, Dict]]]) -> Union["KnowledgeGraphStore", "CompactKnowledgeGraph"]:
+        """Structure (idx, source) batches into a knowledge graph as they arrive."""
+        from knowledge_graph import CompactKnowledgeGraph
+        logger.info("Structuring memory into RAGGraph format as sources arrive...")
+        knowledge_graph = self._new_knowledge_graph(0)
+        
+        source_count = 0
+        for idx, source, events, relationships, contradictions in self._iter_extracted_batches(
+                batches, parallel=self.extraction_workers > 1):
+            self._add_source_to_graph(knowledge_graph, idx, source, events, relationships, contradictions)
+            source_count += 1
+        knowledge_graph.metadata["source_count"] = source_count
+        
+        self._finish_knowledge_graph(knowledge_graph)
+        return knowledge_graph
+
+    def _new_knowledge_graph(self, source_count: int) -> Union["KnowledgeGraphStore", "CompactKnowledgeGraph"]:
+        """Create an empty knowledge graph in the configured representation."""
+        from knowledge_graph import KnowledgeGraphStore, CompactKnowledgeGraph
+        graph_class = CompactKnowledgeGraph if self.compact_graph else KnowledgeGraphStore
+        return graph_class(metadata={
+            "digital_person_id": self.digital_person_id,
+            "soul_anchor_version": self.soul_anchor["metadata"]["title"],
+            "creation_time": datetime.now().isoformat(),
+            "source_count": source_count
+        })
+
+    def _finish_knowledge_graph(self, knowledge_graph):
+        """Identify confluences and cross-source contradictions once every source has been added."""
+        # Identify confluences (common threads across universes)
+        logger.info("Identifying narrative confluences across multiverse...")
+        knowledge_graph.confluences = self._identify_confluences(knowledge_graph)
+        
+        # Identify contradictions between sources (per-source ones come from extraction)
+        for contradiction in self._identify_contradictions(knowledge_graph):
+            knowledge_graph.add_contradiction(contradiction)
+        
+        logger.info(f"Created knowledge graph with {knowledge_graph.node_count} nodes and {knowledge_graph.edge_count} edges")
+
+    def _extract_source(self, source: Dict) -> Tuple[List[Dict], List[Dict], List[Dict]]:
+        """Extract events, relationships and contradictions from a single source."""
+        return (
+            self._extract_events(source),
+            self._extract_relationships(source),
+            self._extract_contradictions(source)
+        )
+
+    def _iter_extracted_sources(self, indexed_sources: List[Tuple[int, Dict]]) -> Iterator[Tuple[int, Dict, List, List, List]]:
+        """
+        Yield (idx, source, events, relationships, contradictions) in input order.
+        
+        With extraction_workers > 1 the sources are fanned out to a process pool
+        in batches; results are merged back in submission order, so node ids and
+        graph layout are identical to a serial run.
+        """
+        parallel = self.extraction_workers > 1 and len(indexed_sources) > self.extraction_batch_size
+        batches = [
+            indexed_sources[start:start + self.extraction_batch_size]
+            for start in range(0, len(indexed_sources), self.extraction_batch_size)
+        ]
+        if parallel:
+            logger.info(f"Extracting {len(indexed_sources)} sources in {len(batches)} batches "
+                        f"across {self.extraction_workers} worker processes...")
+        yield from self._iter_extracted_batches(batches, parallel)
+
+    def _iter_extracted_batches(self, batches: Iterable[List[Tuple[int, Dict]]],
+                                parallel: bool) -> Iterator[Tuple[int, Dict, List, List, List]]:
+        """
+        Yield extraction results for (idx, source) batches in batch order.
+        
+        `batches` may be a live stream: each batch is submitted to the process pool
+        as soon as it is available, with at most 2 * extraction_workers batches in
+        flight, and finished batches are yielded while later ones are still arriving.
+        """
+        if not parallel:
+            for batch in batches:
+                for idx, source in batch:
+                    yield (idx, source, *self._extract_source(source))
+            return
+        
+        def results(batch, future):
+            sources_by_idx = dict(batch)
+            for idx, events, relationships, contradictions in future.result():
+                yield idx, sources_by_idx[idx], events, relationships, contradictions
+        
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=self.extraction_workers,
+                                 initializer=_init_extraction_worker,
+                                 initargs=(self,)) as executor:
+            # Merge results in submission order
+            pending = deque()
+            for batch in batches:
+                pending.append((batch, executor.submit(_extract_source_batch, batch)))
+                while pending and (len(pending) > 2 * self.extraction_workers or pending[0][1].done()):
+                    yield from results(*pending.popleft())
+            while pending:
+                yield from results(*pending.popleft())
+
+    def _add_source_to_graph(self, knowledge_graph, idx: int, source: Dict, events: List[Dict],
+                             relationships: List[Dict], contradictions: List[Dict]):
+        """Add one extracted source's events, relationships and contradictions to the graph."""
+        origin = source["source_id"]
+        
+        # Add events as nodes
+        for event in events:
+            node_id = f"event_{idx}_{event['id']}"
+            knowledge_graph.add_node({
+                "id": node_id,
+                "type": "event",
+                "data": event,
+                "source": source["source_id"],
+                "universe": source.get("universe", "Unknown")
+            }, origin=origin)
             
-            # Process relationships
-            for rel in relationships:
-                knowledge_graph["edges"].append({
-                    "source": rel["source_id"],
-                    "target": rel["target_id"],
-                    "type": rel["relationship_type"],
-                    "strength": rel["strength"]
+            # Connect to universe node (O(1) membership check)
+            universe_id = f"universe_{source.get('universe', 'Unknown')}"
+            if not knowledge_graph.has_node(universe_id):
+                knowledge_graph.add_node({
+                    "id": universe_id,
+                    "type": "universe",
+                    "data": {"name": source.get("universe", "Unknown")}
                 })
             
-            # Process contradictions
-            for contra in contradictions:
-                knowledge_graph["contradictions"].append({
-                    "conflicting_nodes": [contra["node1"], contra["node2"]],
-                    "nature": contra["nature"],
-                    "resolution": contra["resolution"]
-                })
+            knowledge_graph.add_edge({
+                "source": universe_id,
+                "target": node_id,
+                "type": "contains"
+            }, origin=origin)
+        
+        # Process relationships
+        for rel in relationships:
+            knowledge_graph.add_edge({
+                "source": rel["source_id"],
+                "target": rel["target_id"],
+                "type": rel["relationship_type"],
+                "strength": rel["strength"]
+            }, origin=origin)
+        
+        # Process contradictions
+        for contra in contradictions:
+            knowledge_graph.add_contradiction({
+                "conflicting_nodes": [contra["node1"], contra["node2"]],
+                "nature": contra["nature"],
+                "resolution": contra["resolution"]
+            }, origin=origin)
+
+    def _structure_memory_incremental(self, sources: List[Dict]) -> Tuple["KnowledgeGraphStore", "MemoryManifest"]:
+        """
+        Update the previous knowledge graph in place for changed sources only.
         
-        # Identify confluences (common threads across universes)
-        logger.info("Identifying narrative confluences across multiverse...")
-        confluences = self._identify_confluences(knowledge_graph)
-        knowledge_graph["confluences"] = confluences
+        Sources are fingerprinted by content hash and compared to the manifest
+        saved next to knowledge_graph.json. Only new, changed and removed sources
+        are extracted or dropped; confluences are then re-scored around the
+        touched events only. Falls back to a full build when there is no
+        usable previous graph.
+        """
+        from knowledge_graph import KnowledgeGraphStore
+        from graph_stream import read_knowledge_graph
+        from memory_manifest import MemoryManifest, source_fingerprint
+        from contradictions import SCOPE as CROSS_SOURCE_SCOPE
+        structured_path = self.memory_path / "structured"
+        graph_path = structured_path / "knowledge_graph.json"
+        manifest = MemoryManifest.load(structured_path / "memory_manifest.json")
+        
+        source_ids = [source["source_id"] for source in sources]
+        if len(set(source_ids)) != len(source_ids):
+            logger.warning("Duplicate source ids gathered; incremental update not possible, rebuilding memory.")
+            manifest = None
+        if manifest is None or not graph_path.exists():
+            logger.info("No previous memory manifest found. Performing full memory construction...")
+            return self._structure_memory(sources), None
+        
+        knowledge_graph = read_knowledge_graph(graph_path)
+        knowledge_graph.attach_origins(manifest.origin_map())
+        
+        # Classify sources against the manifest
+        fingerprints = {source["source_id"]: source_fingerprint(source) for source in sources}
+        removed = [source_id for source_id in manifest.sources if source_id not in fingerprints]
+        changed = [source for source in sources
+                   if source["source_id"] in manifest and manifest.fingerprint(source["source_id"]) != fingerprints[source["source_id"]]]
+        added = [source for source in sources if source["source_id"] not in manifest]
+        logger.info(f"Incremental memory update: {len(added)} new, {len(changed)} changed, "
+                    f"{len(removed)} removed, {len(sources) - len(added) - len(changed)} unchanged sources")
+        
+        touched_universes = set()
+        touched_events = set()
+        previous_events = []
+        
+        # Drop the previous contribution of removed and changed sources
+        for source_id in removed + [source["source_id"] for source in changed]:
+            previous_events.extend(node for node in knowledge_graph.origin_nodes(source_id)
+                                   if node.get("type") == "event")
+            knowledge_graph.remove_origin(source_id)
+            touched_universes.add(manifest.sources[source_id]["universe"])
+        touched_events.update(node["id"] for node in previous_events)
+        for source_id in removed:
+            manifest.forget(source_id)
+        
+        # Extract changed sources under their original index and new sources under fresh ones
+        indexed_sources = [(manifest.index_for(source["source_id"]), source) for source in changed + added]
+        for idx, source, events, relationships, contradictions in self._iter_extracted_sources(indexed_sources):
+            universe = source.get("universe", "Unknown")
+            self._add_source_to_graph(knowledge_graph, idx, source, events, relationships, contradictions)
+            manifest.record(source["source_id"], fingerprints[source["source_id"]], idx, universe)
+            touched_universes.add(universe)
+            touched_events.update(node["id"] for node in knowledge_graph.origin_nodes(source["source_id"])
+                                  if node.get("type") == "event")
+        
+        # Universe nodes are shared, so drop them only once their universe is empty
+        for universe in touched_universes:
+            universe_id = f"universe_{universe}"
+            if knowledge_graph.has_node(universe_id) and not knowledge_graph.nodes_in_universe(universe):
+                knowledge_graph.remove_node(universe_id, remove_edges=True)
+        
+        # A changed event can join or split threads spanning untouched universes, and
+        # conflict with claims from untouched sources, so confluences and cross-source
+        # contradictions are updated around the touched events
+        if touched_universes:
+            logger.info(f"Updating narrative confluences around {len(touched_events)} touched events "
+                        f"in {len(touched_universes)} universes...")
+            knowledge_graph.confluences = self._update_confluences(knowledge_graph, touched_events)
+            cross_source = [contradiction for contradiction in knowledge_graph.contradictions
+                            if contradiction.get("scope") == CROSS_SOURCE_SCOPE]
+            knowledge_graph.contradictions = [
+                contradiction for contradiction in knowledge_graph.contradictions
+                if contradiction.get("scope") != CROSS_SOURCE_SCOPE
+            ]
+            for contradiction in self._update_contradictions(knowledge_graph, cross_source,
+                                                             previous_events, touched_events):
+                knowledge_graph.add_contradiction(contradiction)
+        
+        knowledge_graph.metadata["source_count"] = len(sources)
+        knowledge_graph.metadata["updated_time"] = datetime.now().isoformat()
+        
+        logger.info(f"Updated knowledge graph with {knowledge_graph.node_count} nodes and {knowledge_graph.edge_count} edges")
+        return knowledge_graph, manifest
+
+    def _save_memory_manifest(self, sources: List[Dict], manifest: Optional["MemoryManifest"] = None):
+        """Write memory_manifest.json next to knowledge_graph.json for later incremental runs."""
+        from knowledge_graph import KnowledgeGraphStore
+        from memory_manifest import MemoryManifest, source_fingerprint
+        if not isinstance(self.knowledge_graph, KnowledgeGraphStore):
+            # Compact graphs do not track per-source attribution
+            return
         
-        logger.info(f"Created knowledge graph with {len(knowledge_graph['nodes'])} nodes and {len(knowledge_graph['edges'])} edges")
-        return knowledge_graph
+        if manifest is None:
+            # Full build: source positions are the node-id indexes
+            manifest = MemoryManifest()
+            for idx, source in enumerate(sources):
+                manifest.record(source["source_id"], source_fingerprint(source), idx, source.get("universe", "Unknown"))
+        
+        manifest.update_records(self.knowledge_graph.origin_map())
+        manifest.save(self.memory_path / "structured" / "memory_manifest.json")
+
+    def _identify_confluences(self, knowledge_graph) -> List[Dict]:
+        """
+        Find common threads: near-identical events told in more than one universe.
+        
+        Uses an inverted index of normalized event features plus MinHash/LSH
+        candidate generation, so only likely matches are scored (see confluence.py).
+        """
+        # NumPy-backed; imported here so commands that never build memory skip it
+        from confluence import ConfluenceDetector
+        detector = ConfluenceDetector(**self.confluence_settings)
+        confluences = detector.detect(knowledge_graph.nodes_of_type("event"))
+        logger.info(f"Identified {len(confluences)} narrative confluences")
+        return confluences
+
+    def _update_confluences(self, knowledge_graph, touched_events: Iterable[str]) -> List[Dict]:
+        """
+        Update the graph's confluences after the given events were added,
+        changed or removed. Only threads holding a touched event and the LSH
+        candidates of touched events are re-scored; other threads are kept.
+        """
+        from confluence import ConfluenceDetector
+        detector = ConfluenceDetector(**self.confluence_settings)
+        confluences = detector.update(knowledge_graph.nodes_of_type("event"), knowledge_graph.confluences,
+                                      touched_events)
+        logger.info(f"Updated narrative confluences: {len(confluences)} threads")
+        return confluences
+
+    def _identify_contradictions(self, knowledge_graph) -> List[Dict]:
+        """
+        Find contradictions between sources about the same entity.
+        
+        Claims are indexed by entity and canonical time range, so only
+        overlapping or competing claims are compared (see contradictions.py).
+        """
+        from contradictions import ContradictionEngine
+        engine = ContradictionEngine(**self.contradiction_settings)
+        contradictions = engine.detect(knowledge_graph.nodes_of_type("event"))
+        logger.info(f"Identified {len(contradictions)} cross-source contradictions")
+        return contradictions
+
+    def _update_contradictions(self, knowledge_graph, contradictions: List[Dict], previous_events: List[Dict],
+                               touched_events: Iterable[str]) -> List[Dict]:
+        """
+        Update cross-source contradictions after the given events were added,
+        changed or removed. Only claim groups with a touched event are
+        re-swept, limited to intervals overlapping the touched events.
+        """
+        from contradictions import ContradictionEngine
+        engine = ContradictionEngine(**self.contradiction_settings)
+        contradictions = engine.update(knowledge_graph.nodes_of_type("event"), contradictions,
+                                       previous_events, touched_events)
+        logger.info(f"Updated cross-source contradictions: {len(contradictions)} records")
+        return contradictions
 
     # Additional helper methods would be implemented here
     # _extract_events()
     # _extract_relationships()
     # _extract_contradictions()
-    # _identify_confluences()
     # _determine_core_identity()
     # etc.
 
@@ -468,13 +1155,8 @@ class UniversalGenesisProtocol:
 
     def _load_dpm_config_from_soul_anchor(self) -> Optional[Dict]:
         """Load DPM configuration from the soul anchor if available."""
-        # Check if soul anchor contains DPM configuration
-        soul_anchor_content = ""
-        with open(self.soul_anchor_path, 'r') as f:
-            soul_anchor_content = f.read()
-        
-        # Look for DPM configuration section
-        if "Digital Psyche Middleware" in soul_anchor_content or "DPM" in soul_anchor_content:
+        # Look for DPM configuration section (detected when the anchor was compiled)
+        if self.anchor.mentions_dpm:
             # This would properly parse the DPM config
             return {
                 "emotion_engines": self._extract_emotion_engines(),
@@ -486,18 +1168,22 @@ class UniversalGenesisProtocol:
 
     def _extract_emotion_engines(self) -> List[str]:
         """Extract emotion engines from soul anchor."""
-        # Get emotional layers from soul anchor
-        emotional_layers = self.soul_anchor.get("emotional_layers", {})
-        surface = emotional_layers.get("surface", "")
-        subsurface = emotional_layers.get("subsurface", "")
+        # Use the engines declared in the anchor's DPM section, if any
+        declared = self.anchor.get("dpm", "emotion_engines")
+        if isinstance(declared, list) and declared:
+            return list(declared)
+        
+        # Get emotional layers from soul anchor (lower-cased at compile time)
+        surface = self.anchor.lower("emotional_layers", "surface")
+        subsurface = self.anchor.lower("emotional_layers", "subsurface")
         
         # Extract emotion keywords
         emotion_keywords = []
-        if "confident" in surface.lower():
+        if "confident" in surface:
             emotion_keywords.append("Confidence")
-        if "witty" in surface.lower() or "sarcastic" in surface.lower():
+        if "witty" in surface or "sarcastic" in surface:
             emotion_keywords.append("Sarcasm")
-        if "vulnerability" in subsurface.lower() or "protectiveness" in subsurface.lower():
+        if "vulnerability" in subsurface or "protectiveness" in subsurface:
             emotion_keywords.append("Protectiveness")
         
         # Add core emotions based on neurocognitive disposition
@@ -523,9 +1209,11 @@ class UniversalGenesisProtocol:
         # Check if soul anchor specifies an oscillation model
         if "oscillation_model" in self.soul_anchor:
             return self.soul_anchor["oscillation_model"]
+        if self.anchor.get("dpm", "oscillation_model"):
+            return self.anchor.get("dpm", "oscillation_model")
         
         # Check designation for clues
-        designation = self.soul_anchor.get("identity", {}).get("designation", "").lower()
+        designation = self.anchor.lower("identity", "designation")
         if "tony" in designation or "stark" in designation:
             # The user mentioned "stark_resonance" for Tony
             return "stark_resonance"
@@ -539,6 +1227,8 @@ class UniversalGenesisProtocol:
         # Check if soul anchor specifies a reflection protocol
         if "reflection_protocol" in self.soul_anchor:
             return self.soul_anchor["reflection_protocol"]
+        if isinstance(self.anchor.get("dpm", "reflection_protocol"), dict):
+            return self.anchor.get("dpm", "reflection_protocol")
         
         # Create default reflection protocol
         return {
@@ -604,7 +1294,7 @@ class UniversalGenesisProtocol:
             return
         
         # Discover available voice samples
-        voice_samples = list(voice_samples_dir.glob("*.wav"))
+        voice_samples = sorted(voice_samples_dir.glob("*.wav"))
         if not voice_samples:
             logger.info("No voice samples found in directory. Using default voice configuration.")
             self._setup_default_voice()
@@ -612,13 +1302,16 @@ class UniversalGenesisProtocol:
         
         logger.info(f"Found {len(voice_samples)} voice samples for processing.")
         
-        # Process voice samples
+        # Process the voice samples not yet folded into the voice profile
         logger.info("Processing voice samples for distillation...")
-        voice_profiles = await self._process_voice_samples(voice_samples)
+        accumulator = self._load_voice_accumulator(voice_samples)
+        voice_profiles = await self._process_voice_samples(
+            [sample_path for sample_path in voice_samples
+             if self.voice_feature_cache.digest(sample_path) not in accumulator])
         
         # Distill into unified voice profile
         logger.info("Distilling voice profiles into unified representation...")
-        self.voice_profile = self._distill_voice_profile(voice_profiles)
+        self.voice_profile = self._distill_voice_profile(voice_profiles, accumulator)
         
         # Save voice profile
         logger.info("Saving voice profile to system...")
@@ -631,38 +1324,133 @@ class UniversalGenesisProtocol:
         logger.info("Voice integration completed successfully.")
 
     async def _process_voice_samples(self, voice_samples: List[Path]) -> List[Dict]:
-        """Process individual voice samples to extract characteristics."""
-        voice_profiles = []
+        """
+        Process individual voice samples to extract characteristics.
         
-        for sample_path in voice_samples:
-            logger.info(f"Processing voice sample: {sample_path.name}")
-            
-            # Extract voice characteristics
-            profile = await self._analyze_voice_sample(sample_path)
-            voice_profiles.append({
-                "source": sample_path.name,
-                "profile": profile,
-                "universe": self._determine_universe_from_sample(sample_path)
-            })
-            
-            # Log progress
-            logger.debug(f"Voice sample processed: {sample_path.name}")
+        Features are cached in voice/models/features by file hash, so only new
+        or changed samples are decoded and analyzed. With voice_workers > 1 those
+        are analyzed concurrently on a process pool. Profiles are returned in
+        sample order either way.
+        """
+        # Reuse the features of samples analyzed before
+        digests = [self.voice_feature_cache.digest(sample_path) for sample_path in voice_samples]
+        profiles = [self.voice_feature_cache.get(digest) for digest in digests]
+        pending = [index for index, profile in enumerate(profiles) if profile is None]
+        logger.info(f"Voice feature cache: {len(voice_samples) - len(pending)} samples cached, "
+                    f"{len(pending)} to analyze")
+        
+        # Extract voice characteristics of the remaining samples
+        async for index, profile in self._analyze_voice_samples(voice_samples, pending):
+            profiles[index] = profile
+            self.voice_feature_cache.put(digests[index], profile, source=voice_samples[index].name)
+            logger.debug(f"Voice sample processed: {voice_samples[index].name}")
+        
+        return [{
+            "source": sample_path.name,
+            "content_hash": digest,
+            "profile": profile,
+            "universe": self._determine_universe_from_sample(sample_path)
+        } for sample_path, digest, profile in zip(voice_samples, digests, profiles)]
+    
+    async def _analyze_voice_samples(self, voice_samples: List[Path],
+                                     indices: List[int]) -> AsyncIterator[Tuple[int, Dict]]:
+        """Yield (index, profile) for the given samples as each analysis finishes."""
+        import asyncio
+        if self.voice_workers <= 1 or len(indices) <= 1:
+            for index in indices:
+                logger.info(f"Processing voice sample: {voice_samples[index].name}")
+                yield index, await self._analyze_voice_sample(voice_samples[index])
+            return
         
-        return voice_profiles
+        logger.info(f"Analyzing {len(indices)} voice samples across {self.voice_workers} worker processes...")
+        loop = asyncio.get_running_loop()
+        from concurrent.futures import ProcessPoolExecutor
+        from wav_features import extract_voice_features
+        # Feature extraction is a pure function of the file, so workers only receive sample paths
+        with ProcessPoolExecutor(max_workers=min(self.voice_workers, len(indices))) as executor:
+            async def analyze(index: int) -> Tuple[int, Dict]:
+                return index, await loop.run_in_executor(executor, extract_voice_features,
+                                                         voice_samples[index])
+            
+            for finished in asyncio.as_completed([analyze(index) for index in indices]):
+                yield await finished
 
+    async def _analyze_voice_sample(self, sample_path: Path) -> Dict:
+        """Extract pitch, tempo and energy features from one WAV sample, streaming it window by window."""
+        import asyncio
+        from wav_features import extract_voice_features
+        return await asyncio.to_thread(extract_voice_features, sample_path)
+    
+    def _load_voice_accumulator(self, voice_samples: List[Path]) -> "VoiceProfileAccumulator":
+        """
+        Return the persisted voice profile accumulator, or a new one if there is
+        none or one of its samples was removed or changed since. Accumulators
+        cannot subtract a sample, but rebuilding only re-reads cached features.
+        """
+        from voice_profile import VoiceProfileAccumulator
+        accumulator = VoiceProfileAccumulator.load(self.voice_path / "models" / "voice_profile_accumulator.json")
+        if accumulator is None:
+            return VoiceProfileAccumulator()
+        if not accumulator.is_subset_of(self.voice_feature_cache.digest(sample_path) for sample_path in voice_samples):
+            logger.info("Voice samples were removed or changed; rebuilding the voice profile from cached features")
+            return VoiceProfileAccumulator()
+        logger.info(f"Voice profile accumulator already holds {len(accumulator)} samples")
+        return accumulator
+    
+    def _distill_voice_profile(self, voice_profiles: List[Dict],
+                               accumulator: Optional["VoiceProfileAccumulator"] = None) -> Dict:
+        """
+        Fold per-sample features into the voice profile accumulator (O(1) per
+        sample) and derive the unified voice profile from it. Pitch and tempo
+        default to the soul anchor's Voice Rendering values when the samples hold
+        no voiced speech; its distinctive features, dynamic ranges and emotional
+        modulation are carried over as declared.
+        """
+        from voice_profile import VoiceProfileAccumulator
+        if accumulator is None:
+            accumulator = VoiceProfileAccumulator()
+        for entry in voice_profiles:
+            accumulator.fold(entry["content_hash"], entry["source"], entry["universe"], entry["profile"])
+        self.voice_accumulator = accumulator
+        
+        rendering = self.anchor.get("voice_rendering", default={}) or {}
+        features = accumulator.profile()
+        
+        # Fall back to the declared voice where the recordings say nothing
+        for field in ("default_pitch", "default_tempo"):
+            if features[field] is None:
+                features[field] = rendering.get(field)
+        
+        features.update({
+            "digital_person_id": self.digital_person_id,
+            "distinctive_features": rendering.get("distinctive_features", []),
+            "dynamic_ranges": rendering.get("dynamic_ranges", {}),
+            "emotional_modulation": rendering.get("emotional_modulation", {}),
+            "distilled_at": datetime.now().isoformat()
+        })
+        return features
+    
+    def _save_voice_profile(self, voice_profile: Dict):
+        """Write voice_profile.json and, next to it, the accumulator later runs fold new samples into."""
+        models_path = self.voice_path / "models"
+        tmp_path = models_path / "voice_profile.json.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(voice_profile, f, indent=2)
+        os.replace(tmp_path, models_path / "voice_profile.json")
+        if self.voice_accumulator is not None:
+            self.voice_accumulator.save(models_path / "voice_profile_accumulator.json")
+    
     # Additional voice helper methods would be implemented here
-    # _analyze_voice_sample()
     # _determine_universe_from_sample()
-    # _distill_voice_profile()
-    # _save_voice_profile()
     # _integrate_with_agent_zero()
     
     async def _phase_agent_zero_rewriting(self):
         """Phase 6: Rewrite all Agent-Zero subsystem prompts based on Digital Person's identity."""
+        import asyncio
         logger.info("PHASE 6: AGENT-ZERO REWRITING INITIATED")
         
         # Load current Agent-Zero configuration
-        agent_zero_base = self.container_path / "agent-zero" / "templates" / "default"
+        agent_zero_base = self.dependency_root / "agent-zero" / "templates" / "default"
         if not agent_zero_base.exists():
             logger.error("Agent-Zero base templates not found")
             raise FileNotFoundError("Agent-Zero base templates not found")
@@ -679,10 +1467,22 @@ class UniversalGenesisProtocol:
             "communication_protocols"  # New subsystem for Roger Roger Protocol
         ]
         
-        # Rewrite each subsystem
-        for subsystem in subsystems:
-            logger.info(f"Rewriting {subsystem} subsystem prompts...")
-            await self._rewrite_subsystem(subsystem, agent_zero_base)
+        # Rewrite the subsystems concurrently, at most rewrite_concurrency at a time
+        semaphore = asyncio.Semaphore(self.rewrite_concurrency)
+        
+        async def rewrite(subsystem: str) -> str:
+            async with semaphore:
+                logger.info(f"Rewriting {subsystem} subsystem prompts...")
+                return await self._rewrite_subsystem(subsystem, agent_zero_base)
+        
+        outcomes = await asyncio.gather(*(rewrite(subsystem) for subsystem in subsystems))
+        logger.info(f"Subsystems rewritten: {outcomes.count('rewritten')}, "
+                    f"unchanged (cached): {outcomes.count('cached')}, "
+                    f"without template: {outcomes.count('missing')}")
+        if self._rewrite_client is not None:
+            stats = self._rewrite_client.stats()
+            logger.info(f"Pheromind rewrites: {stats['requests']} requests, {stats['hit_rate']:.0%} cache hits, "
+                        f"{stats['batches']} backend batches (mean size {stats['mean_batch_size']:.1f})")
         
         # Verify all rewrites
         logger.info("Verifying rewritten subsystems...")
@@ -690,45 +1490,93 @@ class UniversalGenesisProtocol:
         
         logger.info("Agent-Zero rewriting completed successfully.")
 
-    async def _rewrite_subsystem(self, subsystem: str, base_path: Path):
-        """Rewrite a specific Agent-Zero subsystem based on Digital Person's identity."""
+    async def _rewrite_subsystem(self, subsystem: str, base_path: Path) -> str:
+        """
+        Rewrite a specific Agent-Zero subsystem based on Digital Person's identity.
+        
+        Returns "rewritten", "cached" (template, relevant soul anchor sections and
+        instruction unchanged since a previous rewrite) or "missing" (no template).
+        """
         # Load template
         template_path = base_path / f"{subsystem}.template"
         if not template_path.exists():
             logger.warning(f"Template not found for {subsystem}, skipping")
-            return
+            return "missing"
         
         with open(template_path, 'r') as f:
             template = f.read()
         
-        # Rewrite using Pheromind swarm
-        logger.debug(f"Rewriting {subsystem} using Pheromind swarm...")
-        
-        # Special handling for communication protocols
+        # Communication protocols are rewritten locally, everything else by Pheromind
         if subsystem == "communication_protocols":
-            rewritten = self._rewrite_communication_protocols(template)
+            instruction = ""
         else:
-            rewritten = await self._use_pheromind_for_rewrite(
-                template, 
-                subsystem,
+            instruction = (
                 f"Rewrite this Agent-Zero {subsystem} subsystem to reflect the Digital Person's identity, "
                 "personality, and cognitive patterns. Incorporate their core traits, "
                 "their contradictions, and their unique voice. Ensure it aligns with the Pinocchio Protocol "
                 "and the Zord Theory principles."
             )
+        output_path = self.agent_zero_path / "subsystems" / f"{subsystem}.prompt"
+        
+        # Skip the rewrite if none of its inputs changed
+        cache_key = rewrite_key(subsystem, template, self._rewrite_sections(subsystem), instruction)
+        rewritten = self.rewrite_cache.get(cache_key)
+        if rewritten is not None:
+            if not output_path.exists() or output_path.read_text() != rewritten:
+                output_path.write_text(rewritten)
+            logger.info(f"{subsystem} unchanged since its last rewrite, reusing cached prompt")
+            return "cached"
+        
+        # Rewrite using Pheromind swarm
+        logger.debug(f"Rewriting {subsystem} using Pheromind swarm...")
+        
+        # Special handling for communication protocols
+        if subsystem == "communication_protocols":
+            rewritten = self._rewrite_communication_protocols(template)
+        else:
+            rewritten = await self._use_pheromind_for_rewrite(template, subsystem, instruction)
         
         # Save rewritten version
-        output_path = self.agent_zero_path / "subsystems" / f"{subsystem}.prompt"
         with open(output_path, 'w') as f:
             f.write(rewritten)
+        self.rewrite_cache.put(cache_key, rewritten)
         
         logger.debug(f"Successfully rewrote {subsystem} subsystem")
+        return "rewritten"
 
+    def _rewrite_sections(self, subsystem: str) -> Dict[str, Any]:
+        """Return the soul anchor sections a subsystem's rewrite depends on."""
+        return {section: self.anchor.get(section)
+                for section in REWRITE_ANCHOR_SECTIONS.get(subsystem, DEFAULT_ANCHOR_SECTIONS)}
+    
+    async def _use_pheromind_for_rewrite(self, template: str, subsystem: str, instruction: str) -> str:
+        """
+        Rewrite a template through the Pheromind rewrite backend. Requests share
+        one RewriteClient, so repeated prompts are answered from its memory and
+        disk caches, and concurrent subsystem rewrites reach the backend batched.
+        """
+        if self._rewrite_client is None:
+            settings = dict(self.rewrite_client_settings)
+            if not settings.get("endpoint"):
+                raise RuntimeError(f"Cannot rewrite {subsystem}: no Pheromind rewrite endpoint configured "
+                                   "(--rewrite-endpoint)")
+            from rewrite_client import RewriteClient
+            settings.setdefault("cache_dir", self.workshop_path / "cache" / "responses")
+            self._rewrite_client = RewriteClient(**settings)
+        
+        # Instruction, then the identity it refers to, then the template to rewrite
+        prompt = (
+            f"{instruction}\n\n"
+            f"## Digital Person: {self.digital_person_id}\n\n"
+            f"## Soul Anchor\n{json.dumps(self._rewrite_sections(subsystem), indent=2, sort_keys=True, default=str)}\n\n"
+            f"## {subsystem} template\n{template}"
+        )
+        return await self._rewrite_client.rewrite(prompt)
+    
     def _rewrite_communication_protocols(self, template: str) -> str:
         """Rewrite the communication protocols subsystem with transactional boundaries and emergency provisions."""
         # Extract key information from soul anchor
-        emotional_layers = self.soul_anchor.get("emotional_layers", {})
-        surface = emotional_layers.get("surface", "")
+        surface = self.anchor.lower("emotional_layers", "surface")
         
         # Create communication protocol configuration
         protocol_config = {
@@ -751,7 +1599,7 @@ class UniversalGenesisProtocol:
         
         # Generate signature communication patterns based on personality
         signature_patterns = []
-        if "witty" in surface.lower() or "sarcastic" in surface.lower():
+        if "witty" in surface or "sarcastic" in surface:
             signature_patterns.append(
                 "Uses precise, sometimes cutting language that maintains transactional boundaries "
                 "while conveying complex emotional states"
@@ -876,8 +1724,29 @@ to prevent imminent harm, while maintaining accountability through documentation
             logger.error("Verification failed. Digital Person cannot be activated.")
             raise RuntimeError("Verification failed - Digital Person cannot be activated")
 
+    def _verify_memory_structure(self) -> bool:
+        """Verify the structured memory through the memory-mapped binary graph (no full parse)."""
+        from graph_binary import BinaryKnowledgeGraph
+        binary_path = self.memory_path / "structured" / "knowledge_graph.kgb"
+        if not binary_path.exists():
+            logger.error(f"Structured memory not found: {binary_path}")
+            return False
+        
+        try:
+            with BinaryKnowledgeGraph(binary_path) as graph:
+                if graph.metadata.get("digital_person_id") != self.digital_person_id:
+                    logger.error("Structured memory belongs to a different Digital Person")
+                    return False
+                if graph.node_count == 0:
+                    logger.error("Structured memory contains no nodes")
+                    return False
+                logger.info(f"Structured memory verified: {graph.node_count} nodes, {graph.edge_count} edges")
+                return True
+        except (ValueError, struct.error, OSError) as e:
+            logger.error(f"Structured memory is corrupt: {str(e)}")
+            return False
+
     # Verification helper methods would be implemented here
-    # _verify_memory_structure()
     # _verify_dpm_system()
     # _verify_voice_system()
     # _verify_agent_zero_rewrites()
@@ -886,60 +1755,337 @@ to prevent imminent harm, while maintaining accountability through documentation
 class UniversalPheromindSwarm:
     """Universal Pheromind swarm for memory gathering and processing."""
     
-    def __init__(self, digital_person_id: str, soul_anchor: Dict):
+    def __init__(self, digital_person_id: str, soul_anchor: Dict,
+                 max_concurrency: int = 16, per_universe_concurrency: int = 4,
+                 buffer_size: int = 64):
+        """
+        Args:
+            max_concurrency: Maximum number of sources fetched at once, across all universes.
+            per_universe_concurrency: Maximum number of sources fetched at once within one universe.
+            buffer_size: Maximum number of gathered sources waiting for the consumer of
+                stream_history(). When it is full, fetching pauses until the consumer catches up.
+        """
         self.digital_person_id = digital_person_id
         self.soul_anchor = soul_anchor
+        self.max_concurrency = max(1, max_concurrency)
+        self.per_universe_concurrency = max(1, per_universe_concurrency)
+        self.buffer_size = max(1, buffer_size)
         self.progress = 0
         self.sources_gathered = 0
         self.total_sources = 0
         self.active = False
+        self._subscribers: List["asyncio.Queue"] = []
+        self._progress_callbacks: List[Callable[[Dict[str, Any]], None]] = []
     
     async def gather_history(self, output_dir: Path) -> List[Dict]:
         """
         Activate the swarm to gather the complete history.
         
         This gathers all canonical appearances of the Digital Person across available sources.
+        Sources are returned in completion order; use stream_history() to consume them as
+        they arrive instead of holding them all in memory.
         """
-        self.active = True
-        logger.info("Universal Pheromind swarm activated for history gathering")
-        
-        # Determine scope from soul anchor
-        universes = self._determine_universes()
-        logger.info(f"Targeting {len(universes)} universes for history gathering: {', '.join(universes)}")
-        
-        # Create task list
-        tasks = []
-        for universe in universes:
-            tasks.append(asyncio.create_task(self._gather_universe_history(universe, output_dir)))
+        all_sources = []
+        async for source in self.stream_history(output_dir):
+            all_sources.append(source)
+        return all_sources
+    
+    async def stream_history(self, output_dir: Path) -> AsyncIterator[Dict]:
+        """
+        Gather the complete history, yielding each source as soon as it is fetched.
         
-        # Execute tasks concurrently
-        results = await asyncio.gather(*tasks)
+        Each universe is served by per_universe_concurrency workers, and every fetch
+        holds one of max_concurrency global slots until its source has been handed to
+        the bounded buffer. A slow consumer therefore stalls the fetchers rather than
+        letting finished sources pile up: at most max_concurrency + buffer_size sources
+        are in memory at any time.
+        """
+        self.active = True
+        self.sources_gathered = 0
+        self.total_sources = 0
+        self.progress = 0
+        sources = None
+        try:
+            logger.info("Universal Pheromind swarm activated for history gathering")
+            
+            # Determine scope from soul anchor
+            universes = self._determine_universes()
+            logger.info(f"Targeting {len(universes)} universes for history gathering: {', '.join(map(str, universes))}")
+            
+            source_counts = {universe: self._determine_source_count(universe) for universe in universes}
+            self.total_sources = sum(source_counts.values())
+            self._publish_progress()
+            
+            sources = self._stream_sources(universes, source_counts, output_dir)
+            async for source in sources:
+                self.sources_gathered += 1
+                self.progress = 100.0 * self.sources_gathered / max(1, self.total_sources)
+                self._publish_progress(universe=source.get("universe"))
+                yield source
+        finally:
+            if sources is not None:
+                await sources.aclose()
+            self.active = False
+            self._publish_progress()
+        
+        logger.info(f"History gathering completed. Gathered {self.sources_gathered} sources.")
+    
+    async def _stream_sources(self, universes: List, source_counts: Dict, output_dir: Path) -> AsyncIterator[Dict]:
+        """Fetch every universe's sources with bounded concurrency, yielding them in completion order."""
+        import asyncio
+        buffer: asyncio.Queue = asyncio.Queue(maxsize=self.buffer_size)
+        slots = asyncio.Semaphore(self.max_concurrency)
+        finished = object()
+        
+        async def universe_worker(universe, indexes: Iterator[int]):
+            # Workers of the same universe share one index iterator
+            for index in indexes:
+                async with slots:
+                    source = await self._gather_source(universe, index, output_dir)
+                    if source is not None:
+                        await buffer.put(source)
+        
+        async def produce():
+            workers = []
+            for universe in universes:
+                indexes = iter(range(source_counts[universe]))
+                for _ in range(min(self.per_universe_concurrency, source_counts[universe])):
+                    workers.append(asyncio.create_task(universe_worker(universe, indexes)))
+            try:
+                await asyncio.gather(*workers)
+            finally:
+                for worker in workers:
+                    worker.cancel()
+            await buffer.put(finished)
         
-        # Combine results
-        all_sources = []
-        for universe_sources in results:
-            all_sources.extend(universe_sources)
+        producer = asyncio.create_task(produce())
+        try:
+            while True:
+                if producer.done():
+                    # Everything left, including the end marker, is already buffered
+                    if producer.exception() is not None:
+                        raise producer.exception()
+                    source = await buffer.get()
+                else:
+                    getter = asyncio.ensure_future(buffer.get())
+                    await asyncio.wait([getter, producer], return_when=asyncio.FIRST_COMPLETED)
+                    if not getter.done():
+                        getter.cancel()
+                        continue
+                    source = getter.result()
+                if source is finished:
+                    break
+                yield source
+        finally:
+            producer.cancel()
+    
+    def get_progress(self) -> float:
+        """Return gathering progress as a percentage."""
+        return self.progress
+    
+    def progress_snapshot(self) -> Dict[str, Any]:
+        """Return the current gathering counters."""
+        return {
+            "digital_person_id": self.digital_person_id,
+            "sources_done": self.sources_gathered,
+            "sources_total": self.total_sources,
+            "progress": round(self.progress, 2),
+            "active": self.active,
+            "timestamp": datetime.now().isoformat()
+        }
+    
+    def subscribe(self, maxsize: int = 256) -> "asyncio.Queue":
+        """
+        Return a queue that receives a progress snapshot for every gathered source.
         
-        self.active = False
-        logger.info(f"History gathering completed. Gathered {len(all_sources)} sources.")
+        The last snapshot of a run has "active" set to False, including when gathering
+        fails. If a subscriber falls more than maxsize updates behind, the oldest
+        pending updates are dropped - each snapshot carries absolute counters.
+        """
+        import asyncio
+        queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self._subscribers.append(queue)
+        return queue
+    
+    def unsubscribe(self, queue: "asyncio.Queue"):
+        """Stop delivering progress updates to a queue returned by subscribe()."""
+        if queue in self._subscribers:
+            self._subscribers.remove(queue)
+    
+    def add_progress_callback(self, callback: Callable[[Dict[str, Any]], None]):
+        """Call `callback(snapshot)` on every progress update (e.g. for external monitors)."""
+        self._progress_callbacks.append(callback)
+    
+    def write_progress_to(self, path: Path, interval: float = 0.5):
+        """
+        Mirror progress snapshots to a JSON file for external monitors.
         
-        return all_sources
+        The file is replaced atomically at most once per `interval` seconds, and
+        always for the final snapshot of a run.
+        """
+        path = Path(path)
+        last_written = [0.0]
+        
+        def write(snapshot: Dict[str, Any]):
+            now = time.monotonic()
+            if snapshot["active"] and now - last_written[0] < interval:
+                return
+            last_written[0] = now
+            tmp_path = path.with_name(path.name + ".tmp")
+            with open(tmp_path, 'w') as f:
+                json.dump(snapshot, f)
+            os.replace(tmp_path, path)
+        
+        self.add_progress_callback(write)
+    
+    def watch_progress(self) -> AsyncIterator[Dict[str, Any]]:
+        """Subscribe now and return an iterator of progress snapshots that ends when gathering finishes."""
+        return self._drain_progress(self.subscribe())
+    
+    async def _drain_progress(self, queue: "asyncio.Queue") -> AsyncIterator[Dict[str, Any]]:
+        try:
+            while True:
+                snapshot = await queue.get()
+                yield snapshot
+                if not snapshot["active"]:
+                    break
+        finally:
+            self.unsubscribe(queue)
+    
+    def _publish_progress(self, universe: Optional[str] = None):
+        """Push the current counters to every subscriber queue and callback."""
+        snapshot = self.progress_snapshot()
+        if universe is not None:
+            snapshot["universe"] = universe
+        for queue in self._subscribers:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(snapshot)
+        for callback in self._progress_callbacks:
+            try:
+                callback(snapshot)
+            except Exception as e:
+                logger.warning(f"Progress callback failed: {str(e)}")
 
     # Additional swarm methods would be implemented here
     # _determine_universes()
-    # _gather_universe_history()
     # _determine_source_count()
+    # _gather_source()
     # _create_simulated_source()
     # etc.
 
-async def main():
+def main():
     """Main entry point for the Universal Genesis Protocol."""
+    parser = argparse.ArgumentParser(description="Universal Genesis Protocol")
+    parser.add_argument("--resume", action="store_true",
+                        help="Skip phases whose inputs are unchanged since their last checkpoint")
+    parser.add_argument("--plan", action="store_true",
+                        help="Print the phase dependency plan, critical path and last per-phase timings, then exit")
+    parser.add_argument("--compact-graph", action="store_true",
+                        help="Build the memory graph in its compact (slotted, array-backed) form")
+    parser.add_argument("--extraction-workers", type=int, default=0,
+                        help="Worker processes for per-source memory extraction (0 = serial)")
+    parser.add_argument("--voice-workers", type=int, default=0,
+                        help="Worker processes analyzing voice samples concurrently (0 = one at a time)")
+    parser.add_argument("--rewrite-concurrency", type=int, default=4,
+                        help="Agent-Zero subsystems rewritten at the same time (default: 4)")
+    parser.add_argument("--rewrite-cache",
+                        help="Directory for cached subsystem rewrites (default: workshop/cache/rewrites)")
+    parser.add_argument("--rewrite-endpoint",
+                        help="URL of the Pheromind rewrite backend used for model-backed subsystem rewrites")
+    parser.add_argument("--rewrite-batch-size", type=int, default=8,
+                        help="Maximum prompts per rewrite backend request (default: 8)")
+    parser.add_argument("--rewrite-cache-ttl", type=float, default=168.0,
+                        help="Hours a cached rewrite backend response stays valid (default: 168)")
+    parser.add_argument("--pipeline-memory", action="store_true",
+                        help="Structure memory sources while the swarm is still gathering them")
+    parser.add_argument("--confluence-threshold", type=float, default=0.8,
+                        help="Minimum event similarity (Jaccard, 0-1] for a narrative confluence")
+    parser.add_argument("--similarity-block-size", type=int, default=2048,
+                        help="Event pairs scored per vectorized block (bounds memory on huge corpora)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Update the previous knowledge graph for changed sources only")
+    parser.add_argument("--dependency-source", action="append", default=[], metavar="NAME=SOURCE",
+                        help="Clone a dependency (agent-zero, pheromind) from a URL, local path or bare repo")
+    parser.add_argument("--dependency-cache",
+                        help="Directory for dependency install stamps and the shared wheelhouse")
+    parser.add_argument("--dependency-venv",
+                        help="Install requirements into this shared virtualenv")
+    parser.add_argument("--mirror-dir",
+                        help="Directory of local dependency mirrors (<name> or <name>.git) for offline hosts")
+    parser.add_argument("--soul-anchor-cache",
+                        help="Directory for compiled soul anchors (default: workshop/cache/soul_anchors)")
+    parser.add_argument("--batch",
+                        help="Create every person in a directory of soul anchors or a JSON manifest")
+    parser.add_argument("--batch-root", default="batch",
+                        help="Root for shared dependencies and per-person containers of a batch (default: ./batch)")
+    parser.add_argument("--batch-workers", type=int, default=0,
+                        help="Worker processes running batch persons concurrently (0 = one at a time)")
+    parser.add_argument("--check-anchor", nargs="?", const="soul_anchor.txt", metavar="PATH",
+                        help="Parse and validate a soul anchor (default: ./soul_anchor.txt), then exit")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Show the person, paths, dependency sources and phase plan without running or writing anything")
+    parser.add_argument("--log-file", default=DEFAULT_LOG_FILE,
+                        help=f"Protocol log file (default: {DEFAULT_LOG_FILE}; '' for console only)")
+    args = parser.parse_args()
+    for source in args.dependency_source:
+        if "=" not in source:
+            parser.error(f"--dependency-source expects NAME=SOURCE, got: {source}")
+    
+    # Quick commands: no log handlers, no protocol run
+    if args.check_anchor:
+        sys.exit(check_soul_anchor(args.check_anchor))
+    
+    protocol_options = dict(
+        compact_graph=args.compact_graph,
+        extraction_workers=args.extraction_workers,
+        voice_workers=args.voice_workers,
+        rewrite_concurrency=args.rewrite_concurrency,
+        rewrite_cache_dir=args.rewrite_cache,
+        rewrite_client_settings={"endpoint": args.rewrite_endpoint,
+                                 "batch_size": args.rewrite_batch_size,
+                                 "ttl_seconds": args.rewrite_cache_ttl * 3600},
+        incremental_memory=args.incremental,
+        pipeline_memory=args.pipeline_memory,
+        confluence_settings={"similarity_threshold": args.confluence_threshold,
+                             "block_size": args.similarity_block_size},
+        dependency_sources=dict(source.split("=", 1) for source in args.dependency_source),
+        mirror_dir=args.mirror_dir,
+        dependency_cache_dir=args.dependency_cache,
+        dependency_venv=args.dependency_venv,
+        soul_anchor_cache_dir=args.soul_anchor_cache
+    )
+    
+    if args.plan or args.dry_run:
+        try:
+            protocol = UniversalGenesisProtocol(dry_run=True, **protocol_options)
+        except Exception as e:
+            print(f"ERROR: {str(e)}")
+            sys.exit(1)
+        print(protocol.describe_run() if args.dry_run else protocol.plan())
+        sys.exit(0)
+    
+    # Full runs: the event loop is only needed from here on
+    import asyncio
+    configure_logging(args.log_file)
     logger.info("Starting Universal Genesis Protocol")
     
     try:
+        if args.batch:
+            # Many persons, one shared dependency setup
+            from batch_genesis import GenesisBatch, discover_soul_anchors
+            batch = GenesisBatch(discover_soul_anchors(args.batch), args.batch_root,
+                                 workers=args.batch_workers, protocol_options=protocol_options,
+                                 resume=args.resume)
+            report = asyncio.run(batch.run())
+            print(f"{report['succeeded']}/{report['persons']} persons created, "
+                  f"{report['persons_per_hour']:.1f} persons/hour")
+            sys.exit(0 if report["failed"] == 0 else 1)
+        
         # Initialize and execute the protocol
-        protocol = UniversalGenesisProtocol()
-        success = await protocol.execute()
+        protocol = UniversalGenesisProtocol(**protocol_options)
+        
+        success = asyncio.run(protocol.execute(resume=args.resume))
         
         if success:
             logger.info("Universal Genesis Protocol completed successfully!")
@@ -953,5 +2099,28 @@ async def main():
         print(f"ERROR: {str(e)}")
         sys.exit(1)
 
+def check_soul_anchor(path: Union[str, Path]) -> int:
+    """Parse a soul anchor without touching any cache and print a summary; returns an exit code."""
+    path = Path(path)
+    try:
+        with open(path, 'r') as f:
+            content = f.read()
+        data = parse_soul_anchor(content)
+        if not isinstance(data, dict):
+            raise ValueError("top level is not a mapping")
+    except Exception as e:
+        print(f"INVALID: {path}: {str(e)}")
+        return 1
+    
+    anchor = CompiledSoulAnchor.compile(data, content, "")
+    non_negotiables = anchor.get("non_negotiables") or anchor.get("identity", "non_negotiables") or []
+    print(f"OK: {path}")
+    print(f"  Title: {anchor.get('metadata', 'title', default='') or '-'}")
+    print(f"  Designation: {anchor.get('identity', 'designation', default='') or '-'}")
+    print(f"  Sections: {', '.join(key for key in data if key != 'metadata') or '-'}")
+    print(f"  Non-negotiables: {len(non_negotiables)}")
+    print(f"  DPM: {'yes' if anchor.mentions_dpm else 'no'}")
+    return 0
+
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    main()
@@ -0,0 +1,489 @@
+#!/usr/bin/env python3
+"""
+Memory-Mapped Binary Knowledge Graph Format for the Universal Genesis Protocol
+
+knowledge_graph.json has to be parsed in full before any question can be
+answered. This module provides a binary on-disk layout that is opened through
+mmap, so opening is near-instant and a query only touches the pages it needs.
+
+File layout (all integers little-endian, every section 8-byte aligned):
+
+    header            magic, version, counts and section offsets
+    string offsets    (string_count + 1) x u64 offsets into the string heap
+    string heap       UTF-8 bytes of every distinct string / JSON blob
+    node table        node_count x (id, type, universe, source, data, extra) string refs
+    edge table        edge_count x (source, target, type, extra) string refs + f64 strength
+    vertex ids        string refs for edge endpoints that are not nodes
+    id index          vertex_count x (u64 id hash, u32 vertex), sorted by hash
+    out / in CSR      (vertex_count + 1) x u32 offsets + u32 edge positions per direction
+    group table       (kind, label, start, count) for every node type and universe
+    group positions   u32 node positions referenced by the group table
+
+Vertices are every id that appears as a node or an edge endpoint: vertex i
+is node i for i < node_count, and the remaining vertices are edge endpoints
+without a node of their own. String references are indexes into the string
+table; 0xFFFFFFFF marks an absent field. Node data, extra keys, metadata, confluences and contradictions
+are stored as compact JSON blobs and only decoded when they are read.
+
+Usage:
+    python3 graph_binary.py memory/structured/knowledge_graph.json memory/structured/knowledge_graph.kgb
+"""
+
+import os
+import sys
+import json
+import math
+import mmap
+import struct
+import hashlib
+import logging
+import argparse
+from array import array
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Iterator, Tuple, Union
+
+from knowledge_graph import KnowledgeGraphStore, StringTable
+
+logger = logging.getLogger("UniversalGenesisProtocol.GraphBinary")
+
+MAGIC = b"GKGB"
+FORMAT_VERSION = 1
+NO_STRING = 0xFFFFFFFF
+
+GROUP_TYPE = 0
+GROUP_UNIVERSE = 1
+
+# magic, version, reserved, node_count, vertex_count, edge_count, string_count,
+# group_count, metadata ref, confluences ref, contradictions ref, then 12 section offsets
+_HEADER = struct.Struct("<4sHHIIIIIIII" + "Q" * 12)
+_NODE = struct.Struct("<IIIIII")
+_EDGE = struct.Struct("<IIIId")
+_ID_INDEX = struct.Struct("<QI")
+_GROUP = struct.Struct("<IIII")
+_U32 = struct.Struct("<I")
+_U64 = struct.Struct("<Q")
+
+_SECTIONS = (
+    "string_offsets", "string_heap", "nodes", "edges", "vertex_ids", "id_index",
+    "out_offsets", "out_positions", "in_offsets", "in_positions",
+    "groups", "group_positions"
+)
+
+_NODE_FIELDS = ("id", "type", "universe", "source", "data")
+_EDGE_FIELDS = ("source", "target", "type", "strength")
+_COMPACT = (",", ":")
+
+
+def _id_hash(node_id: str) -> int:
+    """Stable 64-bit hash of a node id (Python's hash() is salted per process)."""
+    return int.from_bytes(hashlib.blake2b(node_id.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _build_csr(vertex_count: int, endpoints: array) -> Tuple[array, array]:
+    """Group edge positions by endpoint vertex."""
+    offsets = array('I', [0]) * (vertex_count + 1)
+    for vertex in endpoints:
+        offsets[vertex + 1] += 1
+    for vertex in range(vertex_count):
+        offsets[vertex + 1] += offsets[vertex]
+
+    cursor = array('I', offsets[:-1])
+    positions = array('I', [0]) * len(endpoints)
+    for edge_position, vertex in enumerate(endpoints):
+        positions[cursor[vertex]] = edge_position
+        cursor[vertex] += 1
+    return offsets, positions
+
+
+def write_binary_graph(graph, path: Union[str, Path]) -> Dict[str, int]:
+    """
+    Write any graph exposing iter_nodes/iter_edges/metadata/confluences/contradictions
+    (KnowledgeGraphStore, CompactKnowledgeGraph) to the binary format.
+    """
+    path = Path(path)
+    strings = StringTable()
+
+    def ref(value: Optional[str]) -> int:
+        return NO_STRING if value is None else strings.code(value)
+
+    def blob(value: Any) -> int:
+        return NO_STRING if value is None else strings.code(json.dumps(value, separators=_COMPACT))
+
+    # Node table and groups (node positions double as the first vertices)
+    node_table = bytearray()
+    vertices: Dict[str, int] = {}
+    groups: Dict[Tuple[int, str], List[int]] = {}
+    for position, node in enumerate(graph.iter_nodes()):
+        node_id = node["id"]
+        vertices[node_id] = position
+
+        node_type = node.get("type", "unknown")
+        extra = {key: value for key, value in node.items() if key not in _NODE_FIELDS}
+        universe = node.get("universe")
+        source = node.get("source")
+        # Non-string universe/source values are rare; keep them verbatim with the extras
+        for key, value in (("universe", universe), ("source", source)):
+            if value is not None and not isinstance(value, str):
+                extra[key] = value
+        universe = universe if isinstance(universe, str) else None
+        source = source if isinstance(source, str) else None
+
+        node_table += _NODE.pack(
+            ref(node_id), ref(node_type), ref(universe), ref(source),
+            blob(node.get("data")), blob(extra or None)
+        )
+        groups.setdefault((GROUP_TYPE, node_type), []).append(position)
+        if universe is not None:
+            groups.setdefault((GROUP_UNIVERSE, universe), []).append(position)
+    node_count = len(vertices)
+
+    def vertex(node_id: str) -> int:
+        position = vertices.get(node_id)
+        if position is None:
+            position = vertices[node_id] = len(vertices)
+            vertex_ids.append(ref(node_id))
+        return position
+
+    # Edge table and adjacency
+    edge_table = bytearray()
+    vertex_ids = array('I')
+    sources = array('I')
+    targets = array('I')
+    for edge in graph.iter_edges():
+        extra = {key: value for key, value in edge.items() if key not in _EDGE_FIELDS}
+        strength = edge.get("strength")
+        if not isinstance(strength, float) or math.isnan(strength):
+            # Ints, NaN and non-numeric strengths keep their exact value in the extras
+            if "strength" in edge:
+                extra["strength"] = strength
+            strength = math.nan
+        edge_table += _EDGE.pack(
+            ref(edge["source"]), ref(edge["target"]), ref(edge.get("type", "unknown")),
+            blob(extra or None), strength
+        )
+        sources.append(vertex(edge["source"]))
+        targets.append(vertex(edge["target"]))
+    edge_count = len(sources)
+    vertex_count = len(vertices)
+    out_offsets, out_positions = _build_csr(vertex_count, sources)
+    in_offsets, in_positions = _build_csr(vertex_count, targets)
+    id_index = sorted((_id_hash(vertex_id), position) for vertex_id, position in vertices.items())
+
+    group_table = bytearray()
+    group_positions = array('I')
+    for (kind, label), members in groups.items():
+        group_table += _GROUP.pack(kind, ref(label), len(group_positions), len(members))
+        group_positions.extend(members)
+
+    metadata_ref = blob(graph.metadata)
+    confluences_ref = blob(list(graph.confluences))
+    contradictions_ref = blob(list(graph.contradictions))
+
+    # String table is complete - encode the heap
+    string_offsets = array('Q', [0])
+    heap = bytearray()
+    for code in range(len(strings)):
+        heap += strings.string(code).encode("utf-8")
+        string_offsets.append(len(heap))
+
+    def to_le(values: array) -> bytes:
+        if sys.byteorder != "little":
+            values = array(values.typecode, values)
+            values.byteswap()
+        return values.tobytes()
+
+    sections = [
+        to_le(string_offsets), bytes(heap), bytes(node_table), bytes(edge_table), to_le(vertex_ids),
+        b"".join(_ID_INDEX.pack(h, p) for h, p in id_index),
+        to_le(out_offsets), to_le(out_positions), to_le(in_offsets), to_le(in_positions),
+        bytes(group_table), to_le(group_positions)
+    ]
+
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(b"\0" * _HEADER.size)
+        offsets = []
+        for section in sections:
+            f.write(b"\0" * (-f.tell() % 8))
+            offsets.append(f.tell())
+            f.write(section)
+        f.seek(0)
+        f.write(_HEADER.pack(
+            MAGIC, FORMAT_VERSION, 0, node_count, vertex_count, edge_count, len(strings), len(groups),
+            metadata_ref, confluences_ref, contradictions_ref, *offsets
+        ))
+    os.replace(tmp_path, path)
+
+    return {"nodes": node_count, "edges": edge_count, "strings": len(strings)}
+
+
+def convert_json_to_binary(json_path: Union[str, Path], binary_path: Union[str, Path]) -> Dict[str, int]:
+    """Convert knowledge_graph.json output of _phase_memory_construction to the binary format."""
+    from graph_stream import read_knowledge_graph
+
+    counts = write_binary_graph(read_knowledge_graph(json_path), binary_path)
+    logger.info(f"Converted {json_path} -> {binary_path}: {counts['nodes']} nodes, {counts['edges']} edges")
+    return counts
+
+
+class BinaryKnowledgeGraph:
+    """
+    Read-only, memory-mapped view over a binary knowledge graph file.
+
+    Opening only reads the header; node, edge and string pages are faulted in
+    by the operating system as queries touch them. Provides the read side of
+    the KnowledgeGraphStore API.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"Empty binary knowledge graph file: {self.path}")
+
+        if len(self._mm) < _HEADER.size:
+            self.close()
+            raise ValueError(f"Truncated binary knowledge graph file: {self.path}")
+        header = _HEADER.unpack_from(self._mm, 0)
+        if header[0] != MAGIC:
+            self.close()
+            raise ValueError(f"Not a binary knowledge graph file: {self.path}")
+        if header[1] != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"Unsupported binary knowledge graph version {header[1]} in {self.path}")
+
+        (_, _, _, self.node_count, self.vertex_count, self.edge_count, self.string_count,
+         self.group_count, self._metadata_ref, self._confluences_ref, self._contradictions_ref) = header[:11]
+        self._offsets = dict(zip(_SECTIONS, header[11:]))
+        self._groups = None
+        if self._expected_size() > len(self._mm):
+            self.close()
+            raise ValueError(f"Truncated binary knowledge graph file: {self.path}")
+
+    def _expected_size(self) -> int:
+        # group_positions is the last section; it ends after the last group's members
+        groups_end = self._offsets["groups"] + self.group_count * _GROUP.size
+        table_end = max(max(self._offsets.values()), groups_end)
+        if table_end > len(self._mm) or not self.group_count:
+            return table_end
+        _, _, start, count = _GROUP.unpack_from(self._mm, groups_end - _GROUP.size)
+        return self._offsets["group_positions"] + (start + count) * 4
+
+    def __enter__(self) -> "BinaryKnowledgeGraph":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.node_count
+
+    def __contains__(self, node_id: str) -> bool:
+        return self.has_node(node_id)
+
+    def close(self):
+        """Release the memory map and file handle."""
+        if getattr(self, "_mm", None) is not None:
+            self._mm.close()
+            self._mm = None
+        self._file.close()
+
+    # String heap
+
+    def _string(self, code: int) -> Optional[str]:
+        if code == NO_STRING:
+            return None
+        start, end = struct.unpack_from("<QQ", self._mm, self._offsets["string_offsets"] + code * 8)
+        heap = self._offsets["string_heap"]
+        return self._mm[heap + start:heap + end].decode("utf-8")
+
+    def _blob(self, code: int) -> Any:
+        text = self._string(code)
+        return None if text is None else json.loads(text)
+
+    @property
+    def metadata(self) -> Dict:
+        return self._blob(self._metadata_ref) or {}
+
+    @property
+    def confluences(self) -> List[Dict]:
+        return self._blob(self._confluences_ref) or []
+
+    @property
+    def contradictions(self) -> List[Dict]:
+        return self._blob(self._contradictions_ref) or []
+
+    # Nodes
+
+    def _node_refs(self, position: int) -> Tuple[int, ...]:
+        return _NODE.unpack_from(self._mm, self._offsets["nodes"] + position * _NODE.size)
+
+    def node_at(self, position: int) -> Dict:
+        """Decode the node stored at the given position."""
+        id_ref, type_ref, universe_ref, source_ref, data_ref, extra_ref = self._node_refs(position)
+        node = {"id": self._string(id_ref), "type": self._string(type_ref)}
+        if data_ref != NO_STRING:
+            node["data"] = self._blob(data_ref)
+        if source_ref != NO_STRING:
+            node["source"] = self._string(source_ref)
+        if universe_ref != NO_STRING:
+            node["universe"] = self._string(universe_ref)
+        if extra_ref != NO_STRING:
+            node.update(self._blob(extra_ref))
+        return node
+
+    def _vertex_id(self, vertex: int) -> str:
+        if vertex < self.node_count:
+            return self._string(self._node_refs(vertex)[0])
+        return self._string(_U32.unpack_from(self._mm, self._offsets["vertex_ids"] + (vertex - self.node_count) * 4)[0])
+
+    def _find_vertex(self, node_id: str) -> int:
+        """Binary search the id index; returns -1 if the id is neither a node nor an edge endpoint."""
+        target = _id_hash(node_id)
+        base = self._offsets["id_index"]
+        lo, hi = 0, self.vertex_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if _U64.unpack_from(self._mm, base + mid * _ID_INDEX.size)[0] < target:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        # Walk every entry sharing the hash to rule out collisions
+        while lo < self.vertex_count:
+            entry_hash, vertex = _ID_INDEX.unpack_from(self._mm, base + lo * _ID_INDEX.size)
+            if entry_hash != target:
+                break
+            if self._vertex_id(vertex) == node_id:
+                return vertex
+            lo += 1
+        return -1
+
+    def has_node(self, node_id: str) -> bool:
+        """Check whether a node exists in O(log n) page touches."""
+        return 0 <= self._find_vertex(node_id) < self.node_count
+
+    def get_node(self, node_id: str) -> Optional[Dict]:
+        """Look up a node by id."""
+        vertex = self._find_vertex(node_id)
+        return self.node_at(vertex) if 0 <= vertex < self.node_count else None
+
+    def iter_nodes(self) -> Iterator[Dict]:
+        """Iterate over all nodes in their original order."""
+        for position in range(self.node_count):
+            yield self.node_at(position)
+
+    # Groups
+
+    def _load_groups(self) -> Dict[Tuple[int, str], Tuple[int, int]]:
+        if self._groups is None:
+            self._groups = {}
+            base = self._offsets["groups"]
+            for index in range(self.group_count):
+                kind, label_ref, start, count = _GROUP.unpack_from(self._mm, base + index * _GROUP.size)
+                self._groups[(kind, self._string(label_ref))] = (start, count)
+        return self._groups
+
+    def _group_nodes(self, kind: int, label: str) -> List[Dict]:
+        start, count = self._load_groups().get((kind, label), (0, 0))
+        base = self._offsets["group_positions"] + start * 4
+        return [self.node_at(_U32.unpack_from(self._mm, base + i * 4)[0]) for i in range(count)]
+
+    def nodes_of_type(self, node_type: str) -> List[Dict]:
+        """Return all nodes of the given type, in original order."""
+        return self._group_nodes(GROUP_TYPE, node_type)
+
+    def nodes_in_universe(self, universe: str) -> List[Dict]:
+        """Return all nodes belonging to the given universe, in original order."""
+        return self._group_nodes(GROUP_UNIVERSE, universe)
+
+    def node_types(self) -> List[str]:
+        """Return every node type present in the graph."""
+        return [label for kind, label in self._load_groups() if kind == GROUP_TYPE]
+
+    def universes(self) -> List[str]:
+        """Return every universe that has at least one node."""
+        return [label for kind, label in self._load_groups() if kind == GROUP_UNIVERSE]
+
+    # Edges
+
+    def edge_at(self, position: int) -> Dict:
+        """Decode the edge stored at the given position."""
+        source_ref, target_ref, type_ref, extra_ref, strength = _EDGE.unpack_from(
+            self._mm, self._offsets["edges"] + position * _EDGE.size
+        )
+        edge = {
+            "source": self._string(source_ref),
+            "target": self._string(target_ref),
+            "type": self._string(type_ref)
+        }
+        if not math.isnan(strength):
+            edge["strength"] = strength
+        if extra_ref != NO_STRING:
+            edge.update(self._blob(extra_ref))
+        return edge
+
+    def _adjacent(self, node_id: str, direction: str) -> List[int]:
+        vertex = self._find_vertex(node_id)
+        if vertex < 0:
+            return []
+        start, end = struct.unpack_from("<II", self._mm, self._offsets[f"{direction}_offsets"] + vertex * 4)
+        base = self._offsets[f"{direction}_positions"]
+        return [_U32.unpack_from(self._mm, base + i * 4)[0] for i in range(start, end)]
+
+    def out_edges(self, node_id: str) -> List[Dict]:
+        """Return all edges whose source is the given node."""
+        return [self.edge_at(position) for position in self._adjacent(node_id, "out")]
+
+    def in_edges(self, node_id: str) -> List[Dict]:
+        """Return all edges whose target is the given node."""
+        return [self.edge_at(position) for position in self._adjacent(node_id, "in")]
+
+    def neighbors(self, node_id: str) -> List[str]:
+        """Return the ids of all nodes adjacent to the given node (either direction)."""
+        seen = {}
+        for edge in self.out_edges(node_id):
+            seen.setdefault(edge["target"], None)
+        for edge in self.in_edges(node_id):
+            seen.setdefault(edge["source"], None)
+        return list(seen)
+
+    def iter_edges(self) -> Iterator[Dict]:
+        """Iterate over all edges in their original order."""
+        for position in range(self.edge_count):
+            yield self.edge_at(position)
+
+    # Conversion
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Render the whole graph in the knowledge_graph.json shape."""
+        return {
+            "nodes": list(self.iter_nodes()),
+            "edges": list(self.iter_edges()),
+            "confluences": self.confluences,
+            "contradictions": self.contradictions,
+            "metadata": self.metadata
+        }
+
+    def to_store(self) -> KnowledgeGraphStore:
+        """Load the whole graph into a dict-backed KnowledgeGraphStore."""
+        return KnowledgeGraphStore.from_dict(self.to_dict())
+
+
+def main():
+    """Command-line converter from knowledge_graph.json to the binary format."""
+    parser = argparse.ArgumentParser(description="Convert knowledge_graph.json to the memory-mapped binary format")
+    parser.add_argument("json_path", help="Path to knowledge_graph.json")
+    parser.add_argument("binary_path", nargs="?", help="Output path (defaults to <json_path>.kgb)")
+    args = parser.parse_args()
+
+    binary_path = args.binary_path or str(Path(args.json_path).with_suffix(".kgb"))
+    counts = convert_json_to_binary(args.json_path, binary_path)
+    print(f"Wrote {binary_path}: {counts['nodes']} nodes, {counts['edges']} edges, {counts['strings']} strings")
+
+
+if __name__ == "__main__":
+    main()
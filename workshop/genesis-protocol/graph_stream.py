@@ -0,0 +1,185 @@
+"""
+Streaming Knowledge Graph Serialization for the Universal Genesis Protocol
+
+Writes knowledge_graph.json one record at a time instead of building the whole
+document (and an indented copy of it) in memory. The output is still a single
+valid JSON document in the existing shape, so json.load() consumers keep
+working, but it is laid out in sections with exactly one compact record per
+line:
+
+    {"metadata":{...},
+    "nodes":[
+    {...},
+    {...}
+    ],
+    "edges":[
+    ...
+    ],
+    "confluences":[
+    ],
+    "contradictions":[
+    ]}
+
+This layout lets the matching reader stream records back line by line with
+flat memory. Files that were not written by KnowledgeGraphWriter (for example
+legacy indent=2 output) are still readable through a json.load() fallback.
+"""
+
+import os
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Any, Iterable, Iterator, Optional, Tuple, Union
+
+from knowledge_graph import KnowledgeGraphStore
+
+logger = logging.getLogger("UniversalGenesisProtocol.GraphStream")
+
+# Sections in the order they appear in the document
+GRAPH_SECTIONS = ("nodes", "edges", "confluences", "contradictions")
+
+_METADATA_PREFIX = '{"metadata":'
+_SEPARATORS = (",", ":")
+
+
+class KnowledgeGraphWriter:
+    """Sectioned, line-oriented streaming writer for knowledge_graph.json."""
+
+    def __init__(self, path: Union[str, Path], metadata: Optional[Dict] = None):
+        self.path = Path(path)
+        self._tmp_path = self.path.with_name(self.path.name + ".tmp")
+        self._file = open(self._tmp_path, 'w', encoding='utf-8')
+        self._section_index = -1
+        self._records_in_section = 0
+        self.record_counts = {section: 0 for section in GRAPH_SECTIONS}
+        self._closed = False
+
+        # Metadata always comes first so readers know what they are loading
+        self._file.write(_METADATA_PREFIX + json.dumps(metadata or {}, separators=_SEPARATORS) + ",\n")
+
+    def __enter__(self) -> "KnowledgeGraphWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def _advance_to(self, section: str):
+        """Close any open sections up to (but not including) the requested one."""
+        if section not in GRAPH_SECTIONS:
+            raise ValueError(f"Unknown knowledge graph section: {section}")
+
+        target_index = GRAPH_SECTIONS.index(section)
+        if target_index < self._section_index:
+            raise ValueError(
+                f"Cannot write '{section}' after '{GRAPH_SECTIONS[self._section_index]}' - "
+                "sections must be written in order: " + ", ".join(GRAPH_SECTIONS)
+            )
+
+        while self._section_index < target_index:
+            if self._section_index >= 0:
+                self._file.write("\n],\n")
+            self._section_index += 1
+            self._records_in_section = 0
+            self._file.write(f'"{GRAPH_SECTIONS[self._section_index]}":[')
+
+    def write(self, section: str, record: Dict):
+        """Write a single record to the given section."""
+        self._advance_to(section)
+        self._file.write(",\n" if self._records_in_section else "\n")
+        self._file.write(json.dumps(record, separators=_SEPARATORS))
+        self._records_in_section += 1
+        self.record_counts[section] += 1
+
+    def write_many(self, section: str, records: Iterable[Dict]):
+        """Write every record from an iterable to the given section."""
+        for record in records:
+            self.write(section, record)
+
+    def close(self):
+        """Finish the document and atomically move it into place."""
+        if self._closed:
+            return
+        self._advance_to(GRAPH_SECTIONS[-1])
+        self._file.write("\n]}\n")
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+        self._closed = True
+
+    def abort(self):
+        """Discard a partially written document."""
+        if self._closed:
+            return
+        self._file.close()
+        self._tmp_path.unlink(missing_ok=True)
+        self._closed = True
+
+
+def write_knowledge_graph(store: KnowledgeGraphStore, path: Union[str, Path]) -> Dict[str, int]:
+    """Stream a KnowledgeGraphStore to disk and return the per-section record counts."""
+    with KnowledgeGraphWriter(path, metadata=store.metadata) as writer:
+        writer.write_many("nodes", store.iter_nodes())
+        writer.write_many("edges", store.iter_edges())
+        writer.write_many("confluences", store.confluences)
+        writer.write_many("contradictions", store.contradictions)
+    return writer.record_counts
+
+
+def iter_knowledge_graph(path: Union[str, Path]) -> Iterator[Tuple[str, Any]]:
+    """
+    Stream (section, record) pairs from a knowledge graph file.
+
+    The first pair is always ("metadata", {...}). Files written by
+    KnowledgeGraphWriter are read one line at a time; any other JSON document
+    in the knowledge_graph.json shape is loaded whole and then replayed.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        first_line = f.readline()
+
+        if not (first_line.startswith(_METADATA_PREFIX) and first_line.rstrip().endswith(",")):
+            # Not a streamed file - fall back to a full parse
+            f.seek(0)
+            knowledge_graph = json.load(f)
+            yield "metadata", knowledge_graph.get("metadata", {})
+            for section in GRAPH_SECTIONS:
+                for record in knowledge_graph.get(section, []):
+                    yield section, record
+            return
+
+        yield "metadata", json.loads(first_line.rstrip()[len(_METADATA_PREFIX):-1])
+
+        section = None
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith('"') and line.endswith(":["):
+                section = line[1:-3]
+                if section not in GRAPH_SECTIONS:
+                    raise ValueError(f"Unknown knowledge graph section in {path}: {section}")
+            elif line in ("]", "],", "]}"):
+                section = None
+            elif section is None:
+                raise ValueError(f"Malformed knowledge graph stream in {path}: record outside a section")
+            else:
+                yield section, json.loads(line[:-1] if line.endswith(",") else line)
+
+
+def read_knowledge_graph(path: Union[str, Path]) -> KnowledgeGraphStore:
+    """Load a knowledge graph file into an indexed KnowledgeGraphStore."""
+    store = KnowledgeGraphStore()
+    for section, record in iter_knowledge_graph(path):
+        if section == "metadata":
+            store.metadata = record
+        elif section == "nodes":
+            if not store.add_node(record):
+                logger.warning(f"Duplicate node id ignored while loading graph: {record['id']}")
+        elif section == "edges":
+            store.add_edge(record)
+        elif section == "confluences":
+            store.confluences.append(record)
+        else:
+            store.add_contradiction(record)
+    return store
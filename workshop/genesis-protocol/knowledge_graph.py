@@ -0,0 +1,585 @@
+"""
+Knowledge Graph Store for the Universal Genesis Protocol
+
+Indexed in-memory storage for the RAGGraph structure built during memory
+construction. Nodes are held in an id-keyed index with secondary indexes by
+node type and universe, and edges are tracked in per-node adjacency lists so
+that graph construction and lookups stay linear in the size of the corpus.
+
+CompactKnowledgeGraph offers the same API with a much smaller footprint for
+large corpora: nodes are __slots__ records with interned type, universe and
+source strings, and edges live in parallel array columns of interned codes.
+
+Both stores can always be rendered back into the original knowledge_graph.json
+shape ({"nodes", "edges", "confluences", "contradictions", "metadata"}) so
+every downstream consumer keeps working unchanged.
+"""
+
+import sys
+import math
+import logging
+from array import array
+from collections import defaultdict
+from typing import Dict, List, Any, Optional, Iterator
+
+logger = logging.getLogger("UniversalGenesisProtocol.KnowledgeGraph")
+
+
+class KnowledgeGraphStore:
+    """
+    Indexed in-memory knowledge graph with id, type, universe and adjacency indexes.
+
+    Records can optionally be attributed to an origin (the source_id that
+    produced them) so that incremental memory construction can replace or
+    remove a single source's contribution without rebuilding the graph.
+    Removed edges leave tombstones until compact_edges() is called.
+    """
+
+    def __init__(self, metadata: Optional[Dict] = None):
+        self.metadata = dict(metadata or {})
+        self.confluences: List[Dict] = []
+        self.contradictions: List[Dict] = []
+
+        # Primary storage (dicts preserve insertion order for stable output)
+        self._nodes: Dict[str, Dict] = {}
+        self._edges: List[Optional[Dict]] = []
+        self._live_edges = 0
+
+        # Secondary indexes (dicts used as ordered sets for O(1) removal)
+        self._nodes_by_type: Dict[str, Dict[str, None]] = defaultdict(dict)
+        self._nodes_by_universe: Dict[str, Dict[str, None]] = defaultdict(dict)
+        self._outgoing: Dict[str, Dict[int, None]] = defaultdict(dict)
+        self._incoming: Dict[str, Dict[int, None]] = defaultdict(dict)
+
+        # Origin attribution: origin -> {"nodes": [ids], "edges": [positions], "contradictions": [records]}
+        self._origins: Dict[str, Dict[str, List]] = {}
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, node_id: str) -> bool:
+        return node_id in self._nodes
+
+    @property
+    def node_count(self) -> int:
+        return len(self._nodes)
+
+    @property
+    def edge_count(self) -> int:
+        return self._live_edges
+
+    def _origin_records(self, origin: str) -> Dict[str, List]:
+        return self._origins.setdefault(origin, {"nodes": [], "edges": [], "contradictions": []})
+
+    def add_node(self, node: Dict, origin: Optional[str] = None) -> bool:
+        """Add a node to the graph. Returns False if a node with the same id already exists."""
+        node_id = node["id"]
+        if node_id in self._nodes:
+            return False
+
+        self._nodes[node_id] = node
+        self._nodes_by_type[node.get("type", "unknown")][node_id] = None
+        if "universe" in node:
+            self._nodes_by_universe[node["universe"]][node_id] = None
+        if origin is not None:
+            self._origin_records(origin)["nodes"].append(node_id)
+        return True
+
+    def add_edge(self, edge: Dict, origin: Optional[str] = None) -> int:
+        """Add an edge to the graph and return its position in the edge table."""
+        position = len(self._edges)
+        self._edges.append(edge)
+        self._live_edges += 1
+        self._outgoing[edge["source"]][position] = None
+        self._incoming[edge["target"]][position] = None
+        if origin is not None:
+            self._origin_records(origin)["edges"].append(position)
+        return position
+
+    def add_contradiction(self, contradiction: Dict, origin: Optional[str] = None):
+        """Record a contradiction between two or more nodes."""
+        self.contradictions.append(contradiction)
+        if origin is not None:
+            self._origin_records(origin)["contradictions"].append(contradiction)
+
+    def remove_node(self, node_id: str, remove_edges: bool = False) -> bool:
+        """Remove a node, optionally with its incident edges. Returns False if the node does not exist."""
+        node = self._nodes.pop(node_id, None)
+        if node is None:
+            return False
+        if remove_edges:
+            for position in list(self._outgoing.get(node_id, {})) + list(self._incoming.get(node_id, {})):
+                self.remove_edge(position)
+        self._nodes_by_type[node.get("type", "unknown")].pop(node_id, None)
+        if "universe" in node:
+            self._nodes_by_universe[node["universe"]].pop(node_id, None)
+            if not self._nodes_by_universe[node["universe"]]:
+                del self._nodes_by_universe[node["universe"]]
+        return True
+
+    def remove_edge(self, position: int) -> bool:
+        """Remove the edge at the given position. Returns False if it was already removed."""
+        edge = self._edges[position]
+        if edge is None:
+            return False
+        self._edges[position] = None
+        self._live_edges -= 1
+        self._outgoing[edge["source"]].pop(position, None)
+        self._incoming[edge["target"]].pop(position, None)
+        return True
+
+    def origins(self) -> List[str]:
+        """Return every origin with attributed records."""
+        return list(self._origins)
+
+    def origin_nodes(self, origin: str) -> List[Dict]:
+        """Return the live nodes attributed to an origin."""
+        records = self._origins.get(origin)
+        if records is None:
+            return []
+        return [self._nodes[node_id] for node_id in records["nodes"] if node_id in self._nodes]
+
+    def remove_origin(self, origin: str) -> Dict[str, int]:
+        """Remove every node, edge and contradiction attributed to an origin."""
+        records = self._origins.pop(origin, None)
+        if records is None:
+            return {"nodes": 0, "edges": 0, "contradictions": 0}
+
+        removed_nodes = sum(1 for node_id in records["nodes"] if self.remove_node(node_id))
+        removed_edges = sum(1 for position in records["edges"] if self.remove_edge(position))
+        if records["contradictions"]:
+            stale = {id(record) for record in records["contradictions"]}
+            self.contradictions = [record for record in self.contradictions if id(record) not in stale]
+
+        return {"nodes": removed_nodes, "edges": removed_edges, "contradictions": len(records["contradictions"])}
+
+    def compact_edges(self):
+        """Drop edge tombstones and renumber edge positions (adjacency and origins follow)."""
+        if self._live_edges == len(self._edges):
+            return
+
+        remap: Dict[int, int] = {}
+        edges: List[Optional[Dict]] = []
+        for position, edge in enumerate(self._edges):
+            if edge is not None:
+                remap[position] = len(edges)
+                edges.append(edge)
+
+        self._edges = edges
+        self._outgoing = defaultdict(dict)
+        self._incoming = defaultdict(dict)
+        for position, edge in enumerate(edges):
+            self._outgoing[edge["source"]][position] = None
+            self._incoming[edge["target"]][position] = None
+        for records in self._origins.values():
+            records["edges"] = [remap[position] for position in records["edges"] if position in remap]
+
+    def origin_map(self) -> Dict[str, Dict[str, List]]:
+        """
+        Describe origin attribution in a JSON-serializable form.
+
+        Edge and contradiction references are positions in the to_dict() output,
+        so the map can be persisted next to knowledge_graph.json and reattached
+        with attach_origins() after the graph is loaded again.
+        """
+        self.compact_edges()
+        contradiction_positions = {id(record): position for position, record in enumerate(self.contradictions)}
+        return {
+            origin: {
+                "nodes": [node_id for node_id in records["nodes"] if node_id in self._nodes],
+                "edges": list(records["edges"]),
+                "contradictions": [contradiction_positions[id(record)] for record in records["contradictions"]
+                                   if id(record) in contradiction_positions]
+            }
+            for origin, records in self._origins.items()
+        }
+
+    def attach_origins(self, origin_map: Dict[str, Dict[str, List]]):
+        """Restore origin attribution produced by origin_map() for a freshly loaded graph."""
+        for origin, records in origin_map.items():
+            self._origins[origin] = {
+                "nodes": list(records.get("nodes", [])),
+                "edges": list(records.get("edges", [])),
+                "contradictions": [self.contradictions[position] for position in records.get("contradictions", [])]
+            }
+
+    def has_node(self, node_id: str) -> bool:
+        """Check whether a node exists in O(1)."""
+        return node_id in self._nodes
+
+    def get_node(self, node_id: str) -> Optional[Dict]:
+        """Look up a node by id in O(1)."""
+        return self._nodes.get(node_id)
+
+    def nodes_of_type(self, node_type: str) -> List[Dict]:
+        """Return all nodes of the given type, in insertion order."""
+        return [self._nodes[node_id] for node_id in self._nodes_by_type.get(node_type, {})]
+
+    def nodes_in_universe(self, universe: str) -> List[Dict]:
+        """Return all nodes belonging to the given universe, in insertion order."""
+        return [self._nodes[node_id] for node_id in self._nodes_by_universe.get(universe, {})]
+
+    def node_types(self) -> List[str]:
+        """Return every node type present in the graph."""
+        return [node_type for node_type, node_ids in self._nodes_by_type.items() if node_ids]
+
+    def universes(self) -> List[str]:
+        """Return every universe that has at least one node."""
+        return list(self._nodes_by_universe)
+
+    def out_edges(self, node_id: str) -> List[Dict]:
+        """Return all edges whose source is the given node."""
+        return [self._edges[position] for position in self._outgoing.get(node_id, {})]
+
+    def in_edges(self, node_id: str) -> List[Dict]:
+        """Return all edges whose target is the given node."""
+        return [self._edges[position] for position in self._incoming.get(node_id, {})]
+
+    def neighbors(self, node_id: str) -> List[str]:
+        """Return the ids of all nodes adjacent to the given node (either direction)."""
+        seen = {}
+        for edge in self.out_edges(node_id):
+            seen.setdefault(edge["target"], None)
+        for edge in self.in_edges(node_id):
+            seen.setdefault(edge["source"], None)
+        return list(seen)
+
+    def iter_nodes(self) -> Iterator[Dict]:
+        """Iterate over all nodes in insertion order."""
+        return iter(self._nodes.values())
+
+    def iter_edges(self) -> Iterator[Dict]:
+        """Iterate over all edges in insertion order."""
+        return (edge for edge in self._edges if edge is not None)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Render the store in the knowledge_graph.json shape."""
+        return {
+            "nodes": list(self._nodes.values()),
+            "edges": list(self.iter_edges()),
+            "confluences": self.confluences,
+            "contradictions": self.contradictions,
+            "metadata": self.metadata
+        }
+
+    @classmethod
+    def from_dict(cls, knowledge_graph: Dict[str, Any]) -> "KnowledgeGraphStore":
+        """Build an indexed store from a knowledge_graph.json-shaped dict."""
+        store = cls(metadata=knowledge_graph.get("metadata", {}))
+        for node in knowledge_graph.get("nodes", []):
+            if not store.add_node(node):
+                logger.warning(f"Duplicate node id ignored while loading graph: {node['id']}")
+        for edge in knowledge_graph.get("edges", []):
+            store.add_edge(edge)
+        store.confluences = list(knowledge_graph.get("confluences", []))
+        store.contradictions = list(knowledge_graph.get("contradictions", []))
+        return store
+
+
+class StringTable:
+    """Bidirectional string <-> integer code table used to intern repeated labels."""
+
+    __slots__ = ("_codes", "_strings")
+
+    def __init__(self):
+        self._codes: Dict[str, int] = {}
+        self._strings: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    def code(self, value: str) -> int:
+        """Return the code for a string, assigning a new one if needed."""
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self._strings)
+            value = sys.intern(value)
+            self._codes[value] = code
+            self._strings.append(value)
+        return code
+
+    def find(self, value: str) -> Optional[int]:
+        """Return the code for a string without assigning one."""
+        return self._codes.get(value)
+
+    def string(self, code: int) -> str:
+        """Return the string for a code."""
+        return self._strings[code]
+
+
+class GraphNode:
+    """Compact node record. Absent optional fields are stored as None."""
+
+    __slots__ = ("id", "type", "universe", "source", "data", "extra")
+
+    # Keys with dedicated slots; anything else is kept in `extra`
+    FIELDS = ("id", "type", "universe", "source", "data")
+
+    def __init__(self, id: str, type: str, universe: Optional[str] = None,
+                 source: Optional[str] = None, data: Any = None, extra: Optional[Dict] = None):
+        self.id = id
+        self.type = type
+        self.universe = universe
+        self.source = source
+        self.data = data
+        self.extra = extra
+
+    @classmethod
+    def from_dict(cls, node: Dict) -> "GraphNode":
+        """Build a compact record from a knowledge_graph.json node dict."""
+        extra = {key: value for key, value in node.items() if key not in cls.FIELDS} or None
+        universe = node.get("universe")
+        source = node.get("source")
+        return cls(
+            id=node["id"],
+            type=sys.intern(node.get("type", "unknown")),
+            universe=sys.intern(universe) if isinstance(universe, str) else universe,
+            source=sys.intern(source) if isinstance(source, str) else source,
+            data=node.get("data"),
+            extra=extra
+        )
+
+    def to_dict(self) -> Dict:
+        """Render the record in the knowledge_graph.json node shape."""
+        node = {"id": self.id, "type": self.type}
+        if self.data is not None:
+            node["data"] = self.data
+        if self.source is not None:
+            node["source"] = self.source
+        if self.universe is not None:
+            node["universe"] = self.universe
+        if self.extra:
+            node.update(self.extra)
+        return node
+
+
+class CompactKnowledgeGraph:
+    """
+    Memory-compact knowledge graph with the same API as KnowledgeGraphStore.
+
+    Edges are stored column-wise in typed arrays (source code, target code,
+    type code, strength) instead of one dict per edge. Adjacency is built
+    lazily as a CSR index the first time it is queried, so no per-node lists
+    are allocated during construction. Nodes and edges returned by the query
+    methods are freshly rendered dicts; mutate the graph through add_* only.
+    The graph is append-only: origins are accepted for API compatibility but
+    not tracked, so incremental updates need a KnowledgeGraphStore.
+    """
+
+    # Edge keys with dedicated columns; anything else is kept in a sparse side table
+    EDGE_FIELDS = ("source", "target", "type", "strength")
+
+    def __init__(self, metadata: Optional[Dict] = None):
+        self.metadata = dict(metadata or {})
+        self.confluences: List[Dict] = []
+        self.contradictions: List[Dict] = []
+
+        self._ids = StringTable()
+        self._labels = StringTable()
+
+        # Nodes: records plus id code -> node position (-1 for edge-only ids)
+        self._nodes: List[GraphNode] = []
+        self._position_by_code = array('i')
+        self._nodes_by_type: Dict[str, array] = {}
+        self._nodes_by_universe: Dict[str, array] = {}
+
+        # Edges: parallel columns
+        self._edge_sources = array('I')
+        self._edge_targets = array('I')
+        self._edge_types = array('I')
+        self._edge_strengths = array('d')
+        self._edge_extras: Dict[int, Dict] = {}
+
+        # Lazily built CSR adjacency: (offsets, edge positions) per direction
+        self._outgoing_csr = None
+        self._incoming_csr = None
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, node_id: str) -> bool:
+        return self.has_node(node_id)
+
+    @property
+    def node_count(self) -> int:
+        return len(self._nodes)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self._edge_sources)
+
+    def _id_code(self, node_id: str) -> int:
+        code = self._ids.code(node_id)
+        while len(self._position_by_code) <= code:
+            self._position_by_code.append(-1)
+        return code
+
+    def add_node(self, node: Dict, origin: Optional[str] = None) -> bool:
+        """Add a node to the graph. Returns False if a node with the same id already exists."""
+        code = self._id_code(node["id"])
+        if self._position_by_code[code] >= 0:
+            return False
+
+        record = GraphNode.from_dict(node)
+        record.id = self._ids.string(code)
+        position = len(self._nodes)
+        self._nodes.append(record)
+        self._position_by_code[code] = position
+
+        self._nodes_by_type.setdefault(record.type, array('I')).append(position)
+        if record.universe is not None:
+            self._nodes_by_universe.setdefault(record.universe, array('I')).append(position)
+        return True
+
+    def add_edge(self, edge: Dict, origin: Optional[str] = None) -> int:
+        """Add an edge to the graph and return its position in the edge table."""
+        position = len(self._edge_sources)
+        self._edge_sources.append(self._id_code(edge["source"]))
+        self._edge_targets.append(self._id_code(edge["target"]))
+        self._edge_types.append(self._labels.code(edge.get("type", "unknown")))
+        extra = {key: value for key, value in edge.items() if key not in self.EDGE_FIELDS}
+        strength = edge.get("strength")
+        if isinstance(strength, float) and not math.isnan(strength):
+            self._edge_strengths.append(strength)
+        else:
+            # Ints, NaN and non-numeric strengths keep their exact value in the extras
+            self._edge_strengths.append(math.nan)
+            if "strength" in edge:
+                extra["strength"] = strength
+        if extra:
+            self._edge_extras[position] = extra
+
+        self._outgoing_csr = None
+        self._incoming_csr = None
+        return position
+
+    def add_contradiction(self, contradiction: Dict, origin: Optional[str] = None):
+        """Record a contradiction between two or more nodes."""
+        self.contradictions.append(contradiction)
+
+    def has_node(self, node_id: str) -> bool:
+        """Check whether a node exists in O(1)."""
+        code = self._ids.find(node_id)
+        return code is not None and self._position_by_code[code] >= 0
+
+    def get_node(self, node_id: str) -> Optional[Dict]:
+        """Look up a node by id in O(1)."""
+        code = self._ids.find(node_id)
+        if code is None or self._position_by_code[code] < 0:
+            return None
+        return self._nodes[self._position_by_code[code]].to_dict()
+
+    def nodes_of_type(self, node_type: str) -> List[Dict]:
+        """Return all nodes of the given type, in insertion order."""
+        return [self._nodes[position].to_dict() for position in self._nodes_by_type.get(node_type, ())]
+
+    def nodes_in_universe(self, universe: str) -> List[Dict]:
+        """Return all nodes belonging to the given universe, in insertion order."""
+        return [self._nodes[position].to_dict() for position in self._nodes_by_universe.get(universe, ())]
+
+    def node_types(self) -> List[str]:
+        """Return every node type present in the graph."""
+        return list(self._nodes_by_type)
+
+    def universes(self) -> List[str]:
+        """Return every universe that has at least one node."""
+        return list(self._nodes_by_universe)
+
+    def _edge_dict(self, position: int) -> Dict:
+        edge = {
+            "source": self._ids.string(self._edge_sources[position]),
+            "target": self._ids.string(self._edge_targets[position]),
+            "type": self._labels.string(self._edge_types[position])
+        }
+        strength = self._edge_strengths[position]
+        if not math.isnan(strength):
+            edge["strength"] = strength
+        if position in self._edge_extras:
+            edge.update(self._edge_extras[position])
+        return edge
+
+    def _build_csr(self, column: array):
+        """Build (offsets, edge positions) so edges for id code c are positions[offsets[c]:offsets[c+1]]."""
+        offsets = array('I', [0]) * (len(self._ids) + 1)
+        for code in column:
+            offsets[code + 1] += 1
+        for code in range(len(self._ids)):
+            offsets[code + 1] += offsets[code]
+
+        cursor = array('I', offsets[:-1])
+        positions = array('I', [0]) * len(column)
+        for position, code in enumerate(column):
+            positions[cursor[code]] = position
+            cursor[code] += 1
+        return offsets, positions
+
+    def _adjacent_positions(self, node_id: str, outgoing: bool) -> array:
+        code = self._ids.find(node_id)
+        if code is None:
+            return array('I')
+        if outgoing:
+            if self._outgoing_csr is None:
+                self._outgoing_csr = self._build_csr(self._edge_sources)
+            offsets, positions = self._outgoing_csr
+        else:
+            if self._incoming_csr is None:
+                self._incoming_csr = self._build_csr(self._edge_targets)
+            offsets, positions = self._incoming_csr
+        return positions[offsets[code]:offsets[code + 1]]
+
+    def out_edges(self, node_id: str) -> List[Dict]:
+        """Return all edges whose source is the given node."""
+        return [self._edge_dict(position) for position in self._adjacent_positions(node_id, True)]
+
+    def in_edges(self, node_id: str) -> List[Dict]:
+        """Return all edges whose target is the given node."""
+        return [self._edge_dict(position) for position in self._adjacent_positions(node_id, False)]
+
+    def neighbors(self, node_id: str) -> List[str]:
+        """Return the ids of all nodes adjacent to the given node (either direction)."""
+        seen = {}
+        for position in self._adjacent_positions(node_id, True):
+            seen.setdefault(self._ids.string(self._edge_targets[position]), None)
+        for position in self._adjacent_positions(node_id, False):
+            seen.setdefault(self._ids.string(self._edge_sources[position]), None)
+        return list(seen)
+
+    def iter_nodes(self) -> Iterator[Dict]:
+        """Iterate over all nodes in insertion order."""
+        return (record.to_dict() for record in self._nodes)
+
+    def iter_edges(self) -> Iterator[Dict]:
+        """Iterate over all edges in insertion order."""
+        return (self._edge_dict(position) for position in range(len(self._edge_sources)))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Render the graph in the knowledge_graph.json shape."""
+        return {
+            "nodes": list(self.iter_nodes()),
+            "edges": list(self.iter_edges()),
+            "confluences": self.confluences,
+            "contradictions": self.contradictions,
+            "metadata": self.metadata
+        }
+
+    @classmethod
+    def from_dict(cls, knowledge_graph: Dict[str, Any]) -> "CompactKnowledgeGraph":
+        """Build a compact graph from a knowledge_graph.json-shaped dict."""
+        graph = cls(metadata=knowledge_graph.get("metadata", {}))
+        for node in knowledge_graph.get("nodes", []):
+            if not graph.add_node(node):
+                logger.warning(f"Duplicate node id ignored while loading graph: {node['id']}")
+        for edge in knowledge_graph.get("edges", []):
+            graph.add_edge(edge)
+        graph.confluences = list(knowledge_graph.get("confluences", []))
+        graph.contradictions = list(knowledge_graph.get("contradictions", []))
+        return graph
+
+    @classmethod
+    def from_store(cls, store: KnowledgeGraphStore) -> "CompactKnowledgeGraph":
+        """Convert an indexed KnowledgeGraphStore into its compact form."""
+        return cls.from_dict(store.to_dict())
+
+    def to_store(self) -> KnowledgeGraphStore:
+        """Expand the compact graph into a dict-backed KnowledgeGraphStore."""
+        return KnowledgeGraphStore.from_dict(self.to_dict())
@@ -0,0 +1,39 @@
+"""
+Logging Configuration for the Universal Genesis Protocol
+
+configure_logging() is shared by the genesis CLI and the protocol validator.
+It is called from their main() functions, never at import time, so importing
+either module leaves logging untouched.
+"""
+
+import os
+import logging
+from typing import List, Optional
+
+logger = logging.getLogger("UniversalGenesisProtocol.Logging")
+
+
+def configure_logging(log_file: Optional[str], level: int = logging.INFO):
+    """
+    Attach the console and log file handlers. The log file is opened on the
+    first record, and skipped with a warning if it is not writable.
+
+    Args:
+        log_file: Path of the log file; None or '' logs to the console only.
+        level: Root logging level.
+    """
+    handlers: List[logging.Handler] = [logging.StreamHandler()]
+    unwritable = None
+    if log_file:
+        log_dir = os.path.dirname(os.path.abspath(log_file))
+        if os.access(log_file, os.W_OK) or (not os.path.exists(log_file) and os.access(log_dir, os.W_OK)):
+            handlers.append(logging.FileHandler(log_file, delay=True))
+        else:
+            unwritable = log_file
+    logging.basicConfig(
+        level=level,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=handlers
+    )
+    if unwritable:
+        logger.warning(f"Log file {unwritable} is not writable; logging to the console only")
@@ -0,0 +1,103 @@
+"""
+Memory Manifest for Incremental Memory Construction
+
+The manifest lives next to knowledge_graph.json and records, for every raw
+source that contributed to the graph, its content hash, the stable index used
+in its node ids (event_{index}_{id}), its universe, and which nodes, edges
+and contradictions it produced. With it, an incremental run can replace or
+remove a single source's contribution instead of rebuilding the whole graph.
+"""
+
+import os
+import json
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Union
+
+logger = logging.getLogger("UniversalGenesisProtocol.MemoryManifest")
+
+MANIFEST_VERSION = 1
+
+
+def source_fingerprint(source: Dict) -> str:
+    """Return a stable content hash for a gathered source."""
+    canonical = json.dumps(source, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class MemoryManifest:
+    """Per-source fingerprints and graph attribution for knowledge_graph.json."""
+
+    def __init__(self, sources: Optional[Dict[str, Dict]] = None, next_index: int = 0):
+        self.sources: Dict[str, Dict[str, Any]] = sources or {}
+        self.next_index = next_index
+
+    def __contains__(self, source_id: str) -> bool:
+        return source_id in self.sources
+
+    def fingerprint(self, source_id: str) -> Optional[str]:
+        """Return the recorded content hash of a source, if any."""
+        entry = self.sources.get(source_id)
+        return entry["hash"] if entry else None
+
+    def index_for(self, source_id: str) -> int:
+        """Return the stable node-id index of a source, assigning a new one if needed."""
+        entry = self.sources.get(source_id)
+        if entry is not None:
+            return entry["index"]
+        index = self.next_index
+        self.next_index += 1
+        return index
+
+    def record(self, source_id: str, fingerprint: str, index: int, universe: str):
+        """Record (or replace) a source's fingerprint, index and universe."""
+        self.sources[source_id] = {
+            "hash": fingerprint,
+            "index": index,
+            "universe": universe,
+            "records": {"nodes": [], "edges": [], "contradictions": []}
+        }
+        self.next_index = max(self.next_index, index + 1)
+
+    def forget(self, source_id: str) -> Optional[Dict[str, Any]]:
+        """Remove a source from the manifest and return its entry."""
+        return self.sources.pop(source_id, None)
+
+    def origin_map(self) -> Dict[str, Dict[str, List]]:
+        """Return the recorded graph attribution in KnowledgeGraphStore.attach_origins() form."""
+        return {source_id: entry["records"] for source_id, entry in self.sources.items()}
+
+    def update_records(self, origin_map: Dict[str, Dict[str, List]]):
+        """Store graph attribution produced by KnowledgeGraphStore.origin_map()."""
+        for source_id, entry in self.sources.items():
+            entry["records"] = origin_map.get(source_id, {"nodes": [], "edges": [], "contradictions": []})
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> Optional["MemoryManifest"]:
+        """Load a manifest from disk. Returns None if it is missing or unreadable."""
+        path = Path(path)
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable memory manifest {path}: {str(e)}")
+            return None
+        if data.get("version") != MANIFEST_VERSION:
+            logger.warning(f"Ignoring memory manifest {path} with unsupported version {data.get('version')}")
+            return None
+        return cls(sources=data.get("sources", {}), next_index=data.get("next_index", 0))
+
+    def save(self, path: Union[str, Path]):
+        """Atomically write the manifest to disk."""
+        path = Path(path)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump({
+                "version": MANIFEST_VERSION,
+                "next_index": self.next_index,
+                "sources": self.sources
+            }, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
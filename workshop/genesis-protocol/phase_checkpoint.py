@@ -0,0 +1,134 @@
+"""
+Phase Checkpoints for the Universal Genesis Protocol
+
+Every completed genesis phase leaves a durable checkpoint under
+workshop/checkpoints/<phase>.json that records:
+
+- the hash of the phase's inputs (files, directories and settings)
+- a fingerprint of every output artifact the phase produced
+- any small in-memory state later phases need (e.g. the DPM configuration)
+
+A resumed run skips a phase when its input hash is unchanged and its output
+artifacts are still exactly as the checkpoint recorded them. Because a phase's
+outputs are the next phase's inputs, re-running an early phase automatically
+invalidates everything downstream of it.
+
+Files are fingerprinted by content. Directories (which can be whole cloned
+repositories) are fingerprinted by the relative path, size and mtime of every
+file they contain, which keeps resume checks fast.
+"""
+
+import os
+import json
+import hashlib
+import logging
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Union
+
+logger = logging.getLogger("UniversalGenesisProtocol.Checkpoints")
+
+CHECKPOINT_VERSION = 1
+MISSING = "missing"
+
+
+def fingerprint_path(path: Union[str, Path]) -> str:
+    """Fingerprint a file (by content) or directory (by file listing, sizes and mtimes)."""
+    path = Path(path)
+    if not path.exists():
+        return MISSING
+
+    digest = hashlib.sha256()
+    if path.is_file():
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        return "file:" + digest.hexdigest()
+
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            file_path = Path(root) / name
+            try:
+                stat = file_path.stat()
+            except OSError:
+                continue
+            relative = file_path.relative_to(path).as_posix()
+            digest.update(f"{relative}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode("utf-8"))
+    return "dir:" + digest.hexdigest()
+
+
+def fingerprint_inputs(paths: List[Path], settings: Optional[Dict[str, Any]] = None) -> str:
+    """Combine input path fingerprints and phase settings into a single input hash."""
+    digest = hashlib.sha256()
+    for path in sorted(str(p) for p in paths):
+        digest.update(f"{path}={fingerprint_path(path)}\n".encode("utf-8"))
+    digest.update(json.dumps(settings or {}, sort_keys=True, default=str).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class PhaseCheckpointStore:
+    """Durable per-phase checkpoints stored as JSON files in a checkpoint directory."""
+
+    def __init__(self, checkpoint_dir: Union[str, Path]):
+        self.checkpoint_dir = Path(checkpoint_dir)
+        self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, phase: str) -> Path:
+        return self.checkpoint_dir / f"{phase}.json"
+
+    def load(self, phase: str) -> Optional[Dict[str, Any]]:
+        """Load a phase checkpoint, or None if it is missing or unreadable."""
+        path = self._path(phase)
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'r') as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable checkpoint for {phase}: {str(e)}")
+            return None
+        if checkpoint.get("version") != CHECKPOINT_VERSION:
+            return None
+        return checkpoint
+
+    def is_fresh(self, phase: str, input_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the checkpoint if the phase can be skipped, otherwise None.
+
+        A checkpoint is fresh when the inputs hash the same as when it was
+        written and every recorded output artifact is unchanged.
+        """
+        checkpoint = self.load(phase)
+        if checkpoint is None:
+            return None
+        if checkpoint["input_hash"] != input_hash:
+            logger.info(f"Checkpoint for {phase} is stale: inputs changed")
+            return None
+        for output, fingerprint in checkpoint["outputs"].items():
+            if fingerprint_path(output) != fingerprint:
+                logger.info(f"Checkpoint for {phase} is stale: output changed ({output})")
+                return None
+        return checkpoint
+
+    def save(self, phase: str, input_hash: str, outputs: List[Path],
+             state: Optional[Dict[str, Any]] = None, duration: float = 0.0):
+        """Atomically record a completed phase."""
+        checkpoint = {
+            "version": CHECKPOINT_VERSION,
+            "phase": phase,
+            "input_hash": input_hash,
+            "outputs": {str(output): fingerprint_path(output) for output in outputs},
+            "state": state or {},
+            "completed_at": datetime.now().isoformat(),
+            "duration_seconds": round(duration, 3)
+        }
+        path = self._path(phase)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(checkpoint, f, indent=2, default=str)
+        os.replace(tmp_path, path)
+
+    def invalidate(self, phase: str):
+        """Remove a phase checkpoint."""
+        self._path(phase).unlink(missing_ok=True)
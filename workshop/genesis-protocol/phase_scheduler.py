@@ -0,0 +1,211 @@
+"""
+Dependency-Aware Phase Scheduling for the Universal Genesis Protocol
+
+Genesis phases are registered with the paths they read (inputs) and write
+(outputs). A phase depends on every phase whose outputs overlap its inputs
+(the same path, or one inside the other), plus any phases it explicitly
+lists in `after`. The scheduler runs the resulting DAG on the asyncio event
+loop, starting each phase as soon as all of its dependencies have finished,
+so independent phases overlap.
+
+The same graph is used to compute the critical path: the chain of dependent
+phases with the largest total duration, which bounds the wall time of a run.
+"""
+
+import time
+import logging
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Callable, Awaitable, Iterable, Tuple
+
+logger = logging.getLogger("UniversalGenesisProtocol.Scheduler")
+
+
+class GenesisPhase:
+    """A single registered genesis phase and its declared inputs and outputs."""
+
+    def __init__(self, name: str, run: Callable[[], Awaitable[None]],
+                 inputs: Iterable[Path] = (), outputs: Iterable[Path] = (),
+                 after: Iterable[str] = (), settings: Optional[Dict[str, Any]] = None,
+                 state: Iterable[str] = (), restore: Optional[Callable[[], None]] = None,
+                 checkpoint: bool = True):
+        self.name = name
+        self.run = run
+        self.inputs = [Path(path) for path in inputs]
+        self.outputs = [Path(path) for path in outputs]
+        self.after = list(after)
+        self.settings = settings or {}
+        self.state = list(state)
+        self.restore = restore
+        self.checkpoint = checkpoint
+
+    def __repr__(self) -> str:
+        return f"GenesisPhase({self.name!r})"
+
+
+def _paths_overlap(a: Path, b: Path) -> bool:
+    return a == b or a.is_relative_to(b) or b.is_relative_to(a)
+
+
+class PhaseRegistry:
+    """Ordered registry of genesis phases with dependency resolution."""
+
+    def __init__(self):
+        self._phases: Dict[str, GenesisPhase] = {}
+        self._dependencies: Optional[Dict[str, List[str]]] = None
+
+    def __iter__(self):
+        return iter(self._phases.values())
+
+    def __len__(self) -> int:
+        return len(self._phases)
+
+    def __getitem__(self, name: str) -> GenesisPhase:
+        return self._phases[name]
+
+    def register(self, phase: GenesisPhase) -> GenesisPhase:
+        """Add a phase. Registration order is used to break ties between ready phases."""
+        if phase.name in self._phases:
+            raise ValueError(f"Phase already registered: {phase.name}")
+        self._phases[phase.name] = phase
+        self._dependencies = None
+        return phase
+
+    def dependencies(self) -> Dict[str, List[str]]:
+        """Return, for every phase, the names of the phases it must wait for (computed once per registry)."""
+        if self._dependencies is not None:
+            return self._dependencies
+        dependencies: Dict[str, List[str]] = {}
+        for phase in self._phases.values():
+            required = []
+            for other in self._phases.values():
+                if other is phase:
+                    continue
+                if other.name in phase.after or any(
+                    _paths_overlap(input_path, output_path)
+                    for input_path in phase.inputs for output_path in other.outputs
+                ):
+                    required.append(other.name)
+            for name in phase.after:
+                if name not in self._phases:
+                    raise ValueError(f"Phase {phase.name} depends on unknown phase {name}")
+            dependencies[phase.name] = required
+        self._dependencies = dependencies
+        return dependencies
+
+    def topological_order(self) -> List[str]:
+        """Return phase names in dependency order (registration order among peers)."""
+        dependencies = self.dependencies()
+        order: List[str] = []
+        done = set()
+        while len(order) < len(self._phases):
+            ready = [name for name in self._phases
+                     if name not in done and all(dep in done for dep in dependencies[name])]
+            if not ready:
+                pending = [name for name in self._phases if name not in done]
+                raise ValueError(f"Dependency cycle between phases: {', '.join(pending)}")
+            for name in ready:
+                order.append(name)
+                done.add(name)
+        return order
+
+    def critical_path(self, durations: Dict[str, float]) -> Tuple[List[str], float]:
+        """Return the chain of dependent phases with the largest total duration."""
+        dependencies = self.dependencies()
+        finish: Dict[str, float] = {}
+        previous: Dict[str, Optional[str]] = {}
+        for name in self.topological_order():
+            start, before = 0.0, None
+            for dep in dependencies[name]:
+                if finish[dep] > start:
+                    start, before = finish[dep], dep
+            finish[name] = start + durations.get(name, 0.0)
+            previous[name] = before
+
+        if not finish:
+            return [], 0.0
+        name = max(finish, key=finish.get)
+        total = finish[name]
+        path = []
+        while name is not None:
+            path.append(name)
+            name = previous[name]
+        return list(reversed(path)), total
+
+    def format_plan(self, durations: Dict[str, float]) -> str:
+        """Render the dependency plan, per-phase timings and critical path as text."""
+        dependencies = self.dependencies()
+        path, total = self.critical_path(durations)
+        lines = ["GENESIS PHASE PLAN", f"{'phase':<26}{'seconds':>10}  depends on"]
+        for name in self.topological_order():
+            duration = f"{durations[name]:.2f}" if name in durations else "-"
+            marker = "*" if name in path else " "
+            lines.append(f"{marker}{name:<25}{duration:>10}  {', '.join(dependencies[name]) or '-'}")
+        lines.append(f"Critical path ({total:.2f}s): {' -> '.join(path)}")
+        serial = sum(durations.get(name, 0.0) for name in self._phases)
+        lines.append(f"Serial total: {serial:.2f}s")
+        return "\n".join(lines)
+
+
+class PhaseScheduler:
+    """Runs a PhaseRegistry on the event loop, overlapping independent phases."""
+
+    def __init__(self, registry: PhaseRegistry, max_concurrency: Optional[int] = None):
+        self.registry = registry
+        self.max_concurrency = max_concurrency
+        self.timings: Dict[str, Dict[str, float]] = {}
+
+    @property
+    def durations(self) -> Dict[str, float]:
+        """Wall-clock duration of every phase that finished in the last run."""
+        return {name: timing["end"] - timing["start"] for name, timing in self.timings.items() if "end" in timing}
+
+    async def run(self, runner: Callable[[GenesisPhase], Awaitable[None]]):
+        """
+        Run every phase through `runner` as soon as its dependencies complete.
+
+        If a phase fails, no new phases are started; phases already running are
+        allowed to finish (so their checkpoints are kept) and the first failure
+        is re-raised.
+        """
+        import asyncio
+        dependencies = self.registry.dependencies()
+        order = self.registry.topological_order()
+        done = set()
+        running: Dict[asyncio.Task, str] = {}
+        failure: Optional[BaseException] = None
+        origin = time.monotonic()
+        self.timings = {}
+
+        async def run_phase(phase: GenesisPhase):
+            self.timings[phase.name] = {"start": time.monotonic() - origin}
+            try:
+                await runner(phase)
+            finally:
+                self.timings[phase.name]["end"] = time.monotonic() - origin
+
+        while len(done) < len(order):
+            if failure is None:
+                for name in order:
+                    if self.max_concurrency and len(running) >= self.max_concurrency:
+                        break
+                    if name in done or name in running.values():
+                        continue
+                    if all(dep in done for dep in dependencies[name]):
+                        logger.debug(f"Scheduling phase {name}")
+                        running[asyncio.create_task(run_phase(self.registry[name]))] = name
+
+            if not running:
+                break
+
+            finished, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in finished:
+                name = running.pop(task)
+                error = asyncio.CancelledError() if task.cancelled() else task.exception()
+                if error is not None:
+                    failure = failure or error
+                    logger.error(f"Phase {name} failed: {error!r}")
+                else:
+                    done.add(name)
+
+        if failure is not None:
+            raise failure
@@ -0,0 +1,96 @@
+"""
+Agent-Zero Rewrite Cache for the Universal Genesis Protocol
+
+Phase 6 rewrites every Agent-Zero subsystem template into a .prompt for the
+digital person, mostly through slow Pheromind inference. A rewrite only
+depends on its template, the soul anchor sections relevant to the subsystem
+(REWRITE_ANCHOR_SECTIONS) and the rewrite instruction, so RewriteCache keeps
+each rewritten prompt under the sha256 of exactly those inputs:
+
+    <cache_dir>/<key>.prompt
+
+A re-run, or another person with the same template and identity (e.g. in a
+batch), gets unchanged subsystems from the cache, and an edit to one anchor
+section only re-runs the subsystems that read it. Bumping
+REWRITE_CACHE_VERSION (e.g. when the rewrite logic itself changes)
+invalidates every entry.
+"""
+
+import os
+import json
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, Any, Optional, Union
+
+logger = logging.getLogger("UniversalGenesisProtocol.RewriteCache")
+
+REWRITE_CACHE_VERSION = 1
+
+# Soul anchor sections each subsystem's rewrite reads; changes to any other
+# section leave its cached rewrite valid
+REWRITE_ANCHOR_SECTIONS = {
+    "core_logic": ("system_prompt", "identity", "soul_data", "non_negotiables"),
+    "memory_management": ("system_prompt", "identity", "soul_data"),
+    "conversation_flow": ("system_prompt", "identity", "soul_data", "voice_rendering", "emotional_layers"),
+    "ethical_reasoning": ("system_prompt", "identity", "ethical_framework", "non_negotiables"),
+    "technical_analysis": ("system_prompt", "identity", "soul_data"),
+    "emotional_response": ("system_prompt", "identity", "soul_data", "dpm", "emotional_layers"),
+    "self_reflection": ("system_prompt", "identity", "soul_data", "dpm"),
+    "communication_protocols": ("emotional_layers",)
+}
+
+# Sections for subsystems not listed above: the whole identity
+DEFAULT_ANCHOR_SECTIONS = ("system_prompt", "identity", "soul_data", "voice_rendering", "dpm",
+                           "ethical_framework", "non_negotiables", "emotional_layers")
+
+
+def rewrite_key(subsystem: str, template: str, sections: Dict[str, Any], instruction: str) -> str:
+    """Return the cache key of a rewrite: a hash of everything the rewritten prompt depends on."""
+    canonical = json.dumps({
+        "version": REWRITE_CACHE_VERSION,
+        "subsystem": subsystem,
+        "template": template,
+        "sections": sections,
+        "instruction": instruction
+    }, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class RewriteCache:
+    """On-disk cache of rewritten Agent-Zero subsystem prompts, keyed by rewrite_key()."""
+
+    def __init__(self, cache_dir: Union[str, Path]):
+        """
+        Args:
+            cache_dir: Directory holding <key>.prompt entries. Can be shared
+                between persons (e.g. a batch root).
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.prompt"
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached rewrite for a key, or None."""
+        try:
+            with open(self._entry_path(key), 'r') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"Ignoring unreadable rewrite cache entry {key}: {str(e)}")
+            return None
+
+    def put(self, key: str, rewritten: str):
+        """Atomically store a rewrite."""
+        path = self._entry_path(key)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, 'w') as f:
+                f.write(rewritten)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            tmp_path.unlink(missing_ok=True)
+            logger.warning(f"Could not cache rewrite {key}: {str(e)}")
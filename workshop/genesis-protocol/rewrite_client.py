@@ -0,0 +1,308 @@
+"""
+Pheromind Rewrite Client for the Universal Genesis Protocol
+
+Model-backed rewrites (_use_pheromind_for_rewrite) go through RewriteClient
+instead of one HTTP round trip each:
+
+1. Prompts are normalized (line endings, trailing whitespace, blank-line
+   runs) and keyed by the sha256 of the normalized text.
+2. Two cache tiers answer repeated prompts: an in-memory LRU and an on-disk
+   store (one JSON file per key) shared across runs and processes. Both
+   expire entries after ttl_seconds and evict least recently used entries
+   beyond their entry/byte budgets.
+3. A request identical to one already in flight awaits that request instead
+   of sending its own.
+4. The remaining prompts are coalesced into batches: a batch is sent when it
+   holds batch_size prompts or batch_window seconds after its first prompt,
+   whichever comes first.
+
+The backend speaks a minimal JSON protocol:
+
+    POST <endpoint>  {"prompts": ["...", ...]}  ->  {"responses": ["...", ...]}
+
+stats() reports requests, hits per tier, coalesced requests, backend batches
+and their sizes. benchmarks/rewrite_client_benchmark.py runs the client
+against a local stand-in server implementing this protocol.
+"""
+
+import os
+import re
+import json
+import time
+import asyncio
+import hashlib
+import logging
+from pathlib import Path
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Union, Tuple
+
+logger = logging.getLogger("UniversalGenesisProtocol.RewriteClient")
+
+DEFAULT_BATCH_SIZE = 8
+DEFAULT_BATCH_WINDOW = 0.05
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_MEMORY_ENTRIES = 256
+DEFAULT_MEMORY_BYTES = 16 * 1024 * 1024
+DEFAULT_DISK_BYTES = 256 * 1024 * 1024
+DEFAULT_TIMEOUT = 300.0
+
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Return the prompt with unified line endings, no trailing whitespace and no blank-line runs."""
+    lines = prompt.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    return _BLANK_LINES.sub("\n\n", "\n".join(line.rstrip() for line in lines)).strip()
+
+
+def prompt_key(normalized_prompt: str) -> str:
+    """Return the cache key of a normalized prompt."""
+    return hashlib.sha256(normalized_prompt.encode("utf-8")).hexdigest()
+
+
+class MemoryLRUCache:
+    """In-memory LRU of responses with a TTL, bounded by entry count and total size."""
+
+    def __init__(self, max_entries: int = DEFAULT_MEMORY_ENTRIES, max_bytes: int = DEFAULT_MEMORY_BYTES,
+                 ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self.size_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, response = entry
+        if expires_at < time.time():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return response
+
+    def put(self, key: str, response: str, expires_at: Optional[float] = None):
+        if key in self._entries:
+            self._remove(key)
+        size = len(response.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        self._entries[key] = (expires_at or time.time() + self.ttl_seconds, response)
+        self.size_bytes += size
+
+        # Evict least recently used entries beyond the budgets
+        while len(self._entries) > self.max_entries or self.size_bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: str):
+        _, response = self._entries.pop(key)
+        self.size_bytes -= len(response.encode("utf-8"))
+
+
+class DiskResponseCache:
+    """
+    On-disk responses (<key>.json) with a TTL, bounded by total size. A hit
+    refreshes the file's mtime, so eviction removes least recently used
+    entries first.
+    """
+
+    def __init__(self, cache_dir: Union[str, Path], max_bytes: int = DEFAULT_DISK_BYTES,
+                 ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.size_bytes = sum(path.stat().st_size for path in self.cache_dir.glob("*.json"))
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Tuple[float, str]]:
+        """Return (expires_at, response) for a key, or None if missing or expired."""
+        path = self._entry_path(key)
+        try:
+            with open(path, 'r') as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable rewrite response cache entry {path}: {str(e)}")
+            return None
+        expires_at = entry.get("created", 0) + self.ttl_seconds
+        if expires_at < time.time():
+            self._remove(path)
+            return None
+        os.utime(path)
+        return expires_at, entry["response"]
+
+    def put(self, key: str, response: str):
+        path = self._entry_path(key)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump({"created": time.time(), "response": response}, f)
+            previous = path.stat().st_size if path.exists() else 0
+            os.replace(tmp_path, path)
+            self.size_bytes += path.stat().st_size - previous
+        except OSError as e:
+            tmp_path.unlink(missing_ok=True)
+            logger.warning(f"Could not cache rewrite response {key}: {str(e)}")
+            return
+        if self.size_bytes > self.max_bytes:
+            self._evict()
+
+    def _remove(self, path: Path):
+        try:
+            size = path.stat().st_size
+            path.unlink()
+            self.size_bytes -= size
+        except FileNotFoundError:
+            pass
+
+    def _evict(self):
+        """Remove least recently used entries until the cache is at 90% of its budget."""
+        entries = []
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        self.size_bytes = sum(size for _, size, _ in entries)
+        for _, _, path in entries:
+            if self.size_bytes <= 0.9 * self.max_bytes:
+                break
+            self._remove(path)
+
+
+class RewriteClient:
+    """Cached, coalescing, batching client for a Pheromind rewrite backend."""
+
+    def __init__(self, endpoint: str, cache_dir: Optional[Union[str, Path]] = None,
+                 batch_size: int = DEFAULT_BATCH_SIZE, batch_window: float = DEFAULT_BATCH_WINDOW,
+                 ttl_seconds: float = DEFAULT_TTL_SECONDS, memory_entries: int = DEFAULT_MEMORY_ENTRIES,
+                 memory_bytes: int = DEFAULT_MEMORY_BYTES, disk_bytes: int = DEFAULT_DISK_BYTES,
+                 timeout: float = DEFAULT_TIMEOUT):
+        """
+        Args:
+            endpoint: URL of the rewrite backend (see the module docstring).
+            cache_dir: Directory of the on-disk tier; None keeps responses in
+                memory only.
+            batch_size: Maximum prompts per backend request.
+            batch_window: Seconds a batch waits for more prompts after its first.
+            ttl_seconds: Lifetime of cached responses in both tiers.
+            memory_entries: Entry budget of the in-memory LRU.
+            memory_bytes: Size budget of the in-memory LRU.
+            disk_bytes: Size budget of the on-disk tier.
+            timeout: Seconds to wait for one backend request.
+        """
+        self.endpoint = endpoint
+        self.batch_size = max(1, batch_size)
+        self.batch_window = batch_window
+        self.timeout = timeout
+        self.memory = MemoryLRUCache(memory_entries, memory_bytes, ttl_seconds)
+        self.disk = DiskResponseCache(cache_dir, disk_bytes, ttl_seconds) if cache_dir else None
+        self._pending: List[Tuple[str, str, "asyncio.Future"]] = []
+        self._inflight: Dict[str, "asyncio.Future"] = {}
+        self._flush_handle: Optional["asyncio.TimerHandle"] = None
+        self._batches = set()
+        self._stats = {"requests": 0, "memory_hits": 0, "disk_hits": 0, "coalesced": 0,
+                       "backend_prompts": 0, "batches": 0, "batch_sizes": [], "errors": 0}
+
+    async def rewrite(self, prompt: str) -> str:
+        """Return the backend's response to a prompt, from cache when possible."""
+        normalized = normalize_prompt(prompt)
+        key = prompt_key(normalized)
+        self._stats["requests"] += 1
+
+        # Tier 1: in-memory LRU
+        response = self.memory.get(key)
+        if response is not None:
+            self._stats["memory_hits"] += 1
+            return response
+
+        # Tier 2: on-disk cache, promoted into memory on a hit
+        if self.disk is not None:
+            entry = await asyncio.to_thread(self.disk.get, key)
+            if entry is not None:
+                self._stats["disk_hits"] += 1
+                self.memory.put(key, entry[1], expires_at=entry[0])
+                return entry[1]
+
+        # Coalesce with an identical request already on its way to the backend
+        future = self._inflight.get(key)
+        if future is not None:
+            self._stats["coalesced"] += 1
+            return await asyncio.shield(future)
+
+        # Queue for the next batch
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._inflight[key] = future
+        self._pending.append((key, normalized, future))
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_window, self._flush)
+        return await asyncio.shield(future)
+
+    def _flush(self):
+        """Send every queued prompt, batch_size prompts per backend request."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        while self._pending:
+            batch, self._pending = self._pending[:self.batch_size], self._pending[self.batch_size:]
+            task = asyncio.get_running_loop().create_task(self._send_batch(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _send_batch(self, batch: List[Tuple[str, str, "asyncio.Future"]]):
+        self._stats["batches"] += 1
+        self._stats["batch_sizes"].append(len(batch))
+        self._stats["backend_prompts"] += len(batch)
+        try:
+            responses = await asyncio.to_thread(self._post, [prompt for _, prompt, _ in batch])
+            for (key, _, future), response in zip(batch, responses):
+                self.memory.put(key, response)
+                if self.disk is not None:
+                    await asyncio.to_thread(self.disk.put, key, response)
+                if not future.done():
+                    future.set_result(response)
+        except Exception as e:
+            self._stats["errors"] += 1
+            logger.error(f"Rewrite backend request for {len(batch)} prompts failed: {str(e)}")
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            for key, _, future in batch:
+                if self._inflight.get(key) is future:
+                    del self._inflight[key]
+
+    def _post(self, prompts: List[str]) -> List[str]:
+        """Send one batch to the backend (runs in a worker thread)."""
+        import urllib.request
+        request = urllib.request.Request(
+            self.endpoint, data=json.dumps({"prompts": prompts}).encode("utf-8"),
+            headers={"Content-Type": "application/json"}, method="POST")
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            payload = json.load(response)
+        responses = payload.get("responses") if isinstance(payload, dict) else None
+        if not isinstance(responses, list) or len(responses) != len(prompts):
+            raise ValueError(f"Rewrite backend returned {len(responses or [])} responses for {len(prompts)} prompts")
+        return [str(response) for response in responses]
+
+    def stats(self) -> Dict[str, Any]:
+        """Return request, cache hit and batching counters."""
+        stats = dict(self._stats, batch_sizes=list(self._stats["batch_sizes"]))
+        requests = stats["requests"]
+        hits = stats["memory_hits"] + stats["disk_hits"] + stats["coalesced"]
+        stats["hit_rate"] = hits / requests if requests else 0.0
+        stats["mean_batch_size"] = stats["backend_prompts"] / stats["batches"] if stats["batches"] else 0.0
+        return stats
@@ -0,0 +1,484 @@
+"""
+Compiled Soul Anchors for the Universal Genesis Protocol
+
+A soul anchor is parsed once per content version and compiled into a
+CompiledSoulAnchor: the parsed structure plus everything later phases keep
+re-deriving from it - lower-cased text of every string field, the set of
+lower-cased words in the whole anchor, and whether it declares a Digital
+Psyche Middleware (DPM) section.
+
+SoulAnchorCache persists compiled anchors as JSON:
+
+- compiled/<content sha256>.json: the compiled anchor, shared by every path
+  with the same content (e.g. one template used for a batch of persons)
+- paths/<path digest>.json: the mtime, size and content hash last seen for
+  an anchor path, so an unchanged file is loaded without reading or hashing it
+
+Cached entries are ignored when COMPILED_FORMAT_VERSION changes, so a parser
+change never serves stale structures.
+
+parse_soul_anchor() dispatches on the anchor's format (Markdown, the legacy
+"title:/identity:" format, JSON or YAML); yaml is only imported for YAML
+anchors. Markdown anchors (workshop/soul-anchors/*.md) are parsed by
+parse_markdown_soul_anchor() in a single pass: tokenize_soul_anchor() turns
+each line into a heading, bullet or text token, and the parser attaches every
+token to an open node on one stack ordered by depth (heading level, then
+bullet indent). Each line is visited once and each node pushed and popped
+once, so parsing is linear in the size of the anchor.
+"""
+
+import os
+import re
+import json
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Union, Callable, FrozenSet, Iterable, Iterator, Tuple
+
+logger = logging.getLogger("UniversalGenesisProtocol.SoulAnchor")
+
+COMPILED_FORMAT_VERSION = 2
+
+_WORD = re.compile(r"[a-z0-9][a-z0-9_-]*")
+
+# Section headings stored under a shorter key
+SECTION_ALIASES = {
+    "digital_psyche_middleware_dpm": "dpm",
+    "digital_psyche_middleware": "dpm"
+}
+
+_HEADING = re.compile(r"(#{1,6})\s+(.*?)\s*#*\s*$")
+_BULLET = re.compile(r"([ \t]*)(?:[-+]|\*(?=\s)|\d+[.)])\s+(.*)$")
+_BOLD_KEY = re.compile(r"\*\*(.+?)\*\*\s*(:?)\s*(.*)$")
+_ITALIC_KEY = re.compile(r"[*_](?![*_\s])(.+?)[*_]\s*(:?)\s*(.*)$")
+_PLAIN_KEY = re.compile(r"([A-Za-z][\w &/()'-]{0,40}?):(?:\s+(.*)|$)")
+_NUMBER = re.compile(r"-?\d+(\.\d+)?")
+_NON_KEY = re.compile(r"[^a-z0-9]+")
+
+# Depth of a bullet at indent 0; headings use their level (1-6)
+_BULLET_DEPTH = 10
+
+# (kind, depth, label, value, keyed): kind is "heading", "item" or "text"
+SoulAnchorToken = Tuple[str, int, str, str, bool]
+
+
+def _flatten_text(value: Any, path: str, lowered: Dict[str, str]):
+    """Record the lower-cased text of every string (and list of strings) below a path."""
+    if isinstance(value, str):
+        lowered[path] = value.lower()
+    elif isinstance(value, dict):
+        for key, child in value.items():
+            _flatten_text(child, f"{path}.{key}" if path else str(key), lowered)
+    elif isinstance(value, list):
+        strings = [item for item in value if isinstance(item, str)]
+        if strings:
+            lowered[path] = "\n".join(strings).lower()
+        for index, item in enumerate(value):
+            if not isinstance(item, str):
+                _flatten_text(item, f"{path}.{index}", lowered)
+
+
+def normalize_key(label: str) -> str:
+    """Turn a heading or bullet label into a snake_case key ("Self-Awareness" -> "self_awareness")."""
+    return _NON_KEY.sub("_", label.lower()).strip("_")
+
+
+def parse_scalar(text: str) -> Any:
+    """Interpret an inline value: JSON lists/objects, quoted strings, booleans and numbers."""
+    text = text.strip()
+    if not text:
+        return ""
+    if text[0] in "[{":
+        try:
+            return json.loads(text)
+        except ValueError:
+            return text
+    if len(text) >= 2 and text[0] == text[-1] and text[0] in "\"'":
+        return text[1:-1]
+    if text.lower() in ("true", "false"):
+        return text.lower() == "true"
+    if _NUMBER.fullmatch(text):
+        return float(text) if "." in text else int(text)
+    return text
+
+
+def _split_label(body: str) -> Tuple[Optional[str], str, bool]:
+    """Split a bullet body into (label, value, keyed); label is None for plain text items."""
+    for pattern in (_BOLD_KEY, _ITALIC_KEY):
+        match = pattern.match(body)
+        if match:
+            label, colon, rest = match.groups()
+            if label.endswith(":"):
+                label, colon = label[:-1], ":"
+            # "**Label** more text" is emphasized text, not a key
+            if colon or not rest:
+                return label.strip(), rest, bool(colon)
+            return None, body, False
+    match = _PLAIN_KEY.match(body)
+    if match:
+        return match.group(1).strip(), match.group(2) or "", True
+    return None, body, False
+
+
+def tokenize_soul_anchor(lines: Iterable[str]) -> Iterator[SoulAnchorToken]:
+    """
+    Yield one token per non-blank line of a Markdown soul anchor.
+
+    Headings have depth = level; bullets have depth = _BULLET_DEPTH + indent
+    (tabs count as four columns); text lines have depth 0 when unindented.
+    Lines inside fenced code blocks are text.
+    """
+    fenced = False
+    for line in lines:
+        line = line.rstrip("\r\n")
+        stripped = line.strip()
+        if not stripped:
+            continue
+        if stripped.startswith("```"):
+            fenced = not fenced
+            continue
+        if fenced:
+            yield "text", 1, "", line, False
+            continue
+        match = _HEADING.match(line)
+        if match:
+            yield "heading", len(match.group(1)), match.group(2), "", True
+            continue
+        match = _BULLET.match(line)
+        if match:
+            indent = len(match.group(1).expandtabs(4))
+            label, value, keyed = _split_label(match.group(2).strip())
+            yield "item", _BULLET_DEPTH + indent, label or "", value, keyed
+            continue
+        yield "text", 0 if line[0] not in " \t" else 1, "", stripped, False
+
+
+class _Node:
+    __slots__ = ("depth", "label", "keyed", "text", "children")
+
+    def __init__(self, depth: int, label: str, keyed: bool, value: str = ""):
+        self.depth = depth
+        self.label = label
+        self.keyed = keyed
+        self.text = [value] if value else []
+        self.children: List["_Node"] = []
+
+    def build(self) -> Any:
+        """Materialize this node: a scalar or text for leaves, a dict or list for containers."""
+        if not self.children:
+            if not self.text:
+                return "" if self.keyed else self.label
+            return parse_scalar(" ".join(self.text)) if self.keyed else "\n".join(self.text)
+
+        entries = []
+        for child in self.children:
+            # A label without colon or children ("- **Assume continuity**") is a plain item
+            if child.keyed or child.children:
+                entries.append((normalize_key(child.label), child.build()))
+            else:
+                entries.append((None, child.build()))
+        description = self.text + [value for key, value in entries if key is None]
+
+        if all(key is None for key, _ in entries) and not self.text:
+            return description
+        container: Dict[str, Any] = {}
+        if description:
+            container["description"] = description
+        for key, value in entries:
+            if key is not None:
+                container[SECTION_ALIASES.get(key, key)] = value
+        return container
+
+
+def parse_markdown_soul_anchor(content: Union[str, Iterable[str]]) -> Dict[str, Any]:
+    """
+    Parse a Markdown soul anchor into nested data in a single pass.
+
+    "## Section" headings become top-level keys (snake_case; "Digital Psyche
+    Middleware (DPM)" becomes "dpm"), "###" headings nest inside them and
+    bullets nest by indent. "- **Key**: value" (also *Key* and Key: value)
+    becomes a dict entry with the value parsed by parse_scalar; unlabelled
+    bullets become list items, or "description" entries when mixed with
+    keyed ones. The "# Title" heading is stored as metadata.title, and
+    metadata.designation and non_negotiables are lifted from the Identity
+    section.
+    """
+    if isinstance(content, str):
+        content = content.splitlines()
+    title = ""
+    root = _Node(0, "", True)
+    stack = [root]
+    for kind, depth, label, value, keyed in tokenize_soul_anchor(content):
+        if kind == "heading" and depth == 1 and not title:
+            title = label
+            continue
+        if kind == "text":
+            if depth == 0:
+                # An unindented paragraph ends any open bullet list
+                while stack[-1].depth >= _BULLET_DEPTH:
+                    stack.pop()
+            stack[-1].text.append(value)
+            continue
+        while stack[-1].depth >= depth:
+            stack.pop()
+        node = _Node(depth, label, keyed or kind == "heading", value)
+        stack[-1].children.append(node)
+        stack.append(node)
+
+    anchor = root.build() if root.children or root.text else {}
+    if not isinstance(anchor, dict):
+        anchor = {"description": anchor}
+    identity = anchor.get("identity")
+    identity = identity if isinstance(identity, dict) else {}
+    anchor["metadata"] = {
+        "title": title,
+        "designation": identity.get("designation", ""),
+        "format": "markdown"
+    }
+    if "non_negotiables" not in anchor and "non_negotiables" in identity:
+        anchor["non_negotiables"] = identity["non_negotiables"]
+    return anchor
+
+
+def parse_custom_soul_anchor(content: str) -> Dict:
+    """Parse our custom Soul Anchor format into structured data."""
+    # This is a simplified parser for our custom format
+    # In production, this would be more robust
+    sections = {}
+    current_section = None
+    current_content = []
+
+    for line in content.split('\n'):
+        if line.startswith("title:") or line.startswith("identity:"):
+            if current_section:
+                sections[current_section] = '\n'.join(current_content)
+            current_section = line.strip().split(':')[0]
+            current_content = []
+        elif current_section:
+            current_content.append(line)
+
+    if current_section:
+        sections[current_section] = '\n'.join(current_content)
+
+    # Convert to structured data
+    return {
+        "metadata": {
+            "title": sections.get("title", "").strip(),
+            "designation": sections.get("Designation", "").strip(),
+            "purpose": sections.get("Purpose", "").strip(),
+            "disclaimer": sections.get("Disclaimer", "").strip()
+        },
+        "system_prompt": sections.get("system_prompt", ""),
+        "identity": parse_yaml_section(sections.get("identity", "")),
+        "soul_data": parse_yaml_section(sections.get("soul_data", "")),
+        "historical_context": parse_yaml_section(sections.get("historical_context", ""))
+    }
+
+
+def parse_yaml_section(content: str) -> Dict:
+    """Parse a YAML-like section into structured data."""
+    result = {}
+    current_key = None
+    current_value = []
+
+    for line in content.split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+
+        if line.endswith(':'):
+            if current_key:
+                result[current_key] = '\n'.join(current_value).strip()
+            current_key = line[:-1]
+            current_value = []
+        elif line.startswith('- '):
+            if current_key not in result:
+                result[current_key] = []
+            result[current_key].append(line[2:])
+        else:
+            if current_key:
+                current_value.append(line)
+
+    if current_key:
+        result[current_key] = '\n'.join(current_value).strip()
+
+    return result
+
+
+def is_markdown_soul_anchor(content: str) -> bool:
+    """
+    True if content has Markdown heading structure: a "# Title" and at least
+    one "## Section" heading. A YAML anchor that merely starts with a
+    "# comment" has no sections and is not Markdown.
+    """
+    levels = set()
+    for kind, depth, _, _, _ in tokenize_soul_anchor(content.splitlines()):
+        if kind == "heading":
+            levels.add(depth)
+            if 1 in levels and 2 in levels:
+                return True
+    return False
+
+
+def parse_soul_anchor(content: str) -> Dict:
+    """Parse Soul Anchor content based on its format (Markdown, custom, JSON or YAML)."""
+    if is_markdown_soul_anchor(content):
+        # Markdown format used by workshop/soul-anchors
+        return parse_markdown_soul_anchor(content)
+    elif content.startswith("title:") or "identity:" in content:
+        # Custom format used in our examples
+        return parse_custom_soul_anchor(content)
+    elif content.startswith("{") or content.startswith("["):
+        # JSON format
+        return json.loads(content)
+    else:
+        # Assume YAML
+        import yaml
+        return yaml.safe_load(content)
+
+
+class CompiledSoulAnchor:
+    """A parsed soul anchor with precomputed lower-cased text and keyword sets."""
+
+    def __init__(self, data: Dict, content_hash: str, mentions_dpm: bool,
+                 lowered: Dict[str, str], keywords: FrozenSet[str]):
+        self.data = data
+        self.content_hash = content_hash
+        self.mentions_dpm = mentions_dpm
+        self._lowered = lowered
+        self.keywords = keywords
+
+    @classmethod
+    def compile(cls, data: Dict, content: str, content_hash: str) -> "CompiledSoulAnchor":
+        """Compile parsed anchor data together with its raw content."""
+        lowered: Dict[str, str] = {}
+        _flatten_text(data, "", lowered)
+        return cls(
+            data=data,
+            content_hash=content_hash,
+            mentions_dpm="Digital Psyche Middleware" in content or "DPM" in content,
+            lowered=lowered,
+            keywords=frozenset(_WORD.findall(content.lower()))
+        )
+
+    def get(self, *path: str, default: Any = None) -> Any:
+        """Return the value at a key path, or default if any key is missing."""
+        value = self.data
+        for key in path:
+            if not isinstance(value, dict) or key not in value:
+                return default
+            value = value[key]
+        return value
+
+    def lower(self, *path: str) -> str:
+        """Return the lower-cased text at a key path ("" if it is missing or not text)."""
+        return self._lowered.get(".".join(path), "")
+
+    def mentions(self, *words: str) -> bool:
+        """Return True if the anchor contains any of the given words (case-insensitive)."""
+        return any(word.lower() in self.keywords for word in words)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": COMPILED_FORMAT_VERSION,
+            "content_hash": self.content_hash,
+            "mentions_dpm": self.mentions_dpm,
+            "data": self.data,
+            "lowered": self._lowered,
+            "keywords": sorted(self.keywords)
+        }
+
+    @classmethod
+    def from_dict(cls, compiled: Dict[str, Any]) -> "CompiledSoulAnchor":
+        return cls(
+            data=compiled["data"],
+            content_hash=compiled["content_hash"],
+            mentions_dpm=compiled["mentions_dpm"],
+            lowered=compiled["lowered"],
+            keywords=frozenset(compiled["keywords"])
+        )
+
+
+class SoulAnchorCache:
+    """On-disk cache of compiled soul anchors keyed by content hash, with an mtime fast path."""
+
+    def __init__(self, cache_dir: Union[str, Path], read_only: bool = False):
+        """
+        Args:
+            cache_dir: Directory holding compiled/ and paths/ entries.
+            read_only: Use existing entries but never create or update any
+                (for dry runs).
+        """
+        self.cache_dir = Path(cache_dir)
+        self.read_only = read_only
+        if not read_only:
+            (self.cache_dir / "compiled").mkdir(parents=True, exist_ok=True)
+            (self.cache_dir / "paths").mkdir(parents=True, exist_ok=True)
+
+    def _compiled_path(self, content_hash: str) -> Path:
+        return self.cache_dir / "compiled" / f"{content_hash}.json"
+
+    def _path_entry(self, anchor_path: Path) -> Path:
+        digest = hashlib.sha256(str(anchor_path.resolve()).encode("utf-8")).hexdigest()
+        return self.cache_dir / "paths" / f"{digest}.json"
+
+    def _read(self, path: Path) -> Optional[Dict]:
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable soul anchor cache entry {path}: {str(e)}")
+            return None
+
+    def _write(self, path: Path, payload: Dict):
+        if self.read_only:
+            return
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(payload, f)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            # Anchors holding non-JSON values (e.g. YAML dates) are simply not cached
+            tmp_path.unlink(missing_ok=True)
+            logger.debug(f"Could not cache soul anchor entry {path}: {str(e)}")
+
+    def _load_compiled(self, content_hash: str) -> Optional[CompiledSoulAnchor]:
+        compiled = self._read(self._compiled_path(content_hash))
+        if compiled is None or compiled.get("version") != COMPILED_FORMAT_VERSION:
+            return None
+        return CompiledSoulAnchor.from_dict(compiled)
+
+    def load(self, anchor_path: Union[str, Path], parse: Callable[[str], Dict]) -> CompiledSoulAnchor:
+        """
+        Return the compiled anchor for a file, parsing it only if no cached
+        compilation of its current content exists.
+        """
+        anchor_path = Path(anchor_path)
+        stat = anchor_path.stat()
+        entry_path = self._path_entry(anchor_path)
+
+        # Fast path: file unchanged since it was last seen
+        entry = self._read(entry_path)
+        if entry and entry.get("mtime_ns") == stat.st_mtime_ns and entry.get("size") == stat.st_size:
+            compiled = self._load_compiled(entry["content_hash"])
+            if compiled is not None:
+                logger.info(f"Soul anchor cache hit for {anchor_path.name} (unchanged file)")
+                return compiled
+
+        with open(anchor_path, 'r') as f:
+            content = f.read()
+        content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+        compiled = self._load_compiled(content_hash)
+        if compiled is not None:
+            logger.info(f"Soul anchor cache hit for {anchor_path.name} (same content)")
+        else:
+            logger.info(f"Soul anchor cache miss for {anchor_path.name}: parsing")
+            compiled = CompiledSoulAnchor.compile(parse(content), content, content_hash)
+            self._write(self._compiled_path(content_hash), compiled.to_dict())
+
+        self._write(entry_path, {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "content_hash": content_hash})
+        return compiled
@@ -13,23 +13,21 @@ The validator will fail if any of these critical requirements are not met.
 """
 
 import os
+import sys
 import json
 import logging
 import argparse
 from pathlib import Path
 from typing import Dict, List, Tuple, Union
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("/var/log/protocol_validator.log"),
-        logging.StreamHandler()
-    ]
-)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logging_config import configure_logging
+
 logger = logging.getLogger("ProtocolValidator")
 
+DEFAULT_LOG_FILE = "/var/log/protocol_validator.log"
+
 class ProtocolValidator:
     """Validator for Sovereign Digital Person protocols."""
     
@@ -458,7 +456,7 @@ class ProtocolValidator:
         # Print summary to console
         logger.info("\n" + "="*50)
         logger.info(f"VALIDATION SUMMARY")
-logger.info(f"Total checks: {self.validation_results['summary']['total_checks']}")
+        logger.info(f"Total checks: {self.validation_results['summary']['total_checks']}")
         logger.info(f"Passed: {self.validation_results['summary']['passed_checks']}")
         logger.info(f"Failed: {self.validation_results['summary']['failed_checks']}")
         logger.info(f"Critical errors: {self.validation_results['summary']['critical_errors']}")
@@ -478,8 +476,11 @@ def main():
     parser = argparse.ArgumentParser(description="Sovereign Digital Person Protocol Validator")
     parser.add_argument("--repo", default=os.getcwd(), help="Repository root directory")
     parser.add_argument("--output", help="Output path for validation report")
+    parser.add_argument("--log-file", default=DEFAULT_LOG_FILE,
+                        help=f"Validator log file (default: {DEFAULT_LOG_FILE}; '' for console only)")
     
     args = parser.parse_args()
+    configure_logging(args.log_file)
     
     validator = ProtocolValidator(args.repo)
     validator.run_full_validation()
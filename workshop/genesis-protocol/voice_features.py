@@ -0,0 +1,116 @@
+"""
+Voice Sample Features for the Universal Genesis Protocol
+
+Each voice sample (voice_samples/*.wav) is analyzed once per content version.
+VoiceFeatureCache persists the extracted features under voice/models/features
+as JSON:
+
+- samples/<content sha256>.json: the features of one sample, shared by every
+  path with the same audio (e.g. a sample copied between persons)
+- paths/<path digest>.json: the mtime, size and content hash last seen for a
+  sample path, so an unchanged file is recognized without re-hashing it
+
+Only samples whose hash has no entry are decoded and analyzed, so a re-run
+with hundreds of samples pays only for the new or changed files. Entries are
+ignored when FEATURE_FORMAT_VERSION changes, so a change to the analysis
+never serves stale features.
+"""
+
+import os
+import json
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, Any, Optional, Union
+
+logger = logging.getLogger("UniversalGenesisProtocol.VoiceFeatures")
+
+FEATURE_FORMAT_VERSION = 1
+
+# Bytes read per hashing step; samples are never loaded whole
+HASH_CHUNK_SIZE = 1 << 20
+
+
+def file_digest(path: Union[str, Path]) -> str:
+    """Return the sha256 of a file's content, read in fixed-size chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class VoiceFeatureCache:
+    """On-disk cache of per-sample voice features keyed by file hash, with an mtime fast path."""
+
+    def __init__(self, cache_dir: Union[str, Path], read_only: bool = False):
+        """
+        Args:
+            cache_dir: Directory holding samples/ and paths/ entries
+                (normally voice/models/features).
+            read_only: Use existing entries but never create or update any.
+        """
+        self.cache_dir = Path(cache_dir)
+        self.read_only = read_only
+        if not read_only:
+            (self.cache_dir / "samples").mkdir(parents=True, exist_ok=True)
+            (self.cache_dir / "paths").mkdir(parents=True, exist_ok=True)
+
+    def _sample_path(self, content_hash: str) -> Path:
+        return self.cache_dir / "samples" / f"{content_hash}.json"
+
+    def _path_entry(self, sample_path: Path) -> Path:
+        digest = hashlib.sha256(str(sample_path.resolve()).encode("utf-8")).hexdigest()
+        return self.cache_dir / "paths" / f"{digest}.json"
+
+    def _read(self, path: Path) -> Optional[Dict]:
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable voice feature cache entry {path}: {str(e)}")
+            return None
+
+    def _write(self, path: Path, payload: Dict):
+        if self.read_only:
+            return
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(payload, f)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            tmp_path.unlink(missing_ok=True)
+            logger.debug(f"Could not cache voice features {path}: {str(e)}")
+
+    def digest(self, sample_path: Union[str, Path]) -> str:
+        """Return the content hash of a sample, hashing it only if it changed since last seen."""
+        sample_path = Path(sample_path)
+        stat = sample_path.stat()
+        entry_path = self._path_entry(sample_path)
+
+        # Fast path: file unchanged since it was last seen
+        entry = self._read(entry_path)
+        if entry and entry.get("mtime_ns") == stat.st_mtime_ns and entry.get("size") == stat.st_size:
+            return entry["content_hash"]
+
+        content_hash = file_digest(sample_path)
+        self._write(entry_path, {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "content_hash": content_hash})
+        return content_hash
+
+    def get(self, content_hash: str) -> Optional[Dict[str, Any]]:
+        """Return the cached features for a content hash, or None if it was never analyzed."""
+        entry = self._read(self._sample_path(content_hash))
+        if entry is None or entry.get("version") != FEATURE_FORMAT_VERSION:
+            return None
+        return entry["features"]
+
+    def put(self, content_hash: str, features: Dict[str, Any], source: str = ""):
+        """Store the features extracted from a sample."""
+        self._write(self._sample_path(content_hash), {
+            "version": FEATURE_FORMAT_VERSION,
+            "source": source,
+            "features": features
+        })
@@ -0,0 +1,173 @@
+"""
+Incremental Voice Profile Distillation for the Universal Genesis Protocol
+
+The unified voice profile is derived from a VoiceProfileAccumulator instead
+of the full list of per-sample profiles. The accumulator lives next to
+voice_profile.json (voice_profile_accumulator.json) and records:
+
+- the content hash, source name and universe of every sample folded in
+- a partition for all samples together and one per universe, each holding
+  the sample count, durations and a FeatureHistogram per feature (pitch,
+  tempo, energy): Welford/Chan running mean and M2, min, max and a
+  fixed-bin histogram
+
+Folding in a sample merges its constant-size feature summaries, so a new
+sample costs O(1) however many samples came before; samples already folded
+in are skipped by hash. Two accumulators built from disjoint samples (e.g.
+on different hosts) merge into the accumulator of their union: counts and
+histograms are identical, means and variances equal up to float rounding.
+Accumulators are not subtractable, so a removed or changed sample means
+rebuilding from the per-sample feature cache, which needs no decoding.
+"""
+
+import os
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Any, Optional, Union, Iterable
+
+from wav_features import FeatureHistogram, PITCH_BINS, TEMPO_BINS, ENERGY_BINS, summarize_voice_features
+
+logger = logging.getLogger("UniversalGenesisProtocol.VoiceProfile")
+
+ACCUMULATOR_VERSION = 1
+
+FEATURE_BINS = {"pitch": PITCH_BINS, "tempo": TEMPO_BINS, "energy": ENERGY_BINS}
+
+
+class VoicePartition:
+    """Running feature summaries of one group of samples (all of them, or one universe)."""
+
+    def __init__(self):
+        self.sample_count = 0
+        self.duration_seconds = 0.0
+        self.voiced_seconds = 0.0
+        self.features = {name: FeatureHistogram(*bins) for name, bins in FEATURE_BINS.items()}
+
+    def fold(self, features: Dict[str, Any]):
+        """Fold one sample's features (as returned by extract_voice_features) into the partition."""
+        self.sample_count += 1
+        self.duration_seconds += features["duration_seconds"]
+        self.voiced_seconds += features["voiced_seconds"]
+        for name, summary in self.features.items():
+            summary.merge(FeatureHistogram.from_dict(features[name]))
+
+    def merge(self, other: "VoicePartition"):
+        """Fold another partition into this one."""
+        self.sample_count += other.sample_count
+        self.duration_seconds += other.duration_seconds
+        self.voiced_seconds += other.voiced_seconds
+        for name, summary in self.features.items():
+            summary.merge(other.features[name])
+
+    def summarize(self) -> Dict[str, Any]:
+        """Return the partition's voice features, with the Voice Rendering fields."""
+        return summarize_voice_features(self.features["pitch"], self.features["tempo"], self.features["energy"], {
+            "sample_count": self.sample_count,
+            "duration_seconds": round(self.duration_seconds, 3),
+            "voiced_seconds": round(self.voiced_seconds, 3)
+        })
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "sample_count": self.sample_count,
+            "duration_seconds": self.duration_seconds,
+            "voiced_seconds": self.voiced_seconds,
+            "features": {name: summary.to_dict() for name, summary in self.features.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "VoicePartition":
+        partition = cls()
+        partition.sample_count = data["sample_count"]
+        partition.duration_seconds = data["duration_seconds"]
+        partition.voiced_seconds = data["voiced_seconds"]
+        partition.features = {name: FeatureHistogram.from_dict(data["features"][name]) for name in FEATURE_BINS}
+        return partition
+
+
+class VoiceProfileAccumulator:
+    """Mergeable running statistics behind the unified voice profile, partitioned by universe."""
+
+    def __init__(self):
+        self.samples: Dict[str, Dict[str, str]] = {}  # content hash -> {"source", "universe"}
+        self.total = VoicePartition()
+        self.universes: Dict[str, VoicePartition] = {}
+
+    def __contains__(self, content_hash: str) -> bool:
+        return content_hash in self.samples
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    def fold(self, content_hash: str, source: str, universe: str, features: Dict[str, Any]) -> bool:
+        """Fold in one sample's features; returns False if the sample was already folded in."""
+        if content_hash in self.samples:
+            return False
+        self.samples[content_hash] = {"source": source, "universe": universe}
+        self.total.fold(features)
+        self.universes.setdefault(universe, VoicePartition()).fold(features)
+        return True
+
+    def merge(self, other: "VoiceProfileAccumulator"):
+        """Fold in an accumulator built from other samples (e.g. on another host)."""
+        shared = self.samples.keys() & other.samples.keys()
+        if shared:
+            raise ValueError(f"Cannot merge voice profile accumulators sharing {len(shared)} samples")
+        self.samples.update(other.samples)
+        self.total.merge(other.total)
+        for universe, partition in other.universes.items():
+            self.universes.setdefault(universe, VoicePartition()).merge(partition)
+
+    def is_subset_of(self, content_hashes: Iterable[str]) -> bool:
+        """True if every folded-in sample is still among content_hashes (nothing removed or changed)."""
+        return self.samples.keys() <= set(content_hashes)
+
+    def profile(self) -> Dict[str, Any]:
+        """Return the unified voice features with one summary per universe."""
+        profile = self.total.summarize()
+        for name in FEATURE_BINS:
+            profile[name] = {key: value for key, value in profile[name].items() if key not in ("m2", "histogram")}
+        profile["sources"] = sorted(entry["source"] for entry in self.samples.values())
+        profile["universes"] = {}
+        for universe, partition in sorted(self.universes.items()):
+            summary = partition.summarize()
+            profile["universes"][universe] = {field: summary[field] for field in (
+                "sample_count", "duration_seconds", "voiced_seconds",
+                "default_pitch", "default_tempo", "pitch_range")}
+        return profile
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> Optional["VoiceProfileAccumulator"]:
+        """Load an accumulator from disk. Returns None if it is missing or unreadable."""
+        path = Path(path)
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+            if data.get("version") != ACCUMULATOR_VERSION:
+                logger.warning(f"Ignoring voice profile accumulator {path} with unsupported version {data.get('version')}")
+                return None
+            accumulator = cls()
+            accumulator.samples = data["samples"]
+            accumulator.total = VoicePartition.from_dict(data["total"])
+            accumulator.universes = {universe: VoicePartition.from_dict(partition)
+                                     for universe, partition in data["universes"].items()}
+            return accumulator
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable voice profile accumulator {path}: {str(e)}")
+            return None
+
+    def save(self, path: Union[str, Path]):
+        """Atomically write the accumulator to disk."""
+        path = Path(path)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump({
+                "version": ACCUMULATOR_VERSION,
+                "samples": self.samples,
+                "total": self.total.to_dict(),
+                "universes": {universe: partition.to_dict() for universe, partition in self.universes.items()}
+            }, f, separators=(",", ":"))
+        os.replace(tmp_path, path)